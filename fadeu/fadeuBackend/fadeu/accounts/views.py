@@ -1,6 +1,5 @@
 # In accounts/views.py
 
-import json
 import logging
 import random
 import string
@@ -18,12 +17,16 @@ from rest_framework.response import Response
 from rest_framework.views import APIView
 from rest_framework_simplejwt.views import TokenObtainPairView
 
+from fadeu.logging_pipeline import LazyJSON
+
 # Local imports
 from .models import PasswordResetCode, UserActivity
 from .register_serializer import RegisterSerializer
 from .serializers import UserActivitySerializer, MyTokenObtainPairSerializer
 
 logger = logging.getLogger(__name__)
+# One record per activity sync; sampled in production (see settings_production)
+activity_logger = logging.getLogger('accounts.activity')
 User = get_user_model()
 
 
@@ -41,11 +44,8 @@ class SyncUserActivityView(APIView):
     permission_classes = [IsAuthenticated]
     
     def post(self, request, *args, **kwargs):
-        logger.info("=" * 50)
-        logger.info("🔄 ACTIVITY SYNC REQUEST RECEIVED")
-        logger.info(f"👤 User: {request.user.email} (ID: {request.user.id})")
-        logger.info(f"📊 Activity Data: {json.dumps(request.data, indent=2)}")
-        logger.info("=" * 50)
+        activity_logger.info("🔄 Activity sync for user %s", request.user.id)
+        activity_logger.debug("📊 Activity data: %s", LazyJSON(request.data))
 
         try:
             # Get or create user activity
@@ -81,9 +81,10 @@ class SyncUserActivityView(APIView):
                 'success': True,
                 'message': 'Activity synced successfully',
                 'data': {
-                    'watch_time_seconds': activity.watch_time_seconds,
-                    'words_searched': activity.words_searched,
-                    'words_saved': activity.words_saved,
+                    # Not every client metric has a model field yet
+                    'watch_time_seconds': getattr(activity, 'watch_time_seconds', 0),
+                    'words_searched': getattr(activity, 'words_searched', 0),
+                    'words_saved': getattr(activity, 'words_saved', 0),
                     'flashcards_completed': activity.flashcards_completed,
                     'current_streak': activity.current_streak,
                     'longest_streak': activity.longest_streak,
@@ -93,11 +94,11 @@ class SyncUserActivityView(APIView):
                 }
             }
             
-            logger.info(f"✅ Activity sync successful: {json.dumps(response_data, indent=2)}")
+            activity_logger.debug("✅ Activity sync successful: %s", LazyJSON(response_data))
             return Response(response_data, status=status.HTTP_200_OK)
             
         except Exception as e:
-            logger.error(f"❌ Error syncing activity: {str(e)}", exc_info=True)
+            activity_logger.error("❌ Error syncing activity: %s", e, exc_info=True)
             return Response(
                 {
                     'success': False, 
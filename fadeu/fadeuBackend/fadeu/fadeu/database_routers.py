@@ -1,3 +1,8 @@
+import logging
+
+logger = logging.getLogger(__name__)
+
+
 class DictionaryRouter:
     """
     A router to control all database operations on models in the
@@ -8,14 +13,14 @@ class DictionaryRouter:
         Attempts to read Word model go to dictionary database (SQLite).
         All other models go to default database (MySQL).
         """
-        # Debug print to see which models are being accessed
-        print(f"DB Read - App: {model._meta.app_label}, Model: {model._meta.model_name}, Table: {model._meta.db_table}")
+        # Debug log to see which models are being accessed
+        logger.debug("DB Read - App: %s, Model: %s, Table: %s", model._meta.app_label, model._meta.model_name, model._meta.db_table)
         
         if model._meta.app_label == 'words':
-            if model._meta.model_name == 'word':
-                print("Routing Word model to 'dictionary' database (SQLite)")
-                return 'dictionary'  # Read Word model from SQLite
-            print(f"Routing {model._meta.model_name} model to 'default' database (MySQL)")
+            if model._meta.model_name in ('word', 'wordform'):
+                logger.debug("Routing %s model to 'dictionary' database (SQLite)", model._meta.model_name)
+                return 'dictionary'  # Read Word/WordForm models from SQLite
+            logger.debug("Routing %s model to 'default' database (MySQL)", model._meta.model_name)
             return 'default'  # All other models in words app from MySQL
         return 'default'  # All other models from MySQL
 
@@ -24,14 +29,14 @@ class DictionaryRouter:
         Attempts to write Word model are not allowed (read-only).
         UserWordProgress and SavedWord can be written to default database (MySQL).
         """
-        # Debug print to see which models are being written to
-        print(f"DB Write - App: {model._meta.app_label}, Model: {model._meta.model_name}")
+        # Debug log to see which models are being written to
+        logger.debug("DB Write - App: %s, Model: %s", model._meta.app_label, model._meta.model_name)
         
         if model._meta.app_label == 'words':
-            if model._meta.model_name == 'word':
-                print("Preventing write to Word model (read-only)")
-                return None  # Prevent writes to Word model (read-only)
-            print(f"Allowing write to {model._meta.model_name} in 'default' database (MySQL)")
+            if model._meta.model_name in ('word', 'wordform'):
+                logger.debug("Preventing write to %s model (read-only)", model._meta.model_name)
+                return None  # Prevent writes to Word/WordForm models (read-only)
+            logger.debug("Allowing write to %s in 'default' database (MySQL)", model._meta.model_name)
             return 'default'  # Allow writes to other models in words app (MySQL)
         return 'default'  # All other models to MySQL
 
@@ -49,16 +54,16 @@ class DictionaryRouter:
         
         # Allow relations between User and UserWordProgress/SavedWord across databases
         if 'user' in model_names and ('userwordprogress' in model_names or 'savedword' in model_names):
-            print(f"Allowing relation between {obj1._meta.model_name} and {obj2._meta.model_name}")
+            logger.debug("Allowing relation between %s and %s", obj1._meta.model_name, obj2._meta.model_name)
             return True
             
         # Allow relations between SavedWord and Word across databases
         if 'savedword' in model_names and 'word' in model_names:
-            print(f"Allowing relation between SavedWord and Word across databases")
+            logger.debug("Allowing relation between SavedWord and Word across databases")
             return True
             
         # No opinion on other cross-database relations
-        print(f"No opinion on relation between {obj1._meta.model_name} and {obj2._meta.model_name}")
+        logger.debug("No opinion on relation between %s and %s", obj1._meta.model_name, obj2._meta.model_name)
         return None
 
     def allow_migrate(self, db, app_label, model_name=None, **hints):
@@ -66,16 +71,16 @@ class DictionaryRouter:
         Only allow migrations for the 'default' database (MySQL).
         The 'dictionary' database (SQLite) is read-only and should not be migrated.
         """
-        # Debug print for migration attempts
-        print(f"Migration - DB: {db}, App: {app_label}, Model: {model_name}")
+        # Debug log for migration attempts
+        logger.debug("Migration - DB: %s, App: %s, Model: %s", db, app_label, model_name)
         
         if db == 'dictionary':
             return False  # Never migrate the dictionary database
         
         # Only allow migrations for the 'words' app in the default database
         if app_label == 'words':
-            # Allow migrations for UserWordProgress and SavedWord models in default DB
-            if model_name in ['userwordprogress', 'savedword']:
+            # Allow migrations for the per-user models in default DB
+            if model_name in ['userwordprogress', 'savedword', 'savedlistversion', 'userlevelstats']:
                 return db == 'default'
             return False  # Don't create tables for other models in default DB
             
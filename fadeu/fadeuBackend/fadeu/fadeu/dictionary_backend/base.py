@@ -0,0 +1,105 @@
+"""
+Read-only SQLite backend for the dictionary database.
+
+dictionary.db is never written by the web process (DictionaryRouter blocks
+writes to Word), so it is opened through a ``mode=ro`` URI, optionally with
+``immutable=1``, and tuned with PRAGMAs that only make sense for a read-only
+file. Together with ``CONN_MAX_AGE = None`` every worker thread keeps one
+warm connection instead of reopening the file on each request.
+
+When a versioned dictionary is published (see versions.py) the connection
+opens the current version's file instead of NAME.
+
+Usage in settings.DATABASES::
+
+    'dictionary': {
+        'ENGINE': 'fadeu.dictionary_backend',
+        'NAME': str(BASE_DIR / 'dictionary.db'),
+        'CONN_MAX_AGE': None,
+        'OPTIONS': {
+            'immutable': True,
+            'mmap_size': 256 * 1024 * 1024,
+            'cache_size': -64 * 1024,
+        }
+    }
+"""
+import sqlite3
+from pathlib import Path
+from urllib.parse import quote
+
+from django.db.backends.sqlite3 import base as sqlite3_base
+
+from . import versions
+
+# Options understood by this backend; they are removed before the remaining
+# OPTIONS are handed to sqlite3.connect().
+READ_ONLY_OPTIONS = ('immutable', 'mmap_size', 'cache_size')
+
+DEFAULT_MMAP_SIZE = 256 * 1024 * 1024  # bytes
+DEFAULT_CACHE_SIZE = -64 * 1024  # negative means KiB, i.e. 64 MiB
+
+
+def build_uri(path, immutable=True):
+    """Return a ``file:`` URI that opens ``path`` read-only."""
+    uri = f"file:{quote(Path(path).resolve().as_posix())}?mode=ro"
+    if immutable:
+        uri += "&immutable=1"
+    return uri
+
+
+def apply_pragmas(conn, mmap_size=DEFAULT_MMAP_SIZE, cache_size=DEFAULT_CACHE_SIZE):
+    """Apply the read-only tuning PRAGMAs to an open sqlite3 connection."""
+    conn.execute(f"PRAGMA mmap_size = {int(mmap_size)}")
+    conn.execute(f"PRAGMA cache_size = {int(cache_size)}")
+    conn.execute("PRAGMA query_only = ON")
+
+
+def connect(path, immutable=True, mmap_size=DEFAULT_MMAP_SIZE,
+            cache_size=DEFAULT_CACHE_SIZE, **kwargs):
+    """
+    Open a raw sqlite3 connection to the dictionary with the same settings
+    the Django backend uses. Meant for code that needs sqlite3 directly.
+    """
+    conn = sqlite3.connect(build_uri(path, immutable=immutable), uri=True, **kwargs)
+    apply_pragmas(conn, mmap_size=mmap_size, cache_size=cache_size)
+    return conn
+
+
+class DatabaseWrapper(sqlite3_base.DatabaseWrapper):
+    display_name = 'SQLite (read-only dictionary)'
+
+    # Version the open connection belongs to (see versions.py)
+    dictionary_version = None
+
+    def get_connection_params(self):
+        kwargs = super().get_connection_params()
+        options = self.settings_dict['OPTIONS']
+        for key in READ_ONLY_OPTIONS:
+            kwargs.pop(key, None)
+
+        # Test databases are created in memory and must stay writable.
+        if not self.is_in_memory_db():
+            self.dictionary_version = versions.current_version()
+            kwargs['database'] = build_uri(
+                versions.current_path(self.dictionary_version),
+                immutable=options.get('immutable', True),
+            )
+        return kwargs
+
+    def close(self):
+        super().close()
+        # A closed connection reads no version; the next one opens the
+        # current file (versions.close_stale_connection relies on this).
+        if self.connection is None:
+            self.dictionary_version = None
+
+    def get_new_connection(self, conn_params):
+        conn = super().get_new_connection(conn_params)
+        if not self.is_in_memory_db():
+            options = self.settings_dict['OPTIONS']
+            apply_pragmas(
+                conn,
+                mmap_size=options.get('mmap_size', DEFAULT_MMAP_SIZE),
+                cache_size=options.get('cache_size', DEFAULT_CACHE_SIZE),
+            )
+        return conn
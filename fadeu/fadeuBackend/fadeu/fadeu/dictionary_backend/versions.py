@@ -0,0 +1,161 @@
+"""
+Versioned dictionary files with a "current version" pointer.
+
+Layout under ``settings.DICTIONARY_DIR``::
+
+    CURRENT                      # one line: the current version name
+    20261019120000-1a2b3c4d/
+        dictionary.db
+        ...                      # other build artifacts of that version
+
+Publishing a release writes a new version directory and then replaces
+``CURRENT`` atomically. Workers notice the new pointer with a cheap
+``stat`` at most every ``DICTIONARY_VERSION_CHECK_INTERVAL`` seconds, close
+their ``dictionary`` connection (the next query reopens the new file) and
+send :data:`dictionary_changed` once per process so derived caches can be
+dropped.
+
+Without a ``CURRENT`` file the ``dictionary`` database NAME is used as is.
+"""
+import os
+import shutil
+import threading
+import time
+from pathlib import Path
+
+from django.conf import settings
+from django.dispatch import Signal
+
+POINTER_NAME = 'CURRENT'
+DATABASE_FILENAME = 'dictionary.db'
+DEFAULT_CHECK_INTERVAL = 5  # seconds
+
+# Sent once per process when the current version changes.
+# Arguments: version, previous
+dictionary_changed = Signal()
+
+_lock = threading.Lock()
+_state = {
+    'checked_at': None,
+    'pointer_stat': None,
+    'version': None,
+}
+
+
+def dictionary_dir():
+    return Path(getattr(settings, 'DICTIONARY_DIR', settings.BASE_DIR / 'dictionaries'))
+
+
+def pointer_path():
+    return dictionary_dir() / POINTER_NAME
+
+
+def version_dir(version):
+    return dictionary_dir() / version
+
+
+def stat_key(stat):
+    return (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+
+
+def _read_pointer():
+    try:
+        stat = os.stat(pointer_path())
+    except FileNotFoundError:
+        return None, None
+    if stat_key(stat) == _state['pointer_stat']:
+        return _state['version'], _state['pointer_stat']
+    version = pointer_path().read_text(encoding='utf-8').strip() or None
+    return version, stat_key(stat)
+
+
+def current_version(force=False):
+    """
+    Return the current version name, or None when no pointer exists.
+
+    The pointer file is stat'ed at most once per check interval per process;
+    in between, the last known version is returned without any syscall.
+    """
+    interval = getattr(settings, 'DICTIONARY_VERSION_CHECK_INTERVAL', DEFAULT_CHECK_INTERVAL)
+    now = time.monotonic()
+    checked_at = _state['checked_at']
+    if not force and checked_at is not None and now - checked_at < interval:
+        return _state['version']
+
+    with _lock:
+        previous = _state['version']
+        version, pointer_stat = _read_pointer()
+        _state['version'] = version
+        _state['pointer_stat'] = pointer_stat
+        changed = checked_at is not None and version != previous
+        _state['checked_at'] = now
+
+    if changed:
+        dictionary_changed.send(sender=None, version=version, previous=previous)
+    return version
+
+
+def current_path(version=None):
+    """Path of the dictionary database for ``version`` (default: current)."""
+    version = version if version is not None else current_version()
+    if version is None:
+        return Path(settings.DATABASES['dictionary']['NAME'])
+    return version_dir(version) / DATABASE_FILENAME
+
+
+def version_key():
+    """
+    Identifier of the dictionary content being served, for ETags and cache
+    keys: the version name, or the size and mtime of NAME when no version
+    has been published.
+    """
+    version = current_version()
+    if version is not None:
+        return version
+    try:
+        stat = os.stat(current_path(version))
+    except OSError:
+        return 'missing'
+    return f'{stat.st_mtime_ns:x}-{stat.st_size:x}'
+
+
+def close_stale_connection():
+    """
+    Close this thread's ``dictionary`` connection if it was opened on an
+    older version; the next query reopens the current file.
+    """
+    from django.db import connections
+
+    connection = connections['dictionary']
+    if connection.connection is None:
+        return
+    if getattr(connection, 'dictionary_version', None) != current_version():
+        connection.close()
+
+
+def publish(build_dir, version, keep=3):
+    """
+    Move a finished ``build_dir`` into place as ``version`` and point
+    ``CURRENT`` at it. Older versions beyond the newest ``keep`` are removed;
+    workers still reading them keep their open file handles.
+    """
+    target = version_dir(version)
+    os.replace(build_dir, target)
+
+    pointer = pointer_path()
+    tmp = pointer.with_name(f'.{POINTER_NAME}.{os.getpid()}.tmp')
+    with open(tmp, 'w', encoding='utf-8') as fh:
+        fh.write(version + '\n')
+        fh.flush()
+        os.fsync(fh.fileno())
+    os.replace(tmp, pointer)
+
+    versions = sorted(
+        (path for path in dictionary_dir().iterdir()
+         if path.is_dir() and not path.name.startswith('.')),
+        key=lambda path: path.name,
+    )
+    for old in versions[:-keep] if keep else []:
+        if old.name != version:
+            shutil.rmtree(old, ignore_errors=True)
+    return target
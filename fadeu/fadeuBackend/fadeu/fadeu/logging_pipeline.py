@@ -0,0 +1,99 @@
+"""
+Logging pieces for production load, used from the LOGGING dictConfig.
+
+``QueueListenerHandler``
+    The only handler request threads call: it puts the record on a bounded
+    queue and returns. A QueueListener thread formats it and does the I/O
+    on the real handlers (``handlers``: ``cfg://handlers.<name>`` of other
+    configured handlers). When the queue is full, records are dropped and
+    counted instead of blocking the request. Configure it with ``'()'``,
+    not ``'class'`` (Python 3.12+ treats QueueHandler classes specially).
+
+``SamplingFilter``
+    Per-logger sampling: keeps a ``rate`` fraction of the records at or
+    below ``max_level`` (INFO by default). Attach it to the logger of a
+    high-volume event; warnings and errors always pass.
+
+``LazyJSON``
+    Log argument that is only serialized if the record is emitted::
+
+        logger.debug('payload: %s', LazyJSON(request.data))
+
+Messages are %-formatted on the listener thread, so arguments must not be
+mutated after the logging call (request data and response dicts aren't).
+The listener thread starts when logging is configured; threads do not
+survive a fork, so don't load the app before forking workers (e.g.
+gunicorn --preload) with this handler configured.
+"""
+import atexit
+import json
+import logging
+import queue
+import random
+from logging.handlers import QueueHandler, QueueListener
+
+DEFAULT_QUEUE_SIZE = 10000
+
+
+class QueueListenerHandler(QueueHandler):
+
+    def __init__(self, handlers, queue_size=DEFAULT_QUEUE_SIZE, respect_handler_level=True):
+        # Index rather than iterate: dictConfig only resolves cfg:// items
+        # of its ConvertingList in __getitem__.
+        handlers = [handlers[index] for index in range(len(handlers))]
+        if any(not isinstance(handler, logging.Handler) for handler in handlers):
+            # dictConfig sets up handlers in name order, so targets must sort
+            # before the queue handler.
+            raise ValueError('QueueListenerHandler targets must be configured before it')
+        super().__init__(queue.Queue(queue_size))
+        self.dropped = 0
+        self.listener = QueueListener(self.queue, *handlers, respect_handler_level=respect_handler_level)
+        self.listener.start()
+        atexit.register(self.stop_listener)
+
+    def prepare(self, record):
+        # Unlike QueueHandler.prepare, don't format here: the listener
+        # thread does it. Only tracebacks are rendered now, while the frames
+        # are still as they were.
+        if record.exc_info:
+            record = logging.makeLogRecord(record.__dict__)
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+    def stop_listener(self):
+        """Write out the queued records and stop the listener thread."""
+        if self.listener._thread is not None:
+            self.listener.stop()
+
+    def close(self):
+        self.stop_listener()
+        super().close()
+
+
+class SamplingFilter(logging.Filter):
+
+    def __init__(self, rate=1.0, max_level=logging.INFO, name=''):
+        super().__init__(name)
+        self.rate = float(rate)
+        self.max_level = logging._checkLevel(max_level)
+
+    def filter(self, record):
+        return record.levelno > self.max_level or random.random() < self.rate
+
+
+class LazyJSON:
+    __slots__ = ('obj', 'kwargs')
+
+    def __init__(self, obj, **kwargs):
+        self.obj = obj
+        self.kwargs = kwargs
+
+    def __str__(self):
+        return json.dumps(self.obj, default=str, ensure_ascii=False, **self.kwargs)
@@ -0,0 +1,364 @@
+"""
+Prometheus-style metrics, served in the text exposition format at /metrics.
+
+Recorded by:
+
+- MetricsMiddleware (first in MIDDLEWARE): request count and latency per
+  route (the URL pattern, e.g. ``api/words/words/<int:pk>/``), method and
+  status, and 429 throttle rejections
+- an execute wrapper on every database connection: query count and time
+  per alias (``default``, ``dictionary``)
+- DRF serializers: time spent building ``.data``, per serializer class
+- words.response_cache and words.saved_lists: cache hits and misses
+
+Updates never take a lock: each thread counts into its own dict, and a
+scrape adds the dicts of all threads up. When a thread exits, its dict is
+added to a process total and dropped, so servers that start a thread per
+request don't accumulate them. With several worker processes set
+METRICS_DIR to a directory shared by the workers of one host: every process
+writes its totals there (at most every METRICS_FLUSH_INTERVAL seconds, and
+on each scrape) and /metrics adds up all files, so any worker can answer a
+scrape. Files of exited workers are kept, so counters never go back; empty
+the directory when deploying.
+
+/metrics answers clients in METRICS_ALLOWED_IPS (addresses or networks;
+REMOTE_ADDR, so behind a proxy list the proxy or use the token) and
+requests with ``Authorization: Bearer <METRICS_TOKEN>``; others get 403.
+METRICS_ENABLED = False removes the endpoint, the middleware and
+everything it installs.
+Streaming responses (words.views_export) are timed to the first byte.
+"""
+import hmac
+import ipaddress
+import itertools
+import json
+import os
+import threading
+import time
+import weakref
+from bisect import bisect_left
+from pathlib import Path
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.http import HttpResponse, HttpResponseForbidden
+from django.views.decorators.http import require_GET
+
+# Upper bounds (seconds) of the latency histogram buckets
+BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+METRICS = {
+    'fadeu_http_requests_total': (
+        'counter', 'Requests answered, by route, method and status'),
+    'fadeu_http_request_duration_seconds': (
+        'histogram', 'Time from the first middleware to the response, by route and method'),
+    'fadeu_http_throttled_requests_total': (
+        'counter', 'Requests rejected by a throttle (status 429), by route'),
+    'fadeu_db_queries_total': (
+        'counter', 'Database queries, by connection alias'),
+    'fadeu_db_query_duration_seconds': (
+        'histogram', 'Database query time, by connection alias'),
+    'fadeu_serializer_duration_seconds': (
+        'histogram', 'Time spent building serializer .data, by serializer class'),
+    'fadeu_response_cache_requests_total': (
+        'counter', 'Anonymous response cache lookups, by view and outcome (hit, miss, skip)'),
+    'fadeu_saved_list_cache_requests_total': (
+        'counter', 'Saved-words list cache lookups, by outcome (hit, miss, not_modified)'),
+}
+
+KNOWN_METHODS = {'GET', 'HEAD', 'POST', 'PUT', 'PATCH', 'DELETE', 'OPTIONS'}
+
+_local = threading.local()
+_shards = {}  # key -> counts of a live thread
+_retired = {}  # counts of exited threads
+_shard_keys = itertools.count()
+# Reentrant: a thread's shard can be retired by garbage collection that
+# happens while this thread holds the lock.
+_shards_lock = threading.RLock()
+_flush_lock = threading.Lock()
+_next_flush = 0.0
+_process_key = None
+_installed = False
+
+
+def _reset_after_fork():
+    global _local, _shards, _retired, _process_key, _next_flush
+    _local = threading.local()
+    _shards = {}
+    _retired = {}
+    _process_key = None
+    _next_flush = 0.0
+
+
+if hasattr(os, 'register_at_fork'):
+    # A forked worker must not report its parent's counts as its own.
+    os.register_at_fork(after_in_child=_reset_after_fork)
+
+
+class _ShardOwner:
+    """Only referenced from a thread's local storage, so it dies with the thread."""
+    __slots__ = ('__weakref__',)
+
+
+def _retire(key):
+    with _shards_lock:
+        values = _shards.pop(key, None)
+        for name, value in (values or {}).items():
+            _add(_retired, name, value)
+
+
+def _shard():
+    try:
+        return _local.values
+    except AttributeError:
+        values = {}
+        key = next(_shard_keys)
+        owner = _ShardOwner()
+        with _shards_lock:
+            _shards[key] = values
+        weakref.finalize(owner, _retire, key)
+        _local.owner = owner
+        _local.values = values
+        return values
+
+
+def inc(name, labels=(), amount=1):
+    """Add ``amount`` to the counter ``name``; ``labels`` is a tuple of (name, value) pairs."""
+    values = _shard()
+    key = (name, labels)
+    values[key] = values.get(key, 0) + amount
+
+
+def observe(name, labels, seconds):
+    """Record ``seconds`` in the histogram ``name``."""
+    values = _shard()
+    key = (name, labels)
+    histogram = values.get(key)
+    if histogram is None:
+        # Count per bucket (the last one is +Inf), then the sum.
+        histogram = values[key] = [0] * (len(BUCKETS) + 1) + [0.0]
+    histogram[bisect_left(BUCKETS, seconds)] += 1
+    histogram[-1] += seconds
+
+
+def _add(totals, key, value):
+    if isinstance(value, list):
+        current = totals.get(key)
+        totals[key] = list(value) if current is None else [a + b for a, b in zip(current, value)]
+    else:
+        totals[key] = totals.get(key, 0) + value
+
+
+def collect():
+    """Totals of this process: ``{(name, labels): number or histogram list}``."""
+    with _shards_lock:
+        shards = list(_shards.values())
+        totals = {key: list(value) if isinstance(value, list) else value for key, value in _retired.items()}
+    for shard in shards:
+        # dict.copy() and list() are atomic, so the owning thread can keep
+        # counting while we read.
+        for key, value in shard.copy().items():
+            _add(totals, key, list(value) if isinstance(value, list) else value)
+    return totals
+
+
+def _metrics_dir():
+    directory = getattr(settings, 'METRICS_DIR', None)
+    return Path(directory) if directory else None
+
+
+def flush():
+    """Write this process's totals to METRICS_DIR (if set)."""
+    global _process_key
+    directory = _metrics_dir()
+    if directory is None:
+        return
+    if _process_key is None:
+        # Unique even when a pid is reused after a worker restart
+        _process_key = f'{os.getpid()}-{time.time_ns()}'
+    directory.mkdir(parents=True, exist_ok=True)
+    entries = [[name, [list(pair) for pair in labels], value] for (name, labels), value in collect().items()]
+    path = directory / f'{_process_key}.json'
+    tmp = directory / f'.{_process_key}.tmp'
+    with open(tmp, 'w', encoding='utf-8') as fh:
+        json.dump(entries, fh, separators=(',', ':'))
+    os.replace(tmp, path)
+
+
+def maybe_flush():
+    global _next_flush
+    if _metrics_dir() is None or time.monotonic() < _next_flush:
+        return
+    if _flush_lock.acquire(blocking=False):
+        try:
+            _next_flush = time.monotonic() + getattr(settings, 'METRICS_FLUSH_INTERVAL', 5)
+            flush()
+        finally:
+            _flush_lock.release()
+
+
+def collect_all():
+    """Totals of all processes writing to METRICS_DIR, or of this one without it."""
+    directory = _metrics_dir()
+    if directory is None:
+        return collect()
+    flush()
+    totals = {}
+    for path in directory.glob('*.json'):
+        try:
+            with open(path, encoding='utf-8') as fh:
+                entries = json.load(fh)
+        except (OSError, ValueError):
+            continue  # replaced or removed while listing
+        for name, labels, value in entries:
+            _add(totals, (name, tuple(tuple(pair) for pair in labels)), value)
+    return totals
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _labels(labels, extra=()):
+    pairs = tuple(labels) + tuple(extra)
+    if not pairs:
+        return ''
+    return '{' + ','.join(f'{name}="{_escape(value)}"' for name, value in pairs) + '}'
+
+
+def render(totals):
+    by_name = {}
+    for (name, labels), value in totals.items():
+        by_name.setdefault(name, []).append((labels, value))
+    lines = []
+    for name, (kind, help_text) in METRICS.items():
+        lines.append(f'# HELP {name} {help_text}')
+        lines.append(f'# TYPE {name} {kind}')
+        for labels, value in sorted(by_name.get(name, ()), key=lambda item: item[0]):
+            if kind == 'histogram':
+                cumulative = 0
+                for bound, count in zip(BUCKETS + ('+Inf',), value[:-1]):
+                    cumulative += count
+                    lines.append(f'{name}_bucket{_labels(labels, [("le", bound)])} {cumulative}')
+                lines.append(f'{name}_sum{_labels(labels)} {value[-1]:.6f}')
+                lines.append(f'{name}_count{_labels(labels)} {cumulative}')
+            else:
+                lines.append(f'{name}{_labels(labels)} {value}')
+    return '\n'.join(lines) + '\n'
+
+
+def _allowed(request):
+    token = getattr(settings, 'METRICS_TOKEN', None)
+    if token and hmac.compare_digest(request.headers.get('Authorization', ''), f'Bearer {token}'):
+        return True
+    try:
+        address = ipaddress.ip_address(request.META.get('REMOTE_ADDR', ''))
+    except ValueError:
+        return False
+    return any(
+        address in ipaddress.ip_network(network, strict=False)
+        for network in getattr(settings, 'METRICS_ALLOWED_IPS', ())
+    )
+
+
+@require_GET
+def metrics_view(request):
+    if not _allowed(request):
+        return HttpResponseForbidden('Metrics are only available to METRICS_ALLOWED_IPS or with METRICS_TOKEN')
+    return HttpResponse(render(collect_all()), content_type='text/plain; version=0.0.4; charset=utf-8')
+
+
+def _time_queries(execute, sql, params, many, context):
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        labels = (('alias', context['connection'].alias),)
+        inc('fadeu_db_queries_total', labels)
+        observe('fadeu_db_query_duration_seconds', labels, time.perf_counter() - started)
+
+
+def _wrap_connection(connection, **kwargs):
+    # Wrappers outlive reconnects of the same DatabaseWrapper.
+    if _time_queries not in connection.execute_wrappers:
+        connection.execute_wrappers.append(_time_queries)
+
+
+def _time_serializers():
+    from rest_framework.serializers import BaseSerializer, ListSerializer
+
+    data = BaseSerializer.data.fget
+
+    def timed_data(self):
+        # .data is computed once per serializer and cached in _data;
+        # nested serializers use to_representation and aren't counted twice.
+        if hasattr(self, '_data'):
+            return data(self)
+        started = time.perf_counter()
+        try:
+            return data(self)
+        finally:
+            serializer = type(self.child if isinstance(self, ListSerializer) else self).__name__
+            if isinstance(self, ListSerializer):
+                serializer += '(many)'
+            observe('fadeu_serializer_duration_seconds', (('serializer', serializer),),
+                    time.perf_counter() - started)
+
+    BaseSerializer.data = property(timed_data)
+
+
+def install():
+    """Hook into database connections and DRF serializers (once per process)."""
+    global _installed
+    if _installed:
+        return
+    _installed = True
+    connection_created.connect(_wrap_connection, weak=False)
+    for connection in connections.all(initialized_only=True):
+        _wrap_connection(connection)
+    _time_serializers()
+
+
+class MetricsMiddleware:
+    """
+    Request metrics; put it first in MIDDLEWARE so it times the whole stack.
+    Sync and async capable, so async views stay off the thread pool.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not getattr(settings, 'METRICS_ENABLED', True):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+        install()
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+        started = time.perf_counter()
+        response = self.get_response(request)
+        self.record(request, response, time.perf_counter() - started)
+        return response
+
+    async def __acall__(self, request):
+        started = time.perf_counter()
+        response = await self.get_response(request)
+        self.record(request, response, time.perf_counter() - started)
+        return response
+
+    def record(self, request, response, elapsed):
+        match = request.resolver_match
+        route = match.route if match is not None else 'unmatched'
+        method = request.method if request.method in KNOWN_METHODS else 'other'
+        inc('fadeu_http_requests_total', (('route', route), ('method', method), ('status', response.status_code)))
+        observe('fadeu_http_request_duration_seconds', (('route', route), ('method', method)), elapsed)
+        if response.status_code == 429:
+            inc('fadeu_http_throttled_requests_total', (('route', route),))
+        maybe_flush()
@@ -63,14 +63,60 @@ DATABASES = {
         }
     },
     'dictionary': {
-        'ENGINE': 'django.db.backends.sqlite3',
+        # Read-only SQLite backend: mode=ro/immutable URI, mmap and a large
+        # page cache, one persistent connection per worker thread.
+        'ENGINE': 'fadeu.dictionary_backend',
         'NAME': str(BASE_DIR / 'dictionary.db'),
+        'CONN_MAX_AGE': None,
         'OPTIONS': {
             'timeout': 20,
+            'immutable': True,
+            'mmap_size': 256 * 1024 * 1024,  # bytes
+            'cache_size': -64 * 1024,  # KiB (64 MiB)
         }
     }
 }
 
+# Threads (and read-only SQLite connections) serving the async dictionary
+# endpoints in words.views_async
+DICTIONARY_READ_WORKERS = 4
+
+# Published dictionary versions (build_dictionary) and how often workers
+# look for a new one, in seconds. Without DICTIONARY_DIR/CURRENT the
+# 'dictionary' NAME above is used.
+DICTIONARY_DIR = BASE_DIR / 'dictionaries'
+DICTIONARY_VERSION_CHECK_INTERVAL = 5
+
+# 'responses' holds rendered anonymous dictionary responses (see
+# words.response_cache), keyed by dictionary version so a new build never
+# serves old entries. Swap in FileBasedCache (or Redis/Memcached) to share
+# it between workers; MAX_ENTRIES bounds its size.
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    'responses': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'responses',
+        'TIMEOUT': 60 * 60,
+        'OPTIONS': {
+            'MAX_ENTRIES': 500,
+        },
+    },
+}
+RESPONSE_CACHE_ALIAS = 'responses'
+RESPONSE_CACHE_MAX_BYTES = 4 * 1024 * 1024  # larger responses are not cached
+
+# Request, database, serializer and cache metrics at /metrics (fadeu.metrics).
+# With several worker processes, point METRICS_DIR at a directory shared by
+# the workers of the host so every scrape sees all of them.
+METRICS_ENABLED = True
+METRICS_DIR = None
+METRICS_FLUSH_INTERVAL = 5  # seconds
+# Who may read /metrics: these addresses/networks, or a Bearer METRICS_TOKEN
+METRICS_ALLOWED_IPS = ['127.0.0.1', '::1']
+METRICS_TOKEN = os.environ.get('FADEU_METRICS_TOKEN') or None
+
 # Database router for handling multiple databases
 DATABASE_ROUTERS = ['fadeu.database_routers.DictionaryRouter']
 
@@ -105,6 +151,7 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'fadeu.metrics.MetricsMiddleware',  # first, so it times the whole stack
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'corsheaders.middleware.CorsMiddleware',  # Add this before CommonMiddleware
@@ -175,6 +222,18 @@ STATIC_ROOT = BASE_DIR / 'staticfiles'
 MEDIA_URL = '/media/'
 MEDIA_ROOT = BASE_DIR / 'media'
 
+# Pronunciation clips named by Word.audio_filename (served by words.views_audio)
+AUDIO_ROOT = MEDIA_ROOT / 'audio'
+
+# Let the front server send audio files and bundles: None (Django streams
+# them), 'X-Accel-Redirect' (nginx; one internal location per entry in
+# SENDFILE_LOCATIONS) or 'X-Sendfile' (Apache/lighttpd; absolute paths).
+SENDFILE_HEADER = None
+SENDFILE_LOCATIONS = {
+    AUDIO_ROOT: '/_protected/audio/',
+    DICTIONARY_DIR: '/_protected/dictionaries/',
+}
+
 # Additional locations of static files
 STATICFILES_DIRS = [
     BASE_DIR / 'static',
@@ -258,6 +317,10 @@ LOGGING = {
             'level': 'DEBUG',
             'handlers': ['console'],
         },
+        'fadeu.database_routers': {
+            'level': 'DEBUG',
+            'handlers': ['console'],
+        },
     },
 }
 
@@ -276,8 +339,14 @@ EMAIL_BACKEND = 'django.core.mail.backends.console.EmailBackend'  # For developm
 PROJECT_ROOT = os.path.dirname(os.path.abspath(__file__))
 sys.path.insert(0, os.path.join(PROJECT_ROOT, '..'))
 
+# Diagnostics: the settings dump below and the debug/test endpoints in
+# words.urls (debug-settings/, test-db/, ...). FADEU_DIAGNOSTICS=0 keeps
+# them out of the import graph; settings_production does that by default.
+DIAGNOSTICS = os.environ.get('FADEU_DIAGNOSTICS', '1') != '0'
+
 # Debug information
-print("\n=== Debug: DATABASES setting ===", file=sys.stderr)
-print(f"DATABASES: {DATABASES}", file=sys.stderr)
-print(f"DATABASE_ROUTERS: {DATABASE_ROUTERS}", file=sys.stderr)
-print("============================\n", file=sys.stderr)
+if DIAGNOSTICS:
+    print("\n=== Debug: DATABASES setting ===", file=sys.stderr)
+    print(f"DATABASES: {DATABASES}", file=sys.stderr)
+    print(f"DATABASE_ROUTERS: {DATABASE_ROUTERS}", file=sys.stderr)
+    print("============================\n", file=sys.stderr)
@@ -0,0 +1,53 @@
+"""
+Django settings for the benchmark suite (``generate_benchmark_data`` and
+``run_benchmarks``). Based on settings_sqlite, with both databases moved to
+a scratch directory so synthetic data never touches the real files.
+"""
+import os
+
+from .settings_sqlite import *
+
+DEBUG = False
+
+BENCHMARK_DIR = Path(os.environ.get('FADEU_BENCHMARK_DIR', BASE_DIR / 'benchmark_data'))
+
+DATABASES['default'] = {
+    'ENGINE': 'django.db.backends.sqlite3',
+    'NAME': str(BENCHMARK_DIR / 'db.sqlite3'),
+    'OPTIONS': {
+        'timeout': 20,
+        # Concurrent writers wait for the lock instead of failing with
+        # "database is locked" when a read transaction tries to upgrade.
+        'transaction_mode': 'IMMEDIATE',
+    }
+}
+DATABASES['dictionary'] = {
+    **DATABASES['dictionary'],
+    'NAME': str(BENCHMARK_DIR / 'dictionary.db'),
+}
+DICTIONARY_DIR = BENCHMARK_DIR / 'dictionaries'
+AUDIO_ROOT = BENCHMARK_DIR / 'audio'
+SENDFILE_LOCATIONS = {
+    AUDIO_ROOT: '/_protected/audio/',
+    DICTIONARY_DIR: '/_protected/dictionaries/',
+}
+
+# Throttling would reject almost every benchmark request.
+REST_FRAMEWORK = {
+    **REST_FRAMEWORK,
+    'DEFAULT_RENDERER_CLASSES': [
+        'rest_framework.renderers.JSONRenderer',
+    ],
+    'DEFAULT_THROTTLE_CLASSES': [],
+}
+
+# Don't echo every SQL statement while measuring.
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+}
+
+# Hashing a real password for thousands of synthetic users takes minutes.
+PASSWORD_HASHERS = [
+    'django.contrib.auth.hashers.MD5PasswordHasher',
+]
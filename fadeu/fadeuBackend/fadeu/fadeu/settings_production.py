@@ -0,0 +1,69 @@
+"""
+Django settings for production workers.
+
+Same databases as settings, but without the development diagnostics: the
+settings dump is not printed and the debug/test endpoints (and the modules
+behind them) are never imported, so workers start faster. Set
+FADEU_DIAGNOSTICS=1 to get them back.
+
+FADEU_ALLOWED_HOSTS (comma-separated host names) is required.
+"""
+import os
+
+from django.core.exceptions import ImproperlyConfigured
+
+os.environ.setdefault('FADEU_DIAGNOSTICS', '0')
+
+from .settings import *
+
+DEBUG = False
+
+ALLOWED_HOSTS = [host.strip() for host in os.environ.get('FADEU_ALLOWED_HOSTS', '').split(',') if host.strip()]
+if not ALLOWED_HOSTS:
+    raise ImproperlyConfigured('Set FADEU_ALLOWED_HOSTS to the host names this site is served on (comma-separated)')
+
+# Request threads only put records on a queue; a listener thread formats
+# and writes them (fadeu.logging_pipeline). SQL statements and routing
+# decisions are not logged, and only 1% of the per-request activity sync
+# records are kept.
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'formatters': {
+        'default': {
+            'format': '%(asctime)s %(levelname)s %(name)s %(process)d %(message)s',
+        },
+    },
+    'filters': {
+        'sample_1_percent': {
+            '()': 'fadeu.logging_pipeline.SamplingFilter',
+            'rate': 0.01,
+        },
+    },
+    'handlers': {
+        'console': {
+            'class': 'logging.StreamHandler',
+            'formatter': 'default',
+        },
+        'queue': {
+            '()': 'fadeu.logging_pipeline.QueueListenerHandler',
+            'handlers': ['cfg://handlers.console'],
+        },
+    },
+    'root': {
+        'handlers': ['queue'],
+        'level': 'INFO',
+    },
+    'loggers': {
+        'django.db.backends': {
+            'level': 'WARNING',
+        },
+        'fadeu.database_routers': {
+            'level': 'WARNING',
+        },
+        'accounts.activity': {
+            'level': 'INFO',
+            'filters': ['sample_1_percent'],
+        },
+    },
+}
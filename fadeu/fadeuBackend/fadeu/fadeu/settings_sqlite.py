@@ -12,10 +12,16 @@ DATABASES = {
         'NAME': BASE_DIR / 'db.sqlite3',
     },
     'dictionary': {
-        'ENGINE': 'django.db.backends.sqlite3',
+        # Read-only SQLite backend: mode=ro/immutable URI, mmap and a large
+        # page cache, one persistent connection per worker thread.
+        'ENGINE': 'fadeu.dictionary_backend',
         'NAME': str(BASE_DIR / 'dictionary.db'),
+        'CONN_MAX_AGE': None,
         'OPTIONS': {
             'timeout': 20,
+            'immutable': True,
+            'mmap_size': 256 * 1024 * 1024,  # bytes
+            'cache_size': -64 * 1024,  # KiB (64 MiB)
         }
     }
 }
@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class WordsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'words'
+
+    def ready(self):
+        # Import signals here to avoid circular imports
+        import words.signals  # noqa
@@ -0,0 +1,270 @@
+"""
+Pronunciation audio: manifest and per-level bundles built with the dictionary.
+
+At build time every distinct ``words.audio_filename`` found under the audio
+root is stat'ed, hashed and measured once and stored in the
+``audio_manifest`` table of the new dictionary. Clients compare the manifest
+against their cache instead of re-downloading clips, and the serving views
+use the stored hash as a strong ETag without touching the file.
+
+For versioned builds (see fadeu.dictionary_backend.versions) one uncompressed
+zip per CEFR level is written next to the database, so a learner can fetch
+all A1 audio with one (resumable) request.
+
+Nothing in here needs Django; the build steps are registered in
+words.dictionary_build.BUILD_STEPS.
+"""
+import hashlib
+import json
+import os
+import struct
+import wave
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+MANIFEST_DDL = """
+CREATE TABLE audio_manifest (
+    filename TEXT PRIMARY KEY,
+    size INTEGER NOT NULL,
+    sha256 TEXT NOT NULL,
+    duration_ms INTEGER,
+    mtime INTEGER NOT NULL
+) WITHOUT ROWID
+"""
+BUNDLES_DDL = """
+CREATE TABLE audio_bundles (
+    level VARCHAR(2) PRIMARY KEY,
+    filename TEXT NOT NULL,
+    files INTEGER NOT NULL,
+    size INTEGER NOT NULL,
+    sha256 TEXT NOT NULL
+) WITHOUT ROWID
+"""
+
+# Bundles live in <version dir>/<BUNDLE_DIR>/<level>.zip
+BUNDLE_DIR = 'audio'
+BUNDLE_MANIFEST_NAME = 'manifest.json'
+
+HASH_WORKERS = 8
+_CHUNK_SIZE = 1024 * 1024
+
+
+def file_digest(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as fh:
+        for chunk in iter(lambda: fh.read(_CHUNK_SIZE), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+# ---------------------------------------------------------------------------
+# Duration
+# ---------------------------------------------------------------------------
+
+# MPEG audio bitrates in kbit/s, indexed by [version is MPEG-1][layer][index]
+_BITRATES = {
+    (True, 1): [0, 32, 64, 96, 128, 160, 192, 224, 256, 288, 320, 352, 384, 416, 448],
+    (True, 2): [0, 32, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320, 384],
+    (True, 3): [0, 32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320],
+    (False, 1): [0, 32, 48, 56, 64, 80, 96, 112, 128, 144, 160, 176, 192, 224, 256],
+    (False, 2): [0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160],
+    (False, 3): [0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160],
+}
+_SAMPLE_RATES = {3: (44100, 48000, 32000), 2: (22050, 24000, 16000), 0: (11025, 12000, 8000)}
+
+
+def _mp3_duration_ms(path, size):
+    with open(path, 'rb') as fh:
+        head = fh.read(64 * 1024)
+        fh.seek(max(size - 128, 0))
+        has_id3v1 = fh.read(3) == b'TAG'
+
+    offset = 0
+    if head[:3] == b'ID3' and len(head) >= 10:
+        tag_size = (head[6] << 21) | (head[7] << 14) | (head[8] << 7) | head[9]
+        offset = 10 + tag_size
+        if offset + 4 > len(head):
+            with open(path, 'rb') as fh:
+                fh.seek(offset)
+                head = fh.read(64 * 1024)
+            offset = 0
+    payload = size - offset - (128 if has_id3v1 else 0)
+
+    # Find the first valid frame header.
+    while offset + 4 <= len(head):
+        if head[offset] == 0xFF and head[offset + 1] & 0xE0 == 0xE0:
+            header = struct.unpack('>I', head[offset:offset + 4])[0]
+            version_bits = (header >> 19) & 3
+            layer = 4 - ((header >> 17) & 3)
+            bitrate_index = (header >> 12) & 0xF
+            rate_index = (header >> 10) & 3
+            if version_bits != 1 and layer != 4 and bitrate_index not in (0, 15) and rate_index != 3:
+                break
+        offset += 1
+    else:
+        return None
+
+    mpeg1 = version_bits == 3
+    sample_rate = _SAMPLE_RATES[version_bits][rate_index]
+    bitrate = _BITRATES[(mpeg1, layer)][bitrate_index] * 1000
+    samples_per_frame = 384 if layer == 1 else 1152 if (layer == 2 or mpeg1) else 576
+
+    # VBR files announce their frame count in a Xing/Info or VBRI header.
+    mono = (header >> 6) & 3 == 3
+    side_info = (17 if mono else 32) if mpeg1 else (9 if mono else 17)
+    xing = offset + 4 + side_info
+    frames = None
+    if head[xing:xing + 4] in (b'Xing', b'Info'):
+        flags = struct.unpack('>I', head[xing + 4:xing + 8])[0]
+        if flags & 1:
+            frames = struct.unpack('>I', head[xing + 8:xing + 12])[0]
+    elif head[offset + 36:offset + 40] == b'VBRI':
+        frames = struct.unpack('>I', head[offset + 50:offset + 54])[0]
+
+    if frames:
+        return int(frames * samples_per_frame * 1000 / sample_rate)
+    return int(payload * 8 * 1000 / bitrate)
+
+
+def _wav_duration_ms(path, size):
+    with wave.open(str(path), 'rb') as fh:
+        return int(fh.getnframes() * 1000 / fh.getframerate())
+
+
+_DURATION_READERS = {
+    '.mp3': _mp3_duration_ms,
+    '.wav': _wav_duration_ms,
+}
+
+
+def duration_ms(path, size=None):
+    """
+    Playing time of an MP3 or WAV file in milliseconds, read from its
+    headers; None for other formats or files that can't be parsed.
+    """
+    reader = _DURATION_READERS.get(Path(path).suffix.lower())
+    if reader is None:
+        return None
+    if size is None:
+        size = os.path.getsize(path)
+    try:
+        return reader(path, size)
+    except (OSError, EOFError, struct.error, wave.Error, ZeroDivisionError, KeyError):
+        return None
+
+
+# ---------------------------------------------------------------------------
+# Build steps
+# ---------------------------------------------------------------------------
+
+def resolve(audio_root, filename):
+    """Path of ``filename`` inside ``audio_root``, or None if it would escape it."""
+    root = Path(audio_root).resolve()
+    path = (root / filename).resolve()
+    if root not in path.parents:
+        return None
+    return path
+
+
+def _manifest_entry(audio_root, filename):
+    path = resolve(audio_root, filename)
+    if path is None:
+        return None
+    try:
+        stat = path.stat()
+    except OSError:
+        return None
+    return (
+        filename,
+        stat.st_size,
+        file_digest(path),
+        duration_ms(path, stat.st_size),
+        stat.st_mtime_ns // 1_000_000_000,
+    )
+
+
+def build_audio_manifest(conn, builder):
+    """
+    Fill ``audio_manifest`` for every referenced clip found under
+    ``builder.audio_root``. Missing files are counted in
+    ``builder.missing_audio``; the table is always created.
+    """
+    conn.execute(MANIFEST_DDL)
+    builder.missing_audio = 0
+    if builder.audio_root is None or not Path(builder.audio_root).is_dir():
+        return
+
+    filenames = [
+        row[0] for row in conn.execute(
+            "SELECT DISTINCT audio_filename FROM words WHERE audio_filename IS NOT NULL"
+        )
+    ]
+    # hashlib and file reads release the GIL, so threads overlap the I/O.
+    with ThreadPoolExecutor(max_workers=HASH_WORKERS) as executor:
+        entries = list(executor.map(
+            lambda filename: _manifest_entry(builder.audio_root, filename), filenames
+        ))
+
+    found = [entry for entry in entries if entry is not None]
+    builder.missing_audio = len(entries) - len(found)
+    conn.execute('BEGIN')
+    conn.executemany('INSERT INTO audio_manifest VALUES (?, ?, ?, ?, ?)', found)
+    conn.execute('COMMIT')
+
+
+def level_manifest(conn, level):
+    """``{filename: {size, sha256, duration_ms}}`` for the clips of one level."""
+    rows = conn.execute(
+        """
+        SELECT DISTINCT m.filename, m.size, m.sha256, m.duration_ms
+        FROM words w JOIN audio_manifest m ON m.filename = w.audio_filename
+        WHERE w.level = ?
+        ORDER BY m.filename
+        """,
+        [level],
+    )
+    return {
+        filename: {'size': size, 'sha256': sha256, 'duration_ms': duration}
+        for filename, size, sha256, duration in rows
+    }
+
+
+def build_audio_bundles(conn, builder):
+    """
+    Write ``<artifacts_dir>/audio/<level>.zip`` with every clip of a level
+    plus its manifest, and record them in ``audio_bundles``. Clips are
+    already compressed, so members are stored, not deflated, and the zips
+    are reproducible (fixed timestamps, sorted members).
+    """
+    conn.execute(BUNDLES_DDL)
+    if builder.audio_root is None or builder.artifacts_dir is None:
+        return
+
+    bundle_dir = Path(builder.artifacts_dir) / BUNDLE_DIR
+    bundle_dir.mkdir(parents=True, exist_ok=True)
+    levels = [row[0] for row in conn.execute('SELECT DISTINCT level FROM words ORDER BY level')]
+    bundles = []
+    for level in levels:
+        manifest = level_manifest(conn, level)
+        if not manifest:
+            continue
+        path = bundle_dir / f'{level}.zip'
+        with zipfile.ZipFile(path, 'w', compression=zipfile.ZIP_STORED) as archive:
+            info = zipfile.ZipInfo(BUNDLE_MANIFEST_NAME, date_time=(1980, 1, 1, 0, 0, 0))
+            archive.writestr(info, json.dumps(manifest, separators=(',', ':')))
+            for filename in manifest:
+                info = zipfile.ZipInfo(filename, date_time=(1980, 1, 1, 0, 0, 0))
+                with open(resolve(builder.audio_root, filename), 'rb') as src, \
+                        archive.open(info, 'w') as dst:
+                    while chunk := src.read(_CHUNK_SIZE):
+                        dst.write(chunk)
+        os.chmod(path, 0o644)
+        bundles.append((
+            level, f'{BUNDLE_DIR}/{path.name}', len(manifest),
+            path.stat().st_size, file_digest(path),
+        ))
+
+    conn.execute('BEGIN')
+    conn.executemany('INSERT INTO audio_bundles VALUES (?, ?, ?, ?, ?)', bundles)
+    conn.execute('COMMIT')
@@ -0,0 +1,6 @@
+"""
+Helpers shared by the ``bench_*`` management commands.
+
+Nothing in here is imported by the request path; the package only exists so
+benchmarks can drive the real WSGI application over real sockets.
+"""
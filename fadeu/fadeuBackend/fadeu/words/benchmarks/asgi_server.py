@@ -0,0 +1,42 @@
+import socket
+import threading
+import time
+from contextlib import contextmanager
+
+from django.core.asgi import get_asgi_application
+
+
+@contextmanager
+def serve_asgi(application=None):
+    """
+    Run the Django ASGI application under a single uvicorn worker in a
+    background thread. Yields ``(host, port)``.
+
+    uvicorn is only needed for benchmarks, so it is imported here.
+    """
+    import uvicorn
+
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        port = sock.getsockname()[1]
+
+    config = uvicorn.Config(
+        application or get_asgi_application(),
+        host='127.0.0.1',
+        port=port,
+        log_level='warning',
+        access_log=False,
+        lifespan='off',
+    )
+    server = uvicorn.Server(config)
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    while not server.started:
+        if not thread.is_alive():
+            raise RuntimeError('uvicorn failed to start')
+        time.sleep(0.05)
+    try:
+        yield ('127.0.0.1', port)
+    finally:
+        server.should_exit = True
+        thread.join()
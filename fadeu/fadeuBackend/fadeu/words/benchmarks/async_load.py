@@ -0,0 +1,56 @@
+import asyncio
+import time
+
+from .load import summarize
+
+
+async def _fetch(host, port, path, read_delay, chunk_size):
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        writer.write(
+            f'GET {path} HTTP/1.1\r\nHost: {host}\r\nConnection: close\r\n\r\n'.encode('latin-1')
+        )
+        await writer.drain()
+        status_line = await reader.readline()
+        # Read the rest like a phone on a slow network: small chunks with pauses.
+        while await reader.read(chunk_size):
+            if read_delay:
+                await asyncio.sleep(read_delay)
+        return int(status_line.split()[1])
+    finally:
+        writer.close()
+        await writer.wait_closed()
+
+
+async def _run(address, paths, concurrency, read_delay, chunk_size):
+    host, port = address
+    queue = list(reversed(paths))
+    latencies, errors = [], 0
+
+    async def client():
+        nonlocal errors
+        while queue:
+            path = queue.pop()
+            started = time.perf_counter()
+            try:
+                status = await _fetch(host, port, path, read_delay, chunk_size)
+                if status >= 400:
+                    errors += 1
+            except (OSError, ValueError, IndexError):
+                errors += 1
+            latencies.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(client() for _ in range(concurrency)))
+    return summarize(latencies, time.perf_counter() - started, errors)
+
+
+def run_async_load(address, paths, concurrency=100, read_delay=0.0, chunk_size=4096):
+    """
+    Issue GET ``paths`` from ``concurrency`` concurrent asyncio clients.
+
+    ``read_delay`` (seconds) is slept between ``chunk_size`` reads of each
+    response to simulate slow mobile connections. Returns the
+    :func:`words.benchmarks.load.summarize` dict.
+    """
+    return asyncio.run(_run(address, paths, concurrency, read_delay, chunk_size))
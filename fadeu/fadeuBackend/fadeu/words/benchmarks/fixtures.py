@@ -0,0 +1,320 @@
+"""
+Synthetic, reproducible data for the benchmark suite.
+
+Words are built from a small aligned German/English/Persian vocabulary:
+single nouns, two- and three-part compounds ("Dampfschiff"), prefixed verbs
+with conjugation tables and adjectives, so text lengths, Unicode content and
+the ``cases``/``tenses`` JSON look like the real dictionary.
+"""
+import itertools
+import json
+import random
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.db import connections, transaction
+from django.utils import timezone
+
+from words.dictionary_build import DictionaryBuilder
+from words.models import SavedWord, UserWordProgress
+
+LEVELS = ['A1', 'A2', 'B1', 'B2', 'C1', 'C2']
+
+# (german, article, plural suffix, english, persian)
+NOUNS = [
+    ('Haus', 'das', '¨er', 'house', 'خانه'),
+    ('Schiff', 'das', 'e', 'ship', 'کشتی'),
+    ('Dampf', 'der', '¨e', 'steam', 'بخار'),
+    ('Baum', 'der', '¨e', 'tree', 'درخت'),
+    ('Tisch', 'der', 'e', 'table', 'میز'),
+    ('Stadt', 'die', '¨e', 'city', 'شهر'),
+    ('Land', 'das', '¨er', 'country', 'کشور'),
+    ('Wasser', 'das', '', 'water', 'آب'),
+    ('Feuer', 'das', '', 'fire', 'آتش'),
+    ('Zeit', 'die', 'en', 'time', 'زمان'),
+    ('Arbeit', 'die', 'en', 'work', 'کار'),
+    ('Schule', 'die', 'n', 'school', 'مدرسه'),
+    ('Kind', 'das', 'er', 'child', 'کودک'),
+    ('Buch', 'das', '¨er', 'book', 'کتاب'),
+    ('Weg', 'der', 'e', 'way', 'راه'),
+    ('Berg', 'der', 'e', 'mountain', 'کوه'),
+    ('Licht', 'das', 'er', 'light', 'نور'),
+    ('Hand', 'die', '¨e', 'hand', 'دست'),
+    ('Tag', 'der', 'e', 'day', 'روز'),
+    ('Nacht', 'die', '¨e', 'night', 'شب'),
+    ('Wald', 'der', '¨er', 'forest', 'جنگل'),
+    ('Stein', 'der', 'e', 'stone', 'سنگ'),
+    ('Fluss', 'der', '¨e', 'river', 'رود'),
+    ('Brücke', 'die', 'n', 'bridge', 'پل'),
+    ('Straße', 'die', 'n', 'street', 'خیابان'),
+    ('Garten', 'der', '¨', 'garden', 'باغ'),
+    ('Blume', 'die', 'n', 'flower', 'گل'),
+    ('Vogel', 'der', '¨', 'bird', 'پرنده'),
+    ('Fenster', 'das', '', 'window', 'پنجره'),
+    ('Tür', 'die', 'en', 'door', 'در'),
+    ('Zug', 'der', '¨e', 'train', 'قطار'),
+    ('Bahn', 'die', 'en', 'railway', 'راه‌آهن'),
+    ('Hof', 'der', '¨e', 'yard', 'حیاط'),
+    ('Markt', 'der', '¨e', 'market', 'بازار'),
+    ('Kirche', 'die', 'n', 'church', 'کلیسا'),
+    ('Turm', 'der', '¨e', 'tower', 'برج'),
+    ('Meer', 'das', 'e', 'sea', 'دریا'),
+    ('Himmel', 'der', '', 'sky', 'آسمان'),
+    ('Sonne', 'die', 'n', 'sun', 'خورشید'),
+    ('Mond', 'der', 'e', 'moon', 'ماه'),
+    ('Stern', 'der', 'e', 'star', 'ستاره'),
+    ('Wolke', 'die', 'n', 'cloud', 'ابر'),
+    ('Regen', 'der', '', 'rain', 'باران'),
+    ('Schnee', 'der', '', 'snow', 'برف'),
+    ('Wind', 'der', 'e', 'wind', 'باد'),
+    ('Kopf', 'der', '¨e', 'head', 'سر'),
+    ('Herz', 'das', 'en', 'heart', 'قلب'),
+    ('Auge', 'das', 'n', 'eye', 'چشم'),
+    ('Ohr', 'das', 'en', 'ear', 'گوش'),
+    ('Mund', 'der', '¨er', 'mouth', 'دهان'),
+]
+
+# (stem, english, persian, preterite stem, participle); None means weak/regular
+VERBS = [
+    ('geh', 'go', 'رفتن', 'ging', 'gegangen'),
+    ('lauf', 'run', 'دویدن', 'lief', 'gelaufen'),
+    ('komm', 'come', 'آمدن', 'kam', 'gekommen'),
+    ('seh', 'see', 'دیدن', 'sah', 'gesehen'),
+    ('schreib', 'write', 'نوشتن', 'schrieb', 'geschrieben'),
+    ('spiel', 'play', 'بازی کردن', None, None),
+    ('mach', 'make', 'ساختن', None, None),
+    ('lern', 'learn', 'یاد گرفتن', None, None),
+    ('sag', 'say', 'گفتن', None, None),
+    ('frag', 'ask', 'پرسیدن', None, None),
+    ('kauf', 'buy', 'خریدن', None, None),
+    ('wohn', 'live', 'زندگی کردن', None, None),
+    ('koch', 'cook', 'پختن', None, None),
+    ('such', 'search', 'جستجو کردن', None, None),
+    ('hör', 'hear', 'شنیدن', None, None),
+]
+VERB_PREFIXES = [
+    ('', ''), ('ab', 'off '), ('an', 'on '), ('auf', 'up '), ('aus', 'out '),
+    ('ein', 'in '), ('mit', 'along '), ('nach', 'after '), ('vor', 'before '),
+    ('zu', 'to '), ('ver', 'mis'), ('über', 'over '), ('unter', 'under '),
+]
+
+ADJECTIVES = [
+    ('schön', 'beautiful', 'زیبا'), ('groß', 'big', 'بزرگ'), ('klein', 'small', 'کوچک'),
+    ('schnell', 'fast', 'سریع'), ('langsam', 'slow', 'آهسته'), ('alt', 'old', 'قدیمی'),
+    ('neu', 'new', 'جدید'), ('warm', 'warm', 'گرم'), ('kalt', 'cold', 'سرد'),
+    ('hell', 'bright', 'روشن'), ('dunkel', 'dark', 'تاریک'), ('laut', 'loud', 'بلند'),
+]
+
+PERSONS = ['ich', 'du', 'er/sie/es', 'wir', 'ihr', 'sie/Sie']
+PRESENT_ENDINGS = ['e', 'st', 't', 'en', 't', 'en']
+PRETERITE_REGULAR = ['te', 'test', 'te', 'ten', 'tet', 'ten']
+PRETERITE_STRONG = ['', 'st', '', 'en', 't', 'en']
+ARTICLE_CASES = {
+    'der': {'nominativ': 'der', 'genitiv': 'des', 'dativ': 'dem', 'akkusativ': 'den'},
+    'die': {'nominativ': 'die', 'genitiv': 'der', 'dativ': 'der', 'akkusativ': 'die'},
+    'das': {'nominativ': 'das', 'genitiv': 'des', 'dativ': 'dem', 'akkusativ': 'das'},
+}
+PLURAL_ARTICLES = {'nominativ': 'die', 'genitiv': 'der', 'dativ': 'den', 'akkusativ': 'die'}
+UMLAUTS = {'a': 'ä', 'o': 'ö', 'u': 'ü', 'au': 'äu'}
+
+def _umlaut(stem):
+    for plain in ('au', 'a', 'o', 'u'):
+        index = stem.rfind(plain)
+        if index != -1:
+            return stem[:index] + UMLAUTS[plain] + stem[index + len(plain):]
+    return stem
+
+
+def _plural(noun, suffix):
+    if suffix.startswith('¨'):
+        return _umlaut(noun) + suffix[1:]
+    return noun + suffix
+
+
+def _cases(german, article, plural):
+    forms = {}
+    for case, singular_article in ARTICLE_CASES[article].items():
+        singular = german
+        if case == 'genitiv' and article != 'die':
+            singular += 'es' if german.endswith(('s', 'ß', 'z')) else 's'
+        plural_form = plural
+        if case == 'dativ' and not plural.endswith(('n', 's')):
+            plural_form += 'n'
+        forms[case] = {
+            'singular': f'{singular_article} {singular}',
+            'plural': f'{PLURAL_ARTICLES[case]} {plural_form}',
+        }
+    return forms
+
+
+def _tenses(prefix, stem, preterite, participle):
+    separable = prefix and prefix not in ('ver', 'über', 'unter')
+    infinitive = prefix + stem + 'en'
+
+    def finite(form):
+        return f'{form} {prefix}' if separable else prefix + form
+
+    present = {p: finite(stem + e) for p, e in zip(PERSONS, PRESENT_ENDINGS)}
+    if preterite:
+        past = {p: finite(preterite + e) for p, e in zip(PERSONS, PRETERITE_STRONG)}
+        part = participle
+    else:
+        past = {p: finite(stem + e) for p, e in zip(PERSONS, PRETERITE_REGULAR)}
+        part = f'ge{stem}t'
+    if prefix:
+        part = (prefix + part) if separable else prefix + part[2:]
+    auxiliary = 'bin' if stem in ('geh', 'lauf', 'komm') else 'habe'
+    return {
+        'infinitiv': infinitive,
+        'präsens': present,
+        'präteritum': past,
+        'perfekt': {'ich': f'{auxiliary} {part}'},
+        'partizip_ii': part,
+    }
+
+
+def _level_for(parts, rng):
+    base = min(len(parts) - 1, 2) * 2
+    return LEVELS[min(5, base + rng.randint(0, 1))]
+
+
+def iter_words(count, seed=0):
+    """Yield ``count`` synthetic source rows in build_dictionary format."""
+    rng = random.Random(seed)
+    produced = 0
+
+    def emit(row):
+        nonlocal produced
+        produced += 1
+        row['audio_filename'] = f'{produced}.mp3' if rng.random() < 0.6 else None
+        return row
+
+    for stem, english, persian, preterite, participle in VERBS:
+        for prefix, english_prefix in VERB_PREFIXES:
+            if produced >= count:
+                return
+            german = prefix + stem + 'en'
+            yield emit({
+                'german': german,
+                'english': f'to {english_prefix}{english}',
+                'persian': persian,
+                'level': LEVELS[rng.randint(0, 5) if prefix else rng.randint(0, 1)],
+                'example': f'Ich möchte heute {german}.',
+                'example_english': f'I would like to {english} today.',
+                'example_persian': f'من امروز می‌خواهم {persian}.',
+                'part_of_speech': 'verb',
+                'article': None,
+                'plural': None,
+                'cases': None,
+                'tenses': json.dumps(_tenses(prefix, stem, preterite, participle), ensure_ascii=False),
+            })
+
+    for german, english, persian in ADJECTIVES:
+        if produced >= count:
+            return
+        yield emit({
+            'german': german,
+            'english': english,
+            'persian': persian,
+            'level': LEVELS[rng.randint(0, 2)],
+            'example': f'Das ist sehr {german}.',
+            'example_english': f'That is very {english}.',
+            'example_persian': f'این خیلی {persian} است.',
+            'part_of_speech': 'adjective',
+            'article': None,
+            'plural': None,
+            'cases': None,
+            'tenses': None,
+        })
+
+    for size in itertools.count(1):
+        for parts in itertools.product(NOUNS, repeat=size):
+            if produced >= count:
+                return
+            if size > 1 and any(a[0] == b[0] for a, b in zip(parts, parts[1:])):
+                continue
+            head = parts[-1]
+            german = parts[0][0] + ''.join(part[0].lower() for part in parts[1:])
+            article = head[1]
+            plural = german[:-len(head[0])] + _plural(head[0], head[2]).lower() if size > 1 \
+                else _plural(head[0], head[2])
+            english = ' '.join(part[3] for part in parts)
+            persian = ' '.join(part[4] for part in reversed(parts))
+            yield emit({
+                'german': german,
+                'english': english,
+                'persian': persian,
+                'level': _level_for(parts, rng),
+                'example': f'{article.capitalize()} {german} ist neu.',
+                'example_english': f'The {english} is new.',
+                'example_persian': f'این {persian} جدید است.',
+                'part_of_speech': 'noun',
+                'article': article,
+                'plural': plural,
+                'cases': json.dumps(_cases(german, article, plural), ensure_ascii=False),
+                'tenses': None,
+            })
+
+
+def create_dictionary(path, count, seed=0):
+    """Build ``path`` with ``count`` synthetic words through the real build pipeline."""
+    with DictionaryBuilder(path) as builder:
+        builder.load(iter_words(count, seed))
+    return builder
+
+
+def create_users(count, progress_per_user, saved_per_user, word_count, seed=0, batch_size=50000):
+    """
+    Create ``count`` users, each with ``progress_per_user`` UserWordProgress
+    and ``saved_per_user`` SavedWord rows for random word ids, on the default
+    database. Returns the created user ids.
+    """
+    User = get_user_model()
+    rng = random.Random(seed)
+    password = make_password('benchmark')
+    now = timezone.now()
+
+    User.objects.filter(email__startswith='bench-').delete()
+    User.objects.bulk_create(
+        [User(email=f'bench-{i}@example.com', password=password) for i in range(count)],
+        batch_size=1000,
+    )
+    user_ids = list(
+        User.objects.filter(email__startswith='bench-').order_by('id').values_list('id', flat=True)
+    )
+
+    progress_table = UserWordProgress._meta.db_table
+    saved_table = SavedWord._meta.db_table
+    connection = connections['default']
+    progress_sql = (
+        f'INSERT INTO {progress_table} (user_id, word_id, is_known, last_reviewed, review_count) '
+        'VALUES (%s, %s, %s, %s, %s)'
+    )
+    saved_sql = f'INSERT INTO {saved_table} (user_id, word_id, saved_at) VALUES (%s, %s, %s)'
+
+    def flush(sql, rows):
+        if rows:
+            with connection.cursor() as cursor:
+                cursor.executemany(sql, rows)
+            rows.clear()
+
+    with transaction.atomic(using='default'):
+        progress_rows, saved_rows = [], []
+        for user_id in user_ids:
+            word_ids = rng.sample(range(1, word_count + 1), min(word_count, progress_per_user))
+            for word_id in word_ids:
+                progress_rows.append((
+                    user_id, word_id, rng.random() < 0.4,
+                    now - timedelta(minutes=rng.randint(0, 60 * 24 * 365)), rng.randint(1, 20),
+                ))
+            for word_id in word_ids[:saved_per_user]:
+                saved_rows.append((user_id, word_id, now - timedelta(minutes=rng.randint(0, 60 * 24 * 365))))
+            if len(progress_rows) >= batch_size:
+                flush(progress_sql, progress_rows)
+            if len(saved_rows) >= batch_size:
+                flush(saved_sql, saved_rows)
+        flush(progress_sql, progress_rows)
+        flush(saved_sql, saved_rows)
+
+    return user_ids
@@ -0,0 +1,78 @@
+import http.client
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+
+def percentile(sorted_values, pct):
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    index = max(0, min(len(sorted_values) - 1, round(pct / 100 * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+def summarize(latencies, elapsed, errors=0):
+    """Turn raw latencies (seconds) into a JSON-friendly summary in ms."""
+    ordered = sorted(latencies)
+    return {
+        'requests': len(latencies),
+        'errors': errors,
+        'elapsed_s': round(elapsed, 3),
+        'throughput_rps': round(len(latencies) / elapsed, 1) if elapsed else 0.0,
+        'mean_ms': round(statistics.fmean(ordered) * 1000, 3) if ordered else 0.0,
+        'p50_ms': round(percentile(ordered, 50) * 1000, 3),
+        'p90_ms': round(percentile(ordered, 90) * 1000, 3),
+        'p99_ms': round(percentile(ordered, 99) * 1000, 3),
+        'max_ms': round(ordered[-1] * 1000, 3) if ordered else 0.0,
+    }
+
+
+def run_load(address, requests, concurrency=8, timeout=30):
+    """
+    Replay ``requests`` against ``address`` from ``concurrency`` client threads.
+
+    ``requests`` is a list of ``(method, path, headers, body)`` tuples or plain
+    paths for GET requests. Every status >= 400 counts as an error. Returns
+    the :func:`summarize` dict.
+    """
+    host, port = address
+
+    def worker(chunk):
+        latencies, errors = [], 0
+        conn = http.client.HTTPConnection(host, port, timeout=timeout)
+        for item in chunk:
+            method, path, headers, body = _unpack(item)
+            started = time.perf_counter()
+            try:
+                conn.request(method, path, body=body, headers=headers)
+                response = conn.getresponse()
+                response.read()
+                if response.status >= 400:
+                    errors += 1
+                if response.getheader('Connection', '').lower() == 'close':
+                    conn.close()
+            except (OSError, http.client.HTTPException):
+                errors += 1
+                conn.close()
+                conn = http.client.HTTPConnection(host, port, timeout=timeout)
+            latencies.append(time.perf_counter() - started)
+        conn.close()
+        return latencies, errors
+
+    chunks = [requests[i::concurrency] for i in range(concurrency)]
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        results = list(pool.map(worker, chunks))
+    elapsed = time.perf_counter() - started
+
+    latencies = [value for chunk, _ in results for value in chunk]
+    errors = sum(errors for _, errors in results)
+    return summarize(latencies, elapsed, errors)
+
+
+def _unpack(item):
+    if isinstance(item, str):
+        return 'GET', item, {}, None
+    method, path, headers, body = item
+    return method, path, headers or {}, body
@@ -0,0 +1,85 @@
+import contextlib
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.core.servers.basehttp import WSGIRequestHandler, WSGIServer
+from django.core.wsgi import get_wsgi_application
+from django.test.utils import override_settings
+
+# DRF throttles count requests in the default cache; a dummy cache never
+# remembers a hit, so anonymous throttling stays out of the measurement.
+BENCH_CACHES = {
+    'default': {'BACKEND': 'django.core.cache.backends.dummy.DummyCache'},
+}
+
+
+@contextmanager
+def benchmark_environment():
+    """
+    Settings for running the app under load: DEBUG off (no query log),
+    throttling disabled, and the router's per-query prints discarded.
+    """
+    # Other caches (e.g. the response cache) stay as configured.
+    caches = {**settings.CACHES, **BENCH_CACHES}
+    with override_settings(DEBUG=False, CACHES=caches), \
+            open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        yield
+
+
+class QuietWSGIRequestHandler(WSGIRequestHandler):
+    """Request handler that does not log every request to stderr."""
+
+    def log_message(self, format, *args):
+        pass
+
+
+class PooledWSGIServer(WSGIServer):
+    """
+    WSGI server that handles requests on a fixed pool of threads.
+
+    Unlike ``ThreadedWSGIServer`` (one new thread per request) the worker
+    threads are reused, the same way gunicorn's gthread workers behave, so
+    per-thread database connections survive between requests.
+    """
+
+    def __init__(self, *args, threads=8, **kwargs):
+        self.pool = ThreadPoolExecutor(max_workers=threads, thread_name_prefix='wsgi')
+        super().__init__(*args, **kwargs)
+
+    def process_request(self, request, client_address):
+        self.pool.submit(self._process_request, request, client_address)
+
+    def _process_request(self, request, client_address):
+        try:
+            self.finish_request(request, client_address)
+        except Exception:
+            self.handle_error(request, client_address)
+        finally:
+            self.shutdown_request(request)
+
+    def server_close(self):
+        super().server_close()
+        self.pool.shutdown(wait=True)
+
+
+@contextmanager
+def serve(threads=8, application=None):
+    """
+    Run the Django WSGI application on 127.0.0.1 in a background thread.
+
+    Yields the ``(host, port)`` the server listens on.
+    """
+    application = application or get_wsgi_application()
+    server = PooledWSGIServer(('127.0.0.1', 0), QuietWSGIRequestHandler, threads=threads)
+    server.set_app(application)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield server.server_address[:2]
+    finally:
+        server.shutdown()
+        server.server_close()
+        thread.join()
@@ -0,0 +1,152 @@
+"""
+Endpoint scenarios for ``run_benchmarks``.
+
+Each scenario is a function registered with :func:`scenario` that receives a
+:class:`BenchmarkContext` and returns the requests to replay, in the format
+accepted by :func:`words.benchmarks.load.run_load`.
+"""
+import json
+import threading
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+
+from django.db.backends.signals import connection_created
+
+SCENARIOS = {}
+
+
+def scenario(name):
+    """Register a scenario under ``name``; scenarios run in registration order."""
+    def decorator(func):
+        SCENARIOS[name] = func
+        return func
+    return decorator
+
+
+@dataclass
+class BenchmarkContext:
+    rng: object
+    requests: int
+    word_ids: list
+    search_terms: list
+    tokens: list = field(default_factory=list)
+    concurrency: int = 1
+
+    def auth(self, extra=None, token=None):
+        headers = {'Authorization': f'Bearer {token or self.rng.choice(self.tokens)}'}
+        if extra:
+            headers.update(extra)
+        return headers
+
+    def worker_token(self, index):
+        """
+        Token of a user only the client thread replaying request ``index``
+        uses (run_load gives request i to thread i % concurrency).
+        """
+        if len(self.tokens) < self.concurrency:
+            raise ValueError(f'Need at least {self.concurrency} benchmark users')
+        return self.tokens[index % self.concurrency]
+
+    def post_json(self, path, data, token=None):
+        body = json.dumps(data).encode('utf-8')
+        return ('POST', path, self.auth({'Content-Type': 'application/json'}, token=token), body)
+
+
+class QueryCounter:
+    """
+    Counts queries and database time per connection alias, across all
+    threads. Installed as an execute wrapper on every connection opened
+    after :meth:`install`.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.counts = Counter()
+        self.seconds = Counter()
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            elapsed = time.perf_counter() - started
+            alias = context['connection'].alias
+            with self._lock:
+                self.counts[alias] += 1
+                self.seconds[alias] += elapsed
+
+    def _on_connection_created(self, sender, connection, **kwargs):
+        # Wrappers outlive reconnects of the same DatabaseWrapper.
+        if self not in connection.execute_wrappers:
+            connection.execute_wrappers.append(self)
+
+    def install(self):
+        connection_created.connect(self._on_connection_created, weak=False)
+
+    def uninstall(self):
+        connection_created.disconnect(self._on_connection_created)
+
+    def snapshot(self):
+        with self._lock:
+            return Counter(self.counts), Counter(self.seconds)
+
+
+@scenario('list')
+def list_scenario(ctx):
+    # Level lists are unpaginated and large; fewer requests keep runs short.
+    levels = ['A1', 'A2', 'B1', 'B2', 'C1', 'C2']
+    return [f'/api/words/words/?level={ctx.rng.choice(levels)}' for _ in range(max(6, ctx.requests // 50))]
+
+
+@scenario('search')
+def search_scenario(ctx):
+    return [f'/api/words/words/?search={ctx.rng.choice(ctx.search_terms)}' for _ in range(ctx.requests)]
+
+
+@scenario('detail')
+def detail_scenario(ctx):
+    return [
+        ('GET', f'/api/words/words/{ctx.rng.choice(ctx.word_ids)}/', ctx.auth(), None)
+        for _ in range(ctx.requests)
+    ]
+
+
+@scenario('toggle-save')
+def toggle_save_scenario(ctx):
+    return [
+        ('POST', f'/api/words/words/{ctx.rng.choice(ctx.word_ids)}/toggle-save/', ctx.auth(), None)
+        for _ in range(ctx.requests)
+    ]
+
+
+@scenario('progress')
+def progress_scenario(ctx):
+    return [
+        ctx.post_json(
+            f'/api/words/words/{ctx.rng.choice(ctx.word_ids)}/progress/',
+            {'is_known': ctx.rng.random() < 0.5},
+        )
+        for _ in range(ctx.requests)
+    ]
+
+
+@scenario('sync')
+def sync_scenario(ctx):
+    # One user per client thread: concurrent first syncs of one user race in
+    # UserActivity.objects.get_or_create and leave duplicate rows behind.
+    return [
+        ctx.post_json('/api/accounts/sync-activity/', {
+            'watch_time_seconds': ctx.rng.randint(0, 600),
+            'words_searched': ctx.rng.randint(0, 20),
+            'words_saved': ctx.rng.randint(0, 5),
+            'flashcards_completed': ctx.rng.randint(0, 30),
+        }, token=ctx.worker_token(index))
+        for index in range(ctx.requests)
+    ]
+
+
+@scenario('metrics')
+def metrics_scenario(ctx):
+    # A scrape of /metrics; Prometheus does one every few seconds per worker.
+    return ['/metrics' for _ in range(max(10, ctx.requests // 20))]
@@ -4,6 +4,9 @@ from django.db import connections
 import sqlite3
 import json
 
+from fadeu.dictionary_backend import versions
+from fadeu.dictionary_backend.base import connect as connect_readonly
+
 class DatabaseTestView(View):
     """
     A view to test database connection and encoding
@@ -54,8 +57,11 @@ class DatabaseTestView(View):
         
         # Test direct SQLite connection
         try:
-            db_path = connections['dictionary'].settings_dict['NAME']
-            conn = sqlite3.connect(db_path)
+            settings_dict = connections['dictionary'].settings_dict
+            conn = connect_readonly(
+                versions.current_path(),
+                immutable=settings_dict['OPTIONS'].get('immutable', True),
+            )
             conn.row_factory = sqlite3.Row
             cursor = conn.cursor()
             
@@ -0,0 +1,391 @@
+"""
+Dictionary build pipeline.
+
+Builds a complete ``dictionary.db`` from CSV or JSONL sources outside of
+Django: rows are streamed from the source files, validated and normalized,
+inserted with batched ``executemany`` in one transaction into a fresh SQLite
+file next to the target, indexed after the load, and finally moved over the
+target with an atomic ``os.replace``. Readers of the live file keep their
+open handle on the old inode and never see a half-built dictionary.
+
+Besides the ``words`` table, BUILD_STEPS add derived tables and files (see
+words.inflections, words.form_index, words.substring_index, words.related,
+words.audio, words.packs, words.image) so everything a version needs is computed once, here.
+
+Used by the ``build_dictionary`` management command.
+"""
+import csv
+import json
+import os
+import queue
+import sqlite3
+import tempfile
+import threading
+import time
+import unicodedata
+from itertools import islice
+from pathlib import Path, PurePosixPath
+
+from words import form_index, inflections, related, substring_index
+from words.image import build_dictionary_image
+from words.audio import build_audio_bundles, build_audio_manifest
+from words.packs import build_level_packs
+
+LEVELS = {'A1', 'A2', 'B1', 'B2', 'C1', 'C2'}
+ARTICLES = {'der', 'die', 'das'}
+
+# Must stay compatible with words.models.Word (db_table 'words').
+WORDS_DDL = """
+CREATE TABLE words (
+    id INTEGER PRIMARY KEY,
+    german TEXT NOT NULL,
+    english TEXT NOT NULL,
+    persian TEXT NOT NULL,
+    level VARCHAR(2) NOT NULL,
+    example TEXT,
+    example_english TEXT,
+    example_persian TEXT,
+    part_of_speech VARCHAR(50),
+    article VARCHAR(10),
+    plural VARCHAR(100),
+    cases TEXT,
+    tenses TEXT,
+    audio_filename VARCHAR(255)
+)
+"""
+WORD_FIELDS = [
+    'id', 'german', 'english', 'persian', 'level', 'example',
+    'example_english', 'example_persian', 'part_of_speech',
+    'article', 'plural', 'cases', 'tenses', 'audio_filename',
+]
+TEXT_FIELDS = [field for field in WORD_FIELDS if field not in ('id', 'cases', 'tenses')]
+WORD_INSERT = (
+    f"INSERT INTO words ({', '.join(WORD_FIELDS)}) "
+    f"VALUES ({', '.join('?' for _ in WORD_FIELDS)})"
+)
+
+INDEXES = [
+    'CREATE INDEX words_level ON words (level)',
+    'CREATE INDEX words_german_nocase ON words (german COLLATE NOCASE)',
+    'CREATE INDEX words_part_of_speech ON words (part_of_speech, level)',
+]
+
+DEFAULT_BATCH_SIZE = 10000
+
+
+class InvalidRow(ValueError):
+    """Raised by normalize_row for a source row that cannot be imported."""
+
+
+# ---------------------------------------------------------------------------
+# Sources
+# ---------------------------------------------------------------------------
+
+def iter_csv(path):
+    """Stream rows of a CSV file with a header line as dicts."""
+    with open(path, newline='', encoding='utf-8-sig') as fh:
+        yield from csv.DictReader(fh)
+
+
+def iter_jsonl(path):
+    """Stream one JSON object per line; blank lines are skipped."""
+    with open(path, encoding='utf-8') as fh:
+        for line_number, line in enumerate(fh, start=1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError as e:
+                yield InvalidRow(f'line {line_number}: invalid JSON ({e.msg})')
+
+
+def iter_source(path, format='auto'):
+    """Pick the reader for ``path`` from ``format`` or its extension."""
+    if format == 'auto':
+        suffix = Path(path).suffix.lower()
+        format = 'jsonl' if suffix in ('.jsonl', '.ndjson', '.json') else 'csv'
+    if format == 'jsonl':
+        return iter_jsonl(path)
+    if format == 'csv':
+        return iter_csv(path)
+    raise ValueError(f'Unknown source format: {format}')
+
+
+# ---------------------------------------------------------------------------
+# Validation
+# ---------------------------------------------------------------------------
+
+def _text(value):
+    if value is None:
+        return None
+    if not isinstance(value, str):
+        value = str(value)
+    value = value.strip()
+    if not value:
+        return None
+    if not value.isascii() and not unicodedata.is_normalized('NFC', value):
+        value = unicodedata.normalize('NFC', value)
+    return value
+
+
+def _json_object(value, field):
+    """Validate a cases/tenses value and return it as compact JSON text."""
+    if value in (None, ''):
+        return None
+    if isinstance(value, str):
+        try:
+            value = json.loads(value)
+        except json.JSONDecodeError as e:
+            raise InvalidRow(f'{field}: invalid JSON ({e.msg})')
+    try:
+        inflections.validate(value)
+    except ValueError as e:
+        raise InvalidRow(f'{field}: {e}')
+    return json.dumps(value, ensure_ascii=False, separators=(',', ':'))
+
+
+def normalize_row(raw):
+    """
+    Validate and normalize one source row into a dict with WORD_FIELDS keys.
+
+    Text is NFC-normalized and stripped, the level upper-cased, the article
+    lower-cased, and cases/tenses re-encoded as compact JSON objects.
+    audio_filename must be a relative path without ``..``.
+    Raises InvalidRow if the row cannot be imported.
+    """
+    if isinstance(raw, InvalidRow):
+        raise raw
+    if not isinstance(raw, dict):
+        raise InvalidRow('expected an object')
+
+    get = raw.get
+    row = {field: _text(get(field)) for field in TEXT_FIELDS}
+    row['id'] = get('id')
+    for field in ('german', 'english', 'persian'):
+        if not row[field]:
+            raise InvalidRow(f'{field} is required')
+
+    row['level'] = (row['level'] or 'A1').upper()
+    if row['level'] not in LEVELS:
+        raise InvalidRow(f"level: {row['level']!r} is not a CEFR level")
+
+    if row['article']:
+        row['article'] = row['article'].lower()
+        if row['article'] not in ARTICLES:
+            raise InvalidRow(f"article: {row['article']!r} is not der/die/das")
+
+    if row['id'] in (None, ''):
+        row['id'] = None
+    else:
+        try:
+            row['id'] = int(row['id'])
+        except (TypeError, ValueError):
+            raise InvalidRow(f"id: {row['id']!r} is not an integer")
+
+    if row['audio_filename']:
+        # Served and bundled relative to AUDIO_ROOT (words.audio)
+        parts = PurePosixPath(row['audio_filename'].replace('\\', '/')).parts
+        if parts[0] == '/' or '..' in parts or ':' in parts[0]:
+            raise InvalidRow(f"audio_filename: {row['audio_filename']!r} is not a path inside the audio root")
+
+    row['cases'] = _json_object(get('cases'), 'cases')
+    row['tenses'] = _json_object(get('tenses'), 'tenses')
+    return row
+
+
+# ---------------------------------------------------------------------------
+# Build
+# ---------------------------------------------------------------------------
+
+def create_indexes(conn, builder):
+    for statement in INDEXES:
+        conn.execute(statement)
+
+
+# Steps run in order on the loaded (still private) database before the swap.
+BUILD_STEPS = [
+    create_indexes,
+    inflections.build_word_forms,
+    form_index.build_form_index,
+    substring_index.build_substring_index,
+    related.build_related_words,
+    build_audio_manifest,
+    build_audio_bundles,
+    build_level_packs,
+    build_dictionary_image,
+]
+
+
+class DictionaryBuilder:
+    """
+    Build a new dictionary file and atomically move it over ``target``.
+
+    Usage::
+
+        with DictionaryBuilder(target) as builder:
+            builder.load(rows)
+        # target has been replaced here, unless an exception was raised
+
+    ``errors`` collects ``(row_number, message)`` for rejected rows (up to
+    ``max_errors``); ``loaded`` and ``rejected`` count rows.
+
+    ``audio_root`` is where the clips named by ``audio_filename`` live, and
+    ``artifacts_dir`` a private directory for files that ship with this
+    build (e.g. a version directory before it is published); steps that
+    need them are skipped when they are None.
+    """
+
+    def __init__(self, target, batch_size=DEFAULT_BATCH_SIZE, max_errors=100,
+                 audio_root=None, artifacts_dir=None):
+        self.target = Path(target)
+        self.batch_size = batch_size
+        self.max_errors = max_errors
+        self.audio_root = audio_root
+        self.artifacts_dir = artifacts_dir
+        self.missing_audio = 0
+        self.loaded = 0
+        self.rejected = 0
+        self.errors = []
+        self.timings = {}
+        self.conn = None
+        self.path = None
+
+    def __enter__(self):
+        self.target.parent.mkdir(parents=True, exist_ok=True)
+        fd, path = tempfile.mkstemp(
+            prefix=f'.{self.target.name}.', suffix='.tmp', dir=self.target.parent
+        )
+        os.close(fd)
+        self.path = Path(path)
+        self.conn = sqlite3.connect(self.path, isolation_level=None)
+        # Nobody else can see this file yet, so skip journaling and fsyncs;
+        # durability is handled once, before the swap.
+        self.conn.execute('PRAGMA journal_mode = OFF')
+        self.conn.execute('PRAGMA synchronous = OFF')
+        self.conn.execute('PRAGMA locking_mode = EXCLUSIVE')
+        self.conn.execute('PRAGMA cache_size = -262144')
+        self.conn.execute(WORDS_DDL)
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        try:
+            if exc_type is None:
+                self._finish()
+        finally:
+            if self.conn is not None:
+                self.conn.close()
+                self.conn = None
+            if self.path.exists():
+                self.path.unlink()
+        return False
+
+    def _reject(self, row_number, message):
+        self.rejected += 1
+        if len(self.errors) < self.max_errors:
+            self.errors.append((row_number, message))
+
+    def _normalized(self, rows):
+        seen_ids = set()
+        next_id = 1
+        for row_number, raw in enumerate(rows, start=1):
+            try:
+                row = normalize_row(raw)
+            except InvalidRow as e:
+                self._reject(row_number, str(e))
+                continue
+
+            if row['id'] is None:
+                while next_id in seen_ids:
+                    next_id += 1
+                row['id'] = next_id
+            if row['id'] in seen_ids:
+                self._reject(row_number, f"id: duplicate id {row['id']}")
+                continue
+            seen_ids.add(row['id'])
+            yield tuple(row[field] for field in WORD_FIELDS)
+
+    def _batches(self, rows):
+        """
+        Yield normalized batches. Parsing and validation run on a background
+        thread so they overlap with inserts (sqlite3 releases the GIL while
+        SQLite works).
+        """
+        batches = queue.Queue(maxsize=4)
+        stop = threading.Event()
+        normalized = self._normalized(rows)
+
+        def put(item):
+            # Give up once the consumer has stopped, so a full queue can't
+            # block this thread (and the consumer's join) forever.
+            while not stop.is_set():
+                try:
+                    batches.put(item, timeout=0.1)
+                    return
+                except queue.Full:
+                    continue
+
+        def produce():
+            try:
+                while not stop.is_set():
+                    batch = list(islice(normalized, self.batch_size))
+                    put(batch)
+                    if not batch:
+                        return
+            except BaseException as e:
+                put(e)
+
+        producer = threading.Thread(target=produce, name='dictionary-build', daemon=True)
+        producer.start()
+        try:
+            while True:
+                batch = batches.get()
+                if isinstance(batch, BaseException):
+                    raise batch
+                if not batch:
+                    return
+                yield batch
+        finally:
+            stop.set()
+            producer.join()
+
+    def load(self, rows):
+        """Insert ``rows`` (an iterable of raw source dicts) in batches."""
+        started = time.perf_counter()
+        self.conn.execute('BEGIN')
+        try:
+            for batch in self._batches(rows):
+                self.conn.executemany(WORD_INSERT, batch)
+                self.loaded += len(batch)
+        except BaseException:
+            self.conn.execute('ROLLBACK')
+            raise
+        self.conn.execute('COMMIT')
+        self.timings['load'] = time.perf_counter() - started
+
+    def _finish(self):
+        for step in BUILD_STEPS:
+            started = time.perf_counter()
+            step(self.conn, self)
+            self.timings[step.__name__] = time.perf_counter() - started
+
+        self.conn.execute('ANALYZE')
+        self.conn.close()
+        self.conn = None
+
+        with open(self.path, 'rb') as fh:
+            os.fsync(fh.fileno())
+        os.chmod(self.path, 0o644)
+        os.replace(self.path, self.target)
+        _fsync_directory(self.target.parent)
+
+
+def _fsync_directory(path):
+    try:
+        fd = os.open(path, os.O_RDONLY)
+    except OSError:
+        return  # not supported on this platform (e.g. Windows)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
@@ -0,0 +1,104 @@
+"""
+Bounded thread pool for raw, read-only dictionary queries from async views.
+
+Django's async ORM still runs every query through ``sync_to_async`` on the
+single thread-sensitive executor, so concurrent async requests queue behind
+each other. Dictionary reads don't need Django's transaction machinery, so
+they run here instead: a fixed number of threads, each with its own
+persistent read-only sqlite3 connection (see fadeu.dictionary_backend).
+"""
+import asyncio
+import sqlite3
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.db import DatabaseError, connections
+
+from fadeu.dictionary_backend import versions
+from fadeu.dictionary_backend.base import READ_ONLY_OPTIONS, connect
+
+DEFAULT_WORKERS = 4
+
+_local = threading.local()
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def get_connection():
+    """
+    Return this thread's read-only connection to the dictionary, reopening
+    it when a new dictionary version has been published.
+    """
+    version = versions.current_version()
+    conn = getattr(_local, 'connection', None)
+    if conn is not None and _local.version != version:
+        conn.close()
+        conn = None
+    if conn is None:
+        options = settings.DATABASES['dictionary'].get('OPTIONS', {})
+        conn = connect(
+            versions.current_path(version),
+            **{key: options[key] for key in READ_ONLY_OPTIONS if key in options}
+        )
+        conn.row_factory = sqlite3.Row
+        _local.connection = conn
+        _local.version = version
+    return conn
+
+
+def fetchall(sql, params=()):
+    """
+    Run a query on the Django ``dictionary`` connection of the calling
+    thread, for sync views reading tables without a model. Returns None if
+    a table is missing (dictionary built before it existed).
+    """
+    try:
+        with connections['dictionary'].cursor() as cursor:
+            cursor.execute(sql, params)
+            return cursor.fetchall()
+    except DatabaseError:
+        return None
+
+
+def open_version():
+    """
+    Key of the dictionary the calling thread's Django connection reads: its
+    published version while it is open, otherwise versions.version_key()
+    (what the next query will open). For caches derived from dictionary
+    contents.
+    """
+    connection = connections['dictionary']
+    version = getattr(connection, 'dictionary_version', None)
+    if connection.connection is None or version is None:
+        # Not open (e.g. closed after a new version was published, and only
+        # cache hits since): the next query opens the current version.
+        return versions.version_key()
+    return version
+
+
+def get_executor():
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(
+                    max_workers=getattr(settings, 'DICTIONARY_READ_WORKERS', DEFAULT_WORKERS),
+                    thread_name_prefix='dictionary',
+                )
+    return _executor
+
+
+def _call(func, args):
+    return func(get_connection(), *args)
+
+
+async def run(func, *args):
+    """
+    Run ``func(connection, *args)`` on a dictionary reader thread.
+
+    At most DICTIONARY_READ_WORKERS queries run at once; the rest wait in the
+    executor queue without holding a thread.
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(get_executor(), _call, func, args)
@@ -0,0 +1,75 @@
+"""
+Sparse fieldsets for word endpoints.
+
+``?fields=id,german,english`` returns exactly those fields; ``?profile=``
+picks a named set of word fields (extra fields of the serializer, such as
+``progress`` for signed-in users, are kept):
+
+    headword   id, german, article, english, persian, level
+    card       headword + part_of_speech, plural, examples, audio_filename
+    full       everything (the default)
+
+The queryset is restricted to the matching columns with ``only()``, so the
+large ``cases``, ``tenses`` and ``example*`` TEXT columns are neither read
+from the dictionary nor serialized unless asked for.
+"""
+from rest_framework.exceptions import ValidationError
+
+from .models import Word
+
+HEADWORD_FIELDS = ['id', 'german', 'article', 'english', 'persian', 'level']
+PROFILES = {
+    'headword': HEADWORD_FIELDS,
+    'card': HEADWORD_FIELDS + [
+        'part_of_speech', 'plural', 'example', 'example_english',
+        'example_persian', 'audio_filename',
+    ],
+    'full': None,
+}
+
+# Serializer fields computed from another column
+SOURCE_COLUMNS = {'word': 'german', 'translation': 'english'}
+
+
+class SparseFieldsMixin:
+    """For generic views over Word: honours ?fields= and ?profile=."""
+
+    def requested_fields(self):
+        """Serializer field names to keep, or None for all of them."""
+        if hasattr(self, '_requested_fields'):
+            return self._requested_fields
+        params = self.request.query_params
+        available = list(self.get_serializer_class()().fields)
+        fields = None
+        if params.get('fields'):
+            fields = [name.strip() for name in params['fields'].split(',') if name.strip()]
+            unknown = [name for name in fields if name not in available]
+            if unknown:
+                raise ValidationError({'fields': f"Unknown fields: {', '.join(unknown)}"})
+        elif params.get('profile'):
+            if params['profile'] not in PROFILES:
+                raise ValidationError({'profile': f"Choose one of: {', '.join(PROFILES)}"})
+            if PROFILES[params['profile']] is not None:
+                columns = _columns()
+                fields = PROFILES[params['profile']] + [
+                    name for name in available if name not in columns and name not in SOURCE_COLUMNS
+                ]
+        self._requested_fields = fields
+        return fields
+
+    def get_serializer(self, *args, **kwargs):
+        kwargs.setdefault('fields', self.requested_fields())
+        return super().get_serializer(*args, **kwargs)
+
+    def filter_queryset(self, queryset):
+        # filter_queryset rather than get_queryset: views override the latter.
+        queryset = super().filter_queryset(queryset)
+        fields = self.requested_fields()
+        if fields is None:
+            return queryset
+        needed = {'id'} | {SOURCE_COLUMNS.get(name, name) for name in fields}
+        return queryset.only(*sorted(needed & _columns()))
+
+
+def _columns():
+    return {field.attname for field in Word._meta.concrete_fields}
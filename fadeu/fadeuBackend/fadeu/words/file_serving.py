@@ -0,0 +1,183 @@
+"""
+File responses with conditional GET, single byte ranges and optional
+front-server offload.
+
+``serve_file`` answers ``If-None-Match``/``If-Modified-Since`` with 304
+before opening the file, honours ``Range: bytes=a-b`` (with ``If-Range``) so
+interrupted downloads resume, and streams through ``FileResponse`` so WSGI
+servers with ``wsgi.file_wrapper`` support (gunicorn) use ``sendfile()``.
+With ``settings.SENDFILE_HEADER`` set, the body is left to the front server
+instead (``X-Accel-Redirect`` for nginx, ``X-Sendfile`` for Apache/lighttpd),
+which also handles ranges itself.
+"""
+import mimetypes
+import os
+import re
+from pathlib import Path
+from urllib.parse import quote
+
+from django.conf import settings
+from django.http import FileResponse, Http404, HttpResponse
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import (
+    content_disposition_header, http_date, parse_http_date_safe, quote_etag,
+)
+
+BLOCK_SIZE = 64 * 1024
+
+_RANGE_RE = re.compile(r'^bytes=(\d*)-(\d*)$')
+
+
+class RangeNotSatisfiable(Exception):
+    pass
+
+
+class RangeFile:
+    """
+    Read at most ``length`` bytes of ``fh`` starting at ``start``.
+
+    Exposes ``fileno()`` with the OS file position already at ``start``, so
+    sendfile-capable WSGI servers still send the range zero-copy (they take
+    the length from Content-Length).
+    """
+
+    def __init__(self, fh, start, length):
+        fh.seek(start)
+        self.fh = fh
+        self.name = fh.name
+        self.remaining = length
+
+    def read(self, size=-1):
+        if self.remaining <= 0:
+            return b''
+        if size < 0 or size > self.remaining:
+            size = self.remaining
+        data = self.fh.read(size)
+        self.remaining -= len(data)
+        return data
+
+    def fileno(self):
+        return self.fh.fileno()
+
+    def close(self):
+        self.fh.close()
+
+
+def parse_range(header, size):
+    """
+    Return the inclusive ``(start, end)`` of a single ``bytes=`` range, or
+    None to send the whole file (no header, or a form we don't support such
+    as multiple ranges). Raises RangeNotSatisfiable.
+    """
+    match = _RANGE_RE.match(header.strip()) if header else None
+    if match is None:
+        return None
+    first, last = match.groups()
+    if not first and not last:
+        return None
+    if not first:
+        # Suffix range: the last N bytes.
+        length = int(last)
+        if length == 0:
+            raise RangeNotSatisfiable
+        return max(size - length, 0), size - 1
+    start = int(first)
+    end = min(int(last), size - 1) if last else size - 1
+    if start >= size or end < start:
+        raise RangeNotSatisfiable
+    return start, end
+
+
+def _if_range_matches(request, etag, last_modified):
+    value = request.META.get('HTTP_IF_RANGE')
+    if value is None:
+        return True
+    if value.startswith(('"', 'W/')):
+        return value == etag  # weak validators never match
+    return parse_http_date_safe(value) == last_modified
+
+
+def sendfile_value(path):
+    """Value of the SENDFILE_HEADER for ``path``, or None if not configured."""
+    header = getattr(settings, 'SENDFILE_HEADER', None)
+    if not header:
+        return None
+    path = Path(path).resolve()
+    if header.lower() == 'x-sendfile':
+        return str(path)
+    for root, prefix in getattr(settings, 'SENDFILE_LOCATIONS', {}).items():
+        root = Path(root).resolve()
+        if root in path.parents:
+            return prefix.rstrip('/') + '/' + quote(path.relative_to(root).as_posix())
+    return None
+
+
+def serve_file(request, path, *, etag=None, stat=None, content_type=None,
+               max_age=None, filename=None, as_attachment=False):
+    """
+    Serve ``path`` for a GET or HEAD request.
+
+    ``etag`` (unquoted) defaults to one derived from size and mtime;
+    pass a content hash when one is known. ``stat`` may be passed to save
+    a syscall.
+    """
+    if stat is None:
+        try:
+            stat = os.stat(path)
+        except OSError:
+            raise Http404('File not found')
+    etag = quote_etag(etag or f'{stat.st_mtime_ns:x}-{stat.st_size:x}')
+    last_modified = int(stat.st_mtime)
+    content_type = content_type or mimetypes.guess_type(str(path))[0] or 'application/octet-stream'
+
+    def finish(response):
+        if as_attachment and 'Content-Disposition' not in response:
+            response['Content-Disposition'] = content_disposition_header(
+                True, filename or Path(path).name
+            )
+        response['ETag'] = etag
+        response['Last-Modified'] = http_date(last_modified)
+        if max_age is not None:
+            patch_cache_control(response, public=True, max_age=max_age)
+        return response
+
+    not_modified = get_conditional_response(request, etag=etag, last_modified=last_modified)
+    if not_modified is not None:
+        return finish(not_modified)
+
+    offload = sendfile_value(path)
+    if offload is not None:
+        response = HttpResponse(content_type=content_type)
+        response[settings.SENDFILE_HEADER] = offload
+        return finish(response)
+
+    size = stat.st_size
+    start, end = 0, size - 1
+    status = 200
+    if request.method == 'GET' and _if_range_matches(request, etag, last_modified):
+        try:
+            byte_range = parse_range(request.META.get('HTTP_RANGE'), size)
+        except RangeNotSatisfiable:
+            response = HttpResponse(status=416)
+            response['Content-Range'] = f'bytes */{size}'
+            return finish(response)
+        if byte_range is not None:
+            start, end = byte_range
+            status = 206
+
+    length = end - start + 1 if size else 0
+    if request.method == 'HEAD':
+        response = HttpResponse(content_type=content_type)
+    else:
+        fh = open(path, 'rb')
+        body = fh if status == 200 else RangeFile(fh, start, length)
+        response = FileResponse(
+            body, status=status, content_type=content_type,
+            as_attachment=as_attachment, filename=filename or '',
+        )
+        response.block_size = BLOCK_SIZE
+    response['Content-Length'] = str(length)
+    response['Accept-Ranges'] = 'bytes'
+    if status == 206:
+        response['Content-Range'] = f'bytes {start}-{end}/{size}'
+    return finish(response)
@@ -0,0 +1,22 @@
+from rest_framework.filters import SearchFilter
+
+from . import form_index
+
+
+class InflectedFormSearchFilter(SearchFilter):
+    """
+    SearchFilter that also matches inflected forms: ``?search=ging`` finds
+    "gehen" and ``?search=des Hauses`` finds "Haus" through the
+    word_form_index (one indexed probe for the whole search string).
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        results = super().filter_queryset(request, queryset, view)
+        terms = self.get_search_terms(request)
+        if not terms:
+            return results
+
+        word_ids = [word_id for word_id, _, _ in form_index.lookup(' '.join(terms))]
+        if not word_ids:
+            return results
+        return results | queryset.filter(id__in=word_ids)
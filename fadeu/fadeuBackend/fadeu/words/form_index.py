@@ -0,0 +1,95 @@
+"""
+Reverse index from inflected forms to headwords.
+
+Built with the dictionary from the headword, Word.plural and every form in
+word_forms (see words.inflections), so "ging", "Häuser" or "des Hauses"
+resolve to their lemma with one primary-key probe::
+
+    form_key     | word_id | rank | form        | source
+    -------------+---------+------+-------------+------------------
+    ging         | 7       | 1    | ging        | präteritum ich
+    des hauses   | 12      | 1    | des Hauses  | genitiv singular
+    hauses       | 12      | 1    | des Hauses  | genitiv singular
+
+Keys are NFC, case-folded and whitespace-collapsed (:func:`form_key`); a
+form starting with a definite article is also indexed without it. When
+several forms of a word share a key, the headword (rank 0) wins, then the
+first form in source order.
+"""
+import unicodedata
+
+FORM_INDEX_DDL = """
+CREATE TABLE word_form_index (
+    form_key TEXT NOT NULL,
+    word_id INTEGER NOT NULL,
+    rank INTEGER NOT NULL,
+    form TEXT NOT NULL,
+    source TEXT,
+    PRIMARY KEY (form_key, word_id)
+) WITHOUT ROWID
+"""
+FORM_INDEX_INSERT = 'INSERT OR IGNORE INTO word_form_index VALUES (?, ?, ?, ?, ?)'
+
+ARTICLES = {'der', 'die', 'das', 'des', 'dem', 'den'}
+
+RANK_HEADWORD = 0
+RANK_FORM = 1
+
+LOOKUP_LIMIT = 50
+
+
+def form_key(text):
+    """Normalized lookup key of ``text``."""
+    return ' '.join(unicodedata.normalize('NFC', text).casefold().split())
+
+
+def keys_for(form):
+    """Index keys of one form: the whole form, and without a leading article."""
+    key = form_key(form)
+    if not key:
+        return []
+    first, _, rest = key.partition(' ')
+    if rest and first in ARTICLES:
+        return [key, rest]
+    return [key]
+
+
+def build_form_index(conn, builder):
+    """Fill ``word_form_index`` from words and word_forms (run after both exist)."""
+    conn.execute(FORM_INDEX_DDL)
+
+    def rows():
+        for word_id, german, plural in conn.execute('SELECT id, german, plural FROM words'):
+            for key in keys_for(german):
+                yield key, word_id, RANK_HEADWORD, german, None
+            if plural:
+                for key in keys_for(plural):
+                    yield key, word_id, RANK_FORM, plural, 'plural'
+        for word_id, feature, slot, form in conn.execute(
+            'SELECT word_id, feature, slot, form FROM word_forms ORDER BY word_id, kind, position'
+        ):
+            source = f'{feature} {slot}' if slot else feature
+            for key in keys_for(form):
+                yield key, word_id, RANK_FORM, form, source
+
+    conn.execute('BEGIN')
+    conn.cursor().executemany(FORM_INDEX_INSERT, rows())
+    conn.execute('COMMIT')
+
+
+def lookup(text, limit=LOOKUP_LIMIT):
+    """
+    ``[(word_id, form, source)]`` for the words ``text`` is a form of,
+    headword matches first. Empty if the dictionary has no index.
+    """
+    from .dictionary_reader import fetchall
+
+    key = form_key(text)
+    if not key:
+        return []
+    rows = fetchall(
+        'SELECT word_id, form, source FROM word_form_index '
+        'WHERE form_key = %s ORDER BY rank, word_id LIMIT %s',
+        [key, limit],
+    )
+    return rows or []
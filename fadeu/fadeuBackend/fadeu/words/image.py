@@ -0,0 +1,222 @@
+"""
+Compact binary image of the words table, shared between worker processes.
+
+Versioned builds write ``<version dir>/dictionary.img``; every worker maps
+it read-only with ``mmap``, so all processes on a host share one copy of
+the pages in the OS page cache instead of each holding Python objects per
+word. Lookups by id (binary search) or by index decode only the requested
+strings and never build model instances.
+
+Layout (little-endian; sections 8-byte aligned)::
+
+    header      magic, format version, word count, metadata length
+    metadata    JSON: code tables and the offset/length of every section
+    ids         int64[count], ascending
+    level, part_of_speech, article
+                uint16[count] codes into the code tables (0 = NULL)
+    <string column>.offsets
+                uint32[count + 1] byte offsets into the pool
+    <string column>.nulls
+                bitmap, one bit per word set for NULL
+    pool        the UTF-8 strings, back to back
+
+Rows are mappings keyed by words.serializers.WORD_COLUMNS, so
+word_row_to_representation turns them into API responses directly.
+
+Nothing in here needs Django except :func:`current`.
+"""
+import json
+import mmap
+import os
+import struct
+import threading
+from bisect import bisect_left
+from pathlib import Path
+
+IMAGE_NAME = 'dictionary.img'
+MAGIC = b'FADEUIMG'
+FORMAT_VERSION = 1
+HEADER = struct.Struct('<8sHHII')  # magic, version, reserved, count, metadata length
+
+CODED_COLUMNS = ('level', 'part_of_speech', 'article')
+STRING_COLUMNS = (
+    'german', 'english', 'persian', 'example', 'example_english',
+    'example_persian', 'plural', 'cases', 'tenses', 'audio_filename',
+)
+ALIGNMENT = 8
+
+
+def _pad(size):
+    return -size % ALIGNMENT
+
+
+def build_dictionary_image(conn, builder):
+    """Write the image of the words table into the version directory."""
+    if builder.artifacts_dir is None:
+        return
+
+    columns = ('id',) + CODED_COLUMNS + STRING_COLUMNS
+    rows = conn.execute(f"SELECT {', '.join(columns)} FROM words ORDER BY id").fetchall()
+    count = len(rows)
+
+    codes = {column: [None] for column in CODED_COLUMNS}
+    code_of = {column: {None: 0} for column in CODED_COLUMNS}
+    sections = {'ids': struct.pack(f'<{count}q', *(row[0] for row in rows))}
+    for position, column in enumerate(CODED_COLUMNS, start=1):
+        values = []
+        for row in rows:
+            value = row[position]
+            if value not in code_of[column]:
+                code_of[column][value] = len(codes[column])
+                codes[column].append(value)
+            values.append(code_of[column][value])
+        sections[column] = struct.pack(f'<{count}H', *values)
+
+    pool = bytearray()
+    for position, column in enumerate(STRING_COLUMNS, start=1 + len(CODED_COLUMNS)):
+        offsets = [len(pool)]
+        nulls = bytearray((count + 7) // 8)
+        for index, row in enumerate(rows):
+            value = row[position]
+            if value is None:
+                nulls[index // 8] |= 1 << (index % 8)
+            else:
+                pool += str(value).encode('utf-8')
+            offsets.append(len(pool))
+        sections[f'{column}.offsets'] = offsets
+        sections[f'{column}.nulls'] = bytes(nulls)
+    if len(pool) >= 2 ** 32:
+        raise ValueError('String pool too large for 32-bit offsets')
+    for column in STRING_COLUMNS:
+        offsets = sections[f'{column}.offsets']
+        sections[f'{column}.offsets'] = struct.pack(f'<{len(offsets)}I', *offsets)
+    sections['pool'] = bytes(pool)
+
+    # Section offsets are relative to the end of the metadata, so the
+    # metadata can be written before its own length is known.
+    layout, position = {}, 0
+    for name, data in sections.items():
+        layout[name] = [position, len(data)]
+        position += len(data) + _pad(len(data))
+    metadata = json.dumps(
+        {'codes': codes, 'sections': layout}, ensure_ascii=False, separators=(',', ':')
+    ).encode('utf-8')
+    metadata += b' ' * _pad(HEADER.size + len(metadata))
+
+    path = Path(builder.artifacts_dir) / IMAGE_NAME
+    with open(path, 'wb') as fh:
+        fh.write(HEADER.pack(MAGIC, FORMAT_VERSION, 0, count, len(metadata)))
+        fh.write(metadata)
+        for data in sections.values():
+            fh.write(data)
+            fh.write(b'\0' * _pad(len(data)))
+    os.chmod(path, 0o644)
+
+
+class DictionaryImage:
+    """Read-only view of an image file."""
+
+    def __init__(self, path):
+        with open(path, 'rb') as fh:
+            self._mmap = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+        view = memoryview(self._mmap)
+        magic, version, _, self.count, metadata_length = HEADER.unpack_from(view)
+        if magic != MAGIC or version != FORMAT_VERSION:
+            raise ValueError(f'{path} is not a dictionary image (version {FORMAT_VERSION})')
+        base = HEADER.size + metadata_length
+        metadata = json.loads(bytes(view[HEADER.size:base]))
+        self.codes = metadata['codes']
+
+        def section(name, fmt=None):
+            start, length = metadata['sections'][name]
+            data = view[base + start:base + start + length]
+            return data.cast(fmt) if fmt else data
+
+        self.ids = section('ids', 'q')
+        self._coded = {column: section(column, 'H') for column in CODED_COLUMNS}
+        self._offsets = {column: section(f'{column}.offsets', 'I') for column in STRING_COLUMNS}
+        self._nulls = {column: section(f'{column}.nulls') for column in STRING_COLUMNS}
+        self._pool = section('pool')
+
+    def __len__(self):
+        return self.count
+
+    def index_of(self, word_id):
+        """Index of ``word_id``, or None if the image has no such word."""
+        index = bisect_left(self.ids, word_id)
+        if index < self.count and self.ids[index] == word_id:
+            return index
+        return None
+
+    def value(self, index, column):
+        if column == 'id':
+            return self.ids[index]
+        if column in self._coded:
+            return self.codes[column][self._coded[column][index]]
+        if self._nulls[column][index // 8] & (1 << (index % 8)):
+            return None
+        offsets = self._offsets[column]
+        return str(self._pool[offsets[index]:offsets[index + 1]], 'utf-8')
+
+    def row(self, index, columns=None):
+        """``{column: value}`` of the word at ``index`` (all WORD_COLUMNS by default)."""
+        columns = columns or ('id',) + CODED_COLUMNS + STRING_COLUMNS
+        return {column: self.value(index, column) for column in columns}
+
+    def get(self, word_id, columns=None):
+        index = self.index_of(word_id)
+        return None if index is None else self.row(index, columns)
+
+    def ids_where(self, **filters):
+        """Ascending ids whose coded columns equal ``filters`` (a scan of uint16 columns)."""
+        columns = []
+        for column, value in filters.items():
+            try:
+                columns.append((self._coded[column], self.codes[column].index(value)))
+            except ValueError:
+                return []
+        ids = self.ids
+        return [ids[index] for index in range(self.count)
+                if all(coded[index] == code for coded, code in columns)]
+
+    def close(self):
+        for name in ('ids', '_pool'):
+            getattr(self, name).release()
+        for views in (self._coded, self._offsets, self._nulls):
+            for view in views.values():
+                view.release()
+        self._mmap.close()
+
+
+KEEP_IMAGES = 2  # the current version and the one before it
+_images = {}
+_lock = threading.Lock()
+
+
+def current():
+    """
+    The image of the current dictionary version, or None for unversioned
+    dictionaries and versions built without one.
+    """
+    from django.db import connections
+
+    from fadeu.dictionary_backend import versions
+
+    if connections['dictionary'].is_in_memory_db():
+        return None  # test database, never versioned
+    version = versions.current_version()
+    if version is None:
+        return None
+    try:
+        return _images[version]
+    except KeyError:
+        pass
+    with _lock:
+        if version not in _images:
+            path = versions.version_dir(version) / IMAGE_NAME
+            _images[version] = DictionaryImage(path) if path.exists() else None
+            # Older images are dropped, not closed: threads may still be
+            # reading them. They are unmapped once the last reference goes.
+            while len(_images) > KEEP_IMAGES:
+                del _images[next(iter(_images))]
+        return _images[version]
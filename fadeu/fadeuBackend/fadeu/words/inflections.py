@@ -0,0 +1,159 @@
+"""
+Structured storage for Word.cases and Word.tenses.
+
+Inflections are validated once, at dictionary build time: each value must be
+a JSON object whose values are strings or objects of strings, e.g.::
+
+    {"infinitiv": "gehen", "präsens": {"ich": "gehe", "du": "gehst"}}
+
+Invalid rows are rejected by the build instead of turning into ``{}`` at
+request time. Every form is also stored as one row of ``word_forms``::
+
+    word_id | kind   | position | feature  | slot | form
+    --------+--------+----------+----------+------+------
+    7       | tenses | 0        | infinitiv| NULL | gehen
+    7       | tenses | 1        | präsens  | ich  | gehe
+
+which makes the inflections queryable (words.models.WordForm) and lets
+:func:`forms_for_ids` load them for a batch of words with one indexed query.
+
+Serializers read the JSON column through :func:`load`: each word's value
+is decoded once per process and dictionary version (so the decoded values
+grow to at most two per word) and every later call gets a copy, which is
+several times cheaper than ``json.loads`` and safe for the caller to modify.
+"""
+import json
+from itertools import groupby
+from operator import itemgetter
+
+KINDS = ('cases', 'tenses')
+
+WORD_FORMS_DDL = """
+CREATE TABLE word_forms (
+    word_id INTEGER NOT NULL,
+    kind VARCHAR(6) NOT NULL,
+    position INTEGER NOT NULL,
+    feature TEXT NOT NULL,
+    slot TEXT,
+    form TEXT NOT NULL,
+    PRIMARY KEY (word_id, kind, position)
+) WITHOUT ROWID
+"""
+WORD_FORMS_INSERT = 'INSERT INTO word_forms VALUES (?, ?, ?, ?, ?, ?)'
+
+
+def validate(value):
+    """Raise ValueError unless ``value`` has the inflection structure above."""
+    if not isinstance(value, dict):
+        raise ValueError('expected a JSON object')
+    for feature, entry in value.items():
+        if isinstance(entry, str):
+            continue
+        if not isinstance(entry, dict):
+            raise ValueError(f'{feature}: expected a string or an object')
+        for slot, form in entry.items():
+            if not isinstance(form, str):
+                raise ValueError(f'{feature}.{slot}: expected a string')
+
+
+def flatten(value):
+    """Yield ``(feature, slot, form)`` for a validated inflection object."""
+    for feature, entry in value.items():
+        if isinstance(entry, str):
+            yield feature, None, entry
+        else:
+            for slot, form in entry.items():
+                yield feature, slot, form
+
+
+def unflatten(rows):
+    """Rebuild the inflection object from ``(feature, slot, form)`` rows in position order."""
+    value = {}
+    for feature, slot, form in rows:
+        if slot is None:
+            value[feature] = form
+        else:
+            value.setdefault(feature, {})[slot] = form
+    return value
+
+
+_decoded = {}  # (word_id, kind) -> (raw, decoded value)
+
+
+def parse(raw):
+    """
+    Parsed cases/tenses for a JSON column value, or None if it is empty or
+    malformed (only possible in dictionaries built before validation).
+    """
+    if not raw or not isinstance(raw, str):
+        return None
+    try:
+        return json.loads(raw)
+    except json.JSONDecodeError:
+        return None
+
+
+def _copy(value):
+    if isinstance(value, dict):
+        return {key: _copy(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_copy(item) for item in value]
+    return value
+
+
+def load(word_id, kind, raw):
+    """
+    :func:`parse` for the ``kind`` column of ``word_id``, decoding each
+    value only once; returns a new object on every call.
+    """
+    if not raw or not isinstance(raw, str):
+        return None
+    entry = _decoded.get((word_id, kind))
+    # Compared with the stored value, so a request still reading the
+    # previous dictionary version never gets the other version's forms.
+    if entry is None or entry[0] != raw:
+        entry = (raw, parse(raw))
+        if word_id is not None:
+            _decoded[word_id, kind] = entry
+    return _copy(entry[1])
+
+
+def clear_cache():
+    _decoded.clear()
+
+
+def build_word_forms(conn, builder):
+    """Fill ``word_forms`` from the (already validated) words.cases/tenses."""
+    conn.execute(WORD_FORMS_DDL)
+
+    def rows():
+        for word_id, cases, tenses in conn.execute('SELECT id, cases, tenses FROM words'):
+            for kind, raw in (('cases', cases), ('tenses', tenses)):
+                if raw:
+                    for position, (feature, slot, form) in enumerate(flatten(json.loads(raw))):
+                        yield word_id, kind, position, feature, slot, form
+
+    conn.execute('BEGIN')
+    # A second cursor, so the SELECT above keeps streaming during inserts.
+    conn.cursor().executemany(WORD_FORMS_INSERT, rows())
+    conn.execute('COMMIT')
+
+
+def forms_for_ids(ids, kinds=KINDS):
+    """
+    ``{word_id: {kind: inflections}}`` for the given word ids, loaded from
+    ``word_forms`` with a single query. Words without inflections of a kind
+    get None for it.
+    """
+    from .models import WordForm
+
+    ids = list(ids)
+    result = {word_id: dict.fromkeys(kinds) for word_id in ids}
+    rows = (
+        WordForm.objects.filter(word_id__in=ids, kind__in=kinds)
+        .order_by('word_id', 'kind', 'position')
+        .values_list('word_id', 'kind', 'feature', 'slot', 'form')
+    )
+    for (word_id, kind), group in groupby(rows, key=itemgetter(0, 1)):
+        result[word_id][kind] = unflatten(row[2:] for row in group)
+    return result
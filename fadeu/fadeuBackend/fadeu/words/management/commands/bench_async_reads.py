@@ -0,0 +1,80 @@
+import json
+import random
+from urllib.parse import quote
+
+from django.core.management.base import BaseCommand, CommandError
+
+from fadeu.dictionary_backend import versions
+from fadeu.dictionary_backend.base import connect as connect_readonly
+from words.benchmarks.async_load import run_async_load
+from words.benchmarks.server import benchmark_environment
+
+
+class Command(BaseCommand):
+    help = (
+        'Load-test the sync DRF dictionary endpoints against their async '
+        'variants (/api/words/async/...) under a single uvicorn worker with '
+        'many concurrent, optionally slow, clients. Requires uvicorn.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=2000,
+                            help='Requests per scenario (default: 2000)')
+        parser.add_argument('--concurrency', type=int, default=200,
+                            help='Concurrent client connections (default: 200)')
+        parser.add_argument('--read-delay', type=float, default=0.0,
+                            help='Seconds a client pauses between 4 KiB reads (default: 0)')
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument('--output', help='Write results as JSON to this file')
+
+    def handle(self, *args, **options):
+        try:
+            from words.benchmarks.asgi_server import serve_asgi
+            import uvicorn  # noqa: F401
+        except ImportError:
+            raise CommandError('uvicorn is required: pip install uvicorn')
+
+        db_path = versions.current_path()
+        try:
+            conn = connect_readonly(db_path)
+            rows = conn.execute('SELECT id, german, level FROM words').fetchall()
+            conn.close()
+        except Exception as e:
+            raise CommandError(f'Cannot read dictionary at {db_path}: {e}')
+        if not rows:
+            raise CommandError(f'Dictionary at {db_path} has no words')
+
+        rng = random.Random(options['seed'])
+        picks = [rng.choice(rows) for _ in range(options['requests'])]
+        scenarios = {
+            'detail': [f'words/{pk}/' for pk, _, _ in picks],
+            'search': [f'words/?search={quote(german.split()[-1])}' for _, german, _ in picks],
+            'level': [f'words/?level={level}' for _, _, level in picks[:max(1, len(picks) // 20)]],
+        }
+        prefixes = {
+            'sync': '/api/words/',
+            'async': '/api/words/async/',
+        }
+
+        results = {}
+        with benchmark_environment(), serve_asgi() as address:
+            for scenario, paths in scenarios.items():
+                results[scenario] = {}
+                for variant, prefix in prefixes.items():
+                    result = run_async_load(
+                        address,
+                        [prefix + path for path in paths],
+                        concurrency=options['concurrency'],
+                        read_delay=options['read_delay'],
+                    )
+                    results[scenario][variant] = result
+                    self.stdout.write(
+                        f"{scenario:<7} {variant:<6} {result['throughput_rps']:>9.1f} req/s  "
+                        f"p50 {result['p50_ms']:.2f} ms  p99 {result['p99_ms']:.2f} ms  "
+                        f"errors {result['errors']}"
+                    )
+
+        if options['output']:
+            with open(options['output'], 'w', encoding='utf-8') as fh:
+                json.dump(results, fh, indent=2)
+            self.stdout.write(f"Results written to {options['output']}")
@@ -0,0 +1,108 @@
+import json
+import random
+from urllib.parse import quote
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+
+from fadeu.dictionary_backend import versions
+from fadeu.dictionary_backend.base import connect as connect_readonly
+from words.benchmarks.load import run_load
+from words.benchmarks.server import benchmark_environment, serve
+
+
+class Command(BaseCommand):
+    help = (
+        'Compare dictionary lookup and search throughput of the stock SQLite '
+        'backend (new connection per request) against the read-only '
+        'dictionary backend, under a pooled, threaded WSGI server'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=2000,
+                            help='Requests per scenario (default: 2000)')
+        parser.add_argument('--concurrency', type=int, default=8,
+                            help='Concurrent client connections (default: 8)')
+        parser.add_argument('--threads', type=int, default=8,
+                            help='WSGI server worker threads (default: 8)')
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument('--output', help='Write results as JSON to this file')
+
+    def handle(self, *args, **options):
+        settings_dict = connections.settings['dictionary']
+        db_path = versions.current_path()
+        rng = random.Random(options['seed'])
+
+        try:
+            conn = connect_readonly(db_path)
+            rows = conn.execute('SELECT id, german FROM words').fetchall()
+            conn.close()
+        except Exception as e:
+            raise CommandError(f'Cannot read dictionary at {db_path}: {e}')
+        if not rows:
+            raise CommandError(f'Dictionary at {db_path} has no words')
+
+        lookups = [
+            f'/api/words/words/{rng.choice(rows)[0]}/'
+            for _ in range(options['requests'])
+        ]
+        searches = [
+            f'/api/words/words/?search={_search_term(rng.choice(rows)[1])}'
+            for _ in range(options['requests'])
+        ]
+
+        modes = {
+            'before': {
+                **settings_dict,
+                'NAME': str(db_path),
+                'ENGINE': 'django.db.backends.sqlite3',
+                'CONN_MAX_AGE': 0,
+                'OPTIONS': {'timeout': settings_dict['OPTIONS'].get('timeout', 20)},
+            },
+            'after': {
+                **settings_dict,
+                'ENGINE': 'fadeu.dictionary_backend',
+                'CONN_MAX_AGE': None,
+            },
+        }
+
+        results = {}
+        try:
+            for mode, config in modes.items():
+                connections.settings['dictionary'] = config
+                results[mode] = {}
+                for scenario, paths in (('lookup', lookups), ('search', searches)):
+                    results[mode][scenario] = self._run(paths, options)
+                    self._report(mode, scenario, results[mode][scenario])
+        finally:
+            connections.settings['dictionary'] = settings_dict
+
+        for scenario in ('lookup', 'search'):
+            before = results['before'][scenario]['throughput_rps']
+            after = results['after'][scenario]['throughput_rps']
+            if before:
+                self.stdout.write(self.style.SUCCESS(
+                    f'{scenario}: {after / before:.2f}x throughput'
+                ))
+
+        if options['output']:
+            with open(options['output'], 'w', encoding='utf-8') as fh:
+                json.dump(results, fh, indent=2)
+            self.stdout.write(f"Results written to {options['output']}")
+
+    def _run(self, paths, options):
+        with benchmark_environment():
+            with serve(threads=options['threads']) as address:
+                return run_load(address, paths, concurrency=options['concurrency'])
+
+    def _report(self, mode, scenario, result):
+        self.stdout.write(
+            f"{mode:<6} {scenario:<6} {result['throughput_rps']:>9.1f} req/s  "
+            f"p50 {result['p50_ms']:.2f} ms  p99 {result['p99_ms']:.2f} ms  "
+            f"errors {result['errors']}"
+        )
+
+
+def _search_term(german):
+    # Drop the article so the term matches like a user would type it.
+    return quote(german.split()[-1] if german else '')
@@ -0,0 +1,141 @@
+import json
+import logging
+import os
+import tempfile
+import time
+
+from django.core.management.base import BaseCommand
+
+from fadeu.logging_pipeline import LazyJSON, QueueListenerHandler, SamplingFilter
+
+# What an activity sync request logs: the request and response payloads
+REQUEST_DATA = {
+    'watch_time_seconds': 312, 'words_searched': 7, 'words_saved': 2,
+    'flashcards_completed': 18, 'longest_streak': 4,
+}
+RESPONSE_DATA = {
+    'success': True,
+    'message': 'Activity synced successfully',
+    'data': {
+        'watch_time_seconds': 91234, 'words_searched': 812, 'words_saved': 140,
+        'flashcards_completed': 2311, 'current_streak': 4, 'longest_streak': 19,
+        'last_studied': '2026-01-01T12:00:00+00:00', 'level': 7, 'experience_points': 8150,
+    },
+}
+
+
+def log_before(logger, user_id):
+    # SyncUserActivityView before: five INFO lines plus the response dump
+    logger.info("=" * 50)
+    logger.info("🔄 ACTIVITY SYNC REQUEST RECEIVED")
+    logger.info(f"👤 User: user{user_id}@example.com (ID: {user_id})")
+    logger.info(f"📊 Activity Data: {json.dumps(REQUEST_DATA, indent=2)}")
+    logger.info("=" * 50)
+    logger.info(f"✅ Activity sync successful: {json.dumps(RESPONSE_DATA, indent=2)}")
+
+
+def log_after(logger, user_id):
+    # SyncUserActivityView now: one INFO line, payloads at DEBUG, lazily
+    logger.info("🔄 Activity sync for user %s", user_id)
+    logger.debug("📊 Activity data: %s", LazyJSON(REQUEST_DATA))
+    logger.debug("✅ Activity sync successful: %s", LazyJSON(RESPONSE_DATA))
+
+
+class SlowStream:
+    """A log stream whose writes block, like a full pipe to a log collector."""
+
+    def __init__(self, stream, latency):
+        self.stream = stream
+        self.latency = latency
+
+    def write(self, text):
+        time.sleep(self.latency)
+        return self.stream.write(text)
+
+    def flush(self):
+        self.stream.flush()
+
+
+class Command(BaseCommand):
+    help = (
+        'Measure the logging cost per activity sync request on the request '
+        'thread: the old synchronous multi-line logging against the '
+        'queued, lazy and sampled pipeline of fadeu.logging_pipeline'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=20000,
+                            help='Simulated requests per variant (default: 20000)')
+        parser.add_argument('--sample-rate', type=float, default=0.01,
+                            help='Rate of the sampled variant (default: 0.01)')
+        parser.add_argument('--sink-latency-us', type=int, default=200,
+                            help='Write latency of the slow-sink variants (default: 200)')
+        parser.add_argument('--output', help='Write results as JSON to this file')
+
+    def _run(self, name, log, handler, level=logging.INFO, sampling=None, requests=0):
+        logger = logging.getLogger(f'bench_logging.{name}')
+        logger.handlers[:] = [handler]
+        logger.propagate = False
+        logger.setLevel(level)
+        logger.filters[:] = [sampling] if sampling else []
+
+        started = time.perf_counter()
+        for user_id in range(requests):
+            log(logger, user_id)
+        request_thread = time.perf_counter() - started
+        if isinstance(handler, QueueListenerHandler):
+            handler.stop_listener()
+        drained = time.perf_counter() - started
+        handler.close()
+        return {
+            'us_per_request': round(request_thread / requests * 1e6, 2),
+            'us_per_request_until_written': round(drained / requests * 1e6, 2),
+            'dropped': getattr(handler, 'dropped', 0),
+        }
+
+    def handle(self, *args, **options):
+        requests = options['requests']
+        formatter = logging.Formatter('%(asctime)s %(levelname)s %(name)s %(process)d %(message)s')
+        results = {}
+        with tempfile.TemporaryDirectory() as tmp:
+            def file_handler():
+                handler = logging.FileHandler(os.path.join(tmp, 'bench.log'), encoding='utf-8')
+                handler.setFormatter(formatter)
+                return handler
+
+            def slow_handler():
+                handler = file_handler()
+                handler.setStream(SlowStream(handler.stream, options['sink_latency_us'] / 1e6))
+                return handler
+
+            def queue_handler(target=file_handler):
+                return QueueListenerHandler([target()], queue_size=requests * 3)
+
+            variants = [
+                ('before', log_before, file_handler, logging.INFO, None),
+                ('lazy', log_after, file_handler, logging.INFO, None),
+                ('lazy+queue', log_after, queue_handler, logging.INFO, None),
+                ('lazy+queue+sampled', log_after, queue_handler, logging.INFO,
+                 SamplingFilter(rate=options['sample_rate'])),
+                ('debug payloads+queue', log_after, queue_handler, logging.DEBUG, None),
+                ('before, slow sink', log_before, slow_handler, logging.INFO, None),
+                ('lazy, slow sink', log_after, slow_handler, logging.INFO, None),
+                ('lazy+queue, slow sink', log_after, lambda: queue_handler(slow_handler), logging.INFO, None),
+            ]
+            for name, log, make_handler, level, sampling in variants:
+                results[name] = self._run(
+                    name, log, make_handler(), level=level, sampling=sampling, requests=requests,
+                )
+
+        baseline = results['before']['us_per_request']
+        for name, result in results.items():
+            self.stdout.write(
+                f"{name:<22} {result['us_per_request']:>8.2f} us/request on the request thread "
+                f"({result['us_per_request'] / baseline:.0%})  "
+                f"{result['us_per_request_until_written']:>8.2f} us/request until written"
+            )
+
+        if options['output']:
+            with open(options['output'], 'w', encoding='utf-8') as fh:
+                json.dump(results, fh, indent=2)
+            self.stdout.write(f"Results written to {options['output']}")
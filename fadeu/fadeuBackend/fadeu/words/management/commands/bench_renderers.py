@@ -0,0 +1,61 @@
+import gzip
+import json
+import time
+
+from django.core.management.base import BaseCommand
+from rest_framework.renderers import JSONRenderer
+
+from words.models import Word
+from words.renderers import COMPACT_RENDERERS
+from words.serializers import WordSerializer
+
+
+class Command(BaseCommand):
+    help = (
+        'Compare payload size (raw and gzip) and encode time of the word '
+        'list renderers (JSON and the compact ones in words.renderers) on '
+        'the level lists of the current dictionary'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--repeat', type=int, default=5,
+                            help='Renders per level and renderer; the fastest counts (default: 5)')
+        parser.add_argument('--output', help='Write results as JSON to this file')
+
+    def handle(self, *args, **options):
+        renderers = [JSONRenderer] + COMPACT_RENDERERS
+        results = {}
+        levels = [level for level, _ in Word.LEVEL_CHOICES]
+        for level in levels:
+            data = WordSerializer(Word.objects.filter(level=level), many=True).data
+            if not data:
+                continue
+            results[level] = {}
+            for renderer_class in renderers:
+                renderer = renderer_class()
+                best = None
+                for _ in range(options['repeat']):
+                    started = time.perf_counter()
+                    content = renderer.render(data, renderer.media_type, {})
+                    elapsed = time.perf_counter() - started
+                    best = elapsed if best is None else min(best, elapsed)
+                results[level][renderer.format] = {
+                    'words': len(data),
+                    'bytes': len(content),
+                    'gzip_bytes': len(gzip.compress(content, 6)),
+                    'encode_ms': round(best * 1000, 2),
+                }
+
+        for level, formats in results.items():
+            baseline = formats['json']
+            for name, result in formats.items():
+                self.stdout.write(
+                    f"{level} {name:<9} {result['bytes']:>10} B ({result['bytes'] / baseline['bytes']:.0%})  "
+                    f"gzip {result['gzip_bytes']:>9} B ({result['gzip_bytes'] / baseline['gzip_bytes']:.0%})  "
+                    f"encode {result['encode_ms']:>7.2f} ms"
+                )
+
+        if options['output']:
+            with open(options['output'], 'w', encoding='utf-8') as fh:
+                json.dump(results, fh, indent=2)
+            self.stdout.write(f"Results written to {options['output']}")
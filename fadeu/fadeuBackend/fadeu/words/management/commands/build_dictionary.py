@@ -0,0 +1,97 @@
+import hashlib
+import itertools
+import shutil
+import tempfile
+import time
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from fadeu.dictionary_backend import versions
+from words.dictionary_build import DEFAULT_BATCH_SIZE, DictionaryBuilder, iter_source
+
+
+class Command(BaseCommand):
+    help = (
+        'Build the dictionary database from CSV or JSONL files and publish it as '
+        'a new version in DICTIONARY_DIR; running workers switch to it without a '
+        'restart. Columns/keys match the Word model.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('sources', nargs='+', help='CSV or JSONL source files')
+        parser.add_argument('--format', choices=['auto', 'csv', 'jsonl'], default='auto',
+                            help='Source format (default: from the file extension)')
+        parser.add_argument('--output',
+                            help='Replace this single dictionary file instead of publishing a version')
+        parser.add_argument('--audio-root',
+                            help='Directory with the audio clips (default: settings.AUDIO_ROOT)')
+        parser.add_argument('--keep', type=int, default=3,
+                            help='Published versions to keep, including the new one (default: 3)')
+        parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE,
+                            help=f'Rows per executemany batch (default: {DEFAULT_BATCH_SIZE})')
+        parser.add_argument('--max-rejected', type=int, default=None,
+                            help='Abort without replacing the dictionary if more rows are rejected')
+
+    def handle(self, *args, **options):
+        if options['output']:
+            target = Path(options['output'])
+            build_dir = None
+        else:
+            dictionary_dir = versions.dictionary_dir()
+            dictionary_dir.mkdir(parents=True, exist_ok=True)
+            build_dir = Path(tempfile.mkdtemp(prefix='.build-', dir=dictionary_dir))
+            target = build_dir / versions.DATABASE_FILENAME
+
+        rows = itertools.chain.from_iterable(
+            iter_source(source, options['format']) for source in options['sources']
+        )
+
+        started = time.perf_counter()
+        try:
+            builder = DictionaryBuilder(
+                target,
+                batch_size=options['batch_size'],
+                audio_root=options['audio_root'] or getattr(settings, 'AUDIO_ROOT', None),
+                artifacts_dir=build_dir,
+            )
+            with builder:
+                builder.load(rows)
+                self._report_rejected(builder)
+                if options['max_rejected'] is not None and builder.rejected > options['max_rejected']:
+                    raise CommandError(
+                        f"{builder.rejected} rows rejected (limit {options['max_rejected']}); "
+                        f'nothing was published'
+                    )
+            if build_dir is not None:
+                version = f"{time.strftime('%Y%m%d%H%M%S')}-{_digest(target)}"
+                target = versions.publish(build_dir, version, keep=options['keep']) / target.name
+        except OSError as e:
+            raise CommandError(f'Build failed: {e}')
+        finally:
+            if build_dir is not None and build_dir.exists():
+                shutil.rmtree(build_dir, ignore_errors=True)
+
+        if builder.missing_audio:
+            self.stderr.write(f'{builder.missing_audio} audio files not found under {builder.audio_root}')
+        timings = ', '.join(f'{step} {seconds:.2f}s' for step, seconds in builder.timings.items())
+        self.stdout.write(self.style.SUCCESS(
+            f'Built {target}: {builder.loaded} words, {builder.rejected} rejected, '
+            f'{time.perf_counter() - started:.2f}s ({timings})'
+        ))
+
+    def _report_rejected(self, builder):
+        for row_number, message in builder.errors:
+            self.stderr.write(f'Row {row_number}: {message}')
+        if builder.rejected > len(builder.errors):
+            self.stderr.write(f'... and {builder.rejected - len(builder.errors)} more')
+
+
+def _digest(path, length=8):
+    """Short content hash used in version names."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as fh:
+        for chunk in iter(lambda: fh.read(1024 * 1024), b''):
+            digest.update(chunk)
+    return digest.hexdigest()[:length]
@@ -0,0 +1,72 @@
+import json
+import time
+
+from django.conf import settings
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+
+from words.benchmarks.fixtures import create_dictionary, create_users
+
+
+class Command(BaseCommand):
+    help = (
+        'Generate a synthetic dictionary and synthetic users with progress and '
+        'saved words for the benchmark suite. '
+        'Run with --settings=fadeu.settings_benchmark.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--words', type=int, default=100000,
+                            help='Dictionary size (default: 100000)')
+        parser.add_argument('--users', type=int, default=1000,
+                            help='Number of users (default: 1000)')
+        parser.add_argument('--progress-per-user', type=int, default=2000,
+                            help='UserWordProgress rows per user (default: 2000)')
+        parser.add_argument('--saved-per-user', type=int, default=500,
+                            help='SavedWord rows per user (default: 500)')
+        parser.add_argument('--seed', type=int, default=0)
+
+    def handle(self, *args, **options):
+        benchmark_dir = getattr(settings, 'BENCHMARK_DIR', None)
+        if benchmark_dir is None:
+            raise CommandError(
+                'Refusing to overwrite real data: run with --settings=fadeu.settings_benchmark'
+            )
+        benchmark_dir.mkdir(parents=True, exist_ok=True)
+
+        started = time.perf_counter()
+        dictionary_path = connections['dictionary'].settings_dict['NAME']
+        connections['dictionary'].close()
+        self.stdout.write(f"Writing {options['words']} words to {dictionary_path}...")
+        create_dictionary(dictionary_path, options['words'], seed=options['seed'])
+
+        self.stdout.write('Migrating the default database...')
+        call_command('migrate', database='default', verbosity=0)
+
+        self.stdout.write(
+            f"Creating {options['users']} users with {options['progress_per_user']} progress "
+            f"and {options['saved_per_user']} saved rows each..."
+        )
+        user_ids = create_users(
+            options['users'],
+            options['progress_per_user'],
+            options['saved_per_user'],
+            word_count=options['words'],
+            seed=options['seed'],
+        )
+
+        dataset = {
+            'words': options['words'],
+            'users': len(user_ids),
+            'progress_rows': len(user_ids) * min(options['words'], options['progress_per_user']),
+            'saved_rows': len(user_ids) * min(options['words'], options['progress_per_user'],
+                                              options['saved_per_user']),
+            'seed': options['seed'],
+        }
+        with open(benchmark_dir / 'dataset.json', 'w', encoding='utf-8') as fh:
+            json.dump(dataset, fh, indent=2)
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Benchmark data ready in {time.perf_counter() - started:.1f}s: {dataset}'
+        ))
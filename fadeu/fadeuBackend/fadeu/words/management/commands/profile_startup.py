@@ -0,0 +1,146 @@
+import json
+import os
+import subprocess
+import sys
+import time
+from collections import defaultdict
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+# Development-only modules that should not load in production workers
+DIAGNOSTIC_MODULES = [
+    'words.views_test', 'words.views_debug', 'words.test_connection',
+    'words.test_encoding', 'words.db_test',
+]
+
+MARKER = 'PROFILE_STARTUP '
+
+# Runs in a fresh interpreter: what a new worker does before it can answer.
+CHILD_SCRIPT = '''
+import json, sys, time
+started = time.perf_counter()
+import django
+django.setup()
+setup_done = time.perf_counter()
+from django.core.wsgi import get_wsgi_application
+application = get_wsgi_application()
+app_done = time.perf_counter()
+from io import BytesIO
+status = []
+environ = {
+    'REQUEST_METHOD': 'GET', 'PATH_INFO': %(path)r, 'QUERY_STRING': '',
+    'SERVER_NAME': %(host)r, 'SERVER_PORT': '80', 'HTTP_HOST': %(host)r,
+    'wsgi.url_scheme': 'http', 'wsgi.input': BytesIO(), 'wsgi.errors': sys.stderr,
+    'wsgi.version': (1, 0), 'wsgi.multithread': True, 'wsgi.multiprocess': True,
+    'wsgi.run_once': False,
+}
+response = application(environ, lambda s, headers, exc_info=None: status.append(s))
+b''.join(response)
+response.close()
+request_done = time.perf_counter()
+print(%(marker)r + json.dumps({
+    'setup_ms': (setup_done - started) * 1000,
+    'application_ms': (app_done - setup_done) * 1000,
+    'first_request_ms': (request_done - app_done) * 1000,
+    'status': status[0] if status else None,
+    'modules': sorted(sys.modules),
+}))
+'''
+
+
+def parse_importtime(stderr):
+    """``[(module, self_us, cumulative_us)]`` from ``python -X importtime`` output."""
+    imports = []
+    for line in stderr.splitlines():
+        if not line.startswith('import time:'):
+            continue
+        fields = line[len('import time:'):].split('|')
+        if len(fields) != 3 or not fields[0].strip().isdigit():
+            continue  # the column header
+        imports.append((fields[2].strip(), int(fields[0]), int(fields[1])))
+    return imports
+
+
+class Command(BaseCommand):
+    help = (
+        'Start a fresh interpreter with the current settings and report '
+        'import time per module and the time until the first request is '
+        'answered (what a new or recycled worker costs)'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--path', default='/api/words/words/1/',
+                            help='Path of the first request (default: /api/words/words/1/)')
+        parser.add_argument('--host', default='localhost',
+                            help='Host header of the first request (must be in ALLOWED_HOSTS)')
+        parser.add_argument('--limit', type=int, default=25,
+                            help='Modules to list, slowest cumulative import first (default: 25)')
+        parser.add_argument('--runs', type=int, default=1,
+                            help='Cold starts to measure; the fastest counts (default: 1)')
+        parser.add_argument('--output', help='Write results as JSON to this file')
+
+    def _run_child(self, options):
+        env = dict(os.environ)
+        env['DJANGO_SETTINGS_MODULE'] = os.environ.get('DJANGO_SETTINGS_MODULE', settings.SETTINGS_MODULE)
+        env['PYTHONPATH'] = os.pathsep.join(filter(None, [str(settings.BASE_DIR), env.get('PYTHONPATH')]))
+        script = CHILD_SCRIPT % {'path': options['path'], 'host': options['host'], 'marker': MARKER}
+        started = time.perf_counter()
+        proc = subprocess.run(
+            [sys.executable, '-X', 'importtime', '-c', script],
+            env=env, cwd=settings.BASE_DIR, capture_output=True, text=True,
+        )
+        wall_ms = (time.perf_counter() - started) * 1000
+        lines = [line for line in proc.stdout.splitlines() if line.startswith(MARKER)]
+        if proc.returncode != 0 or not lines:
+            raise CommandError(f'Startup failed (exit {proc.returncode}):\n{proc.stderr[-2000:]}')
+        result = json.loads(lines[-1][len(MARKER):])
+        result['process_ms'] = wall_ms
+        result['imports'] = parse_importtime(proc.stderr)
+        return result
+
+    def handle(self, *args, **options):
+        runs = [self._run_child(options) for _ in range(max(1, options['runs']))]
+        result = min(runs, key=lambda run: run['process_ms'])
+        imports = result.pop('imports')
+        modules = result.pop('modules')
+
+        by_package = defaultdict(int)
+        for module, self_us, _ in imports:
+            by_package[module.split('.')[0]] += self_us
+        slowest = sorted(imports, key=lambda item: item[2], reverse=True)[:options['limit']]
+
+        self.stdout.write(f"Settings: {os.environ.get('DJANGO_SETTINGS_MODULE', settings.SETTINGS_MODULE)}")
+        self.stdout.write(
+            f"Process start to first response: {result['process_ms']:.0f} ms "
+            f"(django.setup {result['setup_ms']:.0f} ms, WSGI application {result['application_ms']:.0f} ms, "
+            f"first request {result['first_request_ms']:.0f} ms, {result['status']})"
+        )
+        self.stdout.write(
+            f'{len(modules)} modules loaded, {sum(item[1] for item in imports) / 1000:.0f} ms spent importing'
+        )
+        self.stdout.write('\nSlowest imports (cumulative / self, ms):')
+        for module, self_us, cumulative_us in slowest:
+            self.stdout.write(f'{cumulative_us / 1000:>9.1f} {self_us / 1000:>8.1f}  {module}')
+        self.stdout.write('\nImport time by top-level package (self, ms):')
+        for package, self_us in sorted(by_package.items(), key=lambda item: item[1], reverse=True)[:options['limit']]:
+            self.stdout.write(f'{self_us / 1000:>9.1f}  {package}')
+
+        loaded = [module for module in DIAGNOSTIC_MODULES if module in modules]
+        self.stdout.write(
+            f"\nDiagnostic modules loaded: {', '.join(loaded)}" if loaded
+            else '\nNo diagnostic modules loaded'
+        )
+
+        if options['output']:
+            result.update(
+                imports=[
+                    {'module': module, 'self_us': self_us, 'cumulative_us': cumulative_us}
+                    for module, self_us, cumulative_us in imports
+                ],
+                by_package=dict(by_package),
+                diagnostic_modules=loaded,
+            )
+            with open(options['output'], 'w', encoding='utf-8') as fh:
+                json.dump(result, fh, indent=2)
+            self.stdout.write(f"Results written to {options['output']}")
@@ -0,0 +1,21 @@
+from django.core.management.base import BaseCommand
+
+from words import stats
+
+
+class Command(BaseCommand):
+    help = (
+        'Rebuild the per-user, per-level learning statistics (user_level_stats) '
+        'from progress and saved words. Run after imports or after a dictionary '
+        'build that moved words between levels.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--user', type=int, action='append', dest='users',
+            help='Only rebuild this user id (repeatable); default: all users.'
+        )
+
+    def handle(self, *args, **options):
+        rows = stats.rebuild(options['users'])
+        self.stdout.write(self.style.SUCCESS(f'Rebuilt {rows} stats rows.'))
@@ -0,0 +1,185 @@
+import json
+import platform
+import random
+import subprocess
+import time
+from datetime import datetime, timezone
+from urllib.parse import quote
+
+import django
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+from django.test.utils import override_settings
+from rest_framework_simplejwt.tokens import AccessToken
+
+from fadeu.dictionary_backend import versions
+from fadeu.dictionary_backend.base import connect as connect_readonly
+from words.benchmarks.load import run_load
+from words.benchmarks.server import benchmark_environment, serve
+from words.benchmarks.suite import SCENARIOS, BenchmarkContext, QueryCounter
+
+
+def _git_revision():
+    try:
+        revision = subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], cwd=settings.BASE_DIR,
+            capture_output=True, text=True, check=True,
+        ).stdout.strip()
+        dirty = subprocess.run(
+            ['git', 'status', '--porcelain', '--untracked-files=no'], cwd=settings.BASE_DIR,
+            capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return 'unknown'
+    return f'{revision}-dirty' if dirty else revision
+
+
+class Command(BaseCommand):
+    help = (
+        'Run the endpoint benchmark suite against the synthetic data from '
+        'generate_benchmark_data and write the results as JSON. '
+        'Run with --settings=fadeu.settings_benchmark.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--scenario', action='append', choices=list(SCENARIOS),
+                            help='Only run this scenario (repeatable)')
+        parser.add_argument('--requests', type=int, default=1000,
+                            help='Requests per scenario (default: 1000)')
+        parser.add_argument('--concurrency', type=int, default=8,
+                            help='Concurrent client connections (default: 8)')
+        parser.add_argument('--threads', type=int, default=8,
+                            help='WSGI server worker threads (default: 8)')
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument('--output', help='Results file (default: BENCHMARK_DIR/results/...)')
+        parser.add_argument('--compare', help='Earlier results file to compare against')
+        parser.add_argument('--without-metrics', action='store_true',
+                            help='Disable fadeu.metrics (METRICS_ENABLED = False); compare with a '
+                                 'normal run to measure the metrics overhead')
+
+    def handle(self, *args, **options):
+        benchmark_dir = getattr(settings, 'BENCHMARK_DIR', None)
+        if benchmark_dir is None:
+            raise CommandError('Run with --settings=fadeu.settings_benchmark')
+        try:
+            with open(benchmark_dir / 'dataset.json', encoding='utf-8') as fh:
+                dataset = json.load(fh)
+        except FileNotFoundError:
+            raise CommandError('No benchmark data; run generate_benchmark_data first')
+
+        ctx = self._context(options)
+        names = options['scenario'] or list(SCENARIOS)
+        if options['without_metrics']:
+            names = [name for name in names if name != 'metrics']  # no /metrics route
+        counter = QueryCounter()
+        counter.install()
+        results = {}
+        try:
+            with benchmark_environment(), \
+                    override_settings(METRICS_ENABLED=not options['without_metrics']), \
+                    serve(threads=options['threads']) as address:
+                for name in names:
+                    requests = SCENARIOS[name](ctx)
+                    counts_before, seconds_before = counter.snapshot()
+                    result = run_load(address, requests, concurrency=options['concurrency'])
+                    counts_after, seconds_after = counter.snapshot()
+
+                    total = max(1, result['requests'])
+                    result['queries_per_request'] = {
+                        alias: round((counts_after[alias] - counts_before[alias]) / total, 2)
+                        for alias in connections
+                    }
+                    result['db_ms_per_request'] = {
+                        alias: round((seconds_after[alias] - seconds_before[alias]) * 1000 / total, 3)
+                        for alias in connections
+                    }
+                    results[name] = result
+                    self._report(name, result)
+        finally:
+            counter.uninstall()
+
+        report = {
+            'meta': {
+                'revision': _git_revision(),
+                'timestamp': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+                'python': platform.python_version(),
+                'django': django.get_version(),
+                'settings': settings.SETTINGS_MODULE,
+                'dataset': dataset,
+                'requests': options['requests'],
+                'concurrency': options['concurrency'],
+                'threads': options['threads'],
+                'seed': options['seed'],
+                'metrics': not options['without_metrics'],
+            },
+            'scenarios': results,
+        }
+
+        output = options['output']
+        if not output:
+            results_dir = benchmark_dir / 'results'
+            results_dir.mkdir(parents=True, exist_ok=True)
+            stamp = time.strftime('%Y%m%d-%H%M%S')
+            output = results_dir / f"{stamp}-{report['meta']['revision']}.json"
+        with open(output, 'w', encoding='utf-8') as fh:
+            json.dump(report, fh, indent=2)
+        self.stdout.write(self.style.SUCCESS(f'Results written to {output}'))
+
+        if options['compare']:
+            self._compare(options['compare'], results)
+
+        failed = [name for name, result in results.items() if result['errors']]
+        if failed:
+            # The timings of failed requests (often fast 500s) are in the numbers.
+            raise CommandError(f"Requests failed in {', '.join(failed)}; these results are not valid")
+
+    def _context(self, options):
+        rng = random.Random(options['seed'])
+        db_path = versions.current_path()
+        conn = connect_readonly(db_path)
+        try:
+            rows = conn.execute('SELECT id, german FROM words').fetchall()
+        finally:
+            conn.close()
+        if not rows:
+            raise CommandError(f'Dictionary at {db_path} has no words')
+
+        users = list(get_user_model().objects.filter(email__startswith='bench-')[:200])
+        if not users:
+            raise CommandError('No benchmark users; run generate_benchmark_data first')
+
+        sample = rng.sample(rows, min(len(rows), 500))
+        return BenchmarkContext(
+            rng=rng,
+            requests=options['requests'],
+            word_ids=[word_id for word_id, _ in rows],
+            search_terms=[quote(german.split()[-1]) for _, german in sample],
+            tokens=[str(AccessToken.for_user(user)) for user in users],
+            concurrency=options['concurrency'],
+        )
+
+    def _report(self, name, result):
+        queries = ', '.join(
+            f'{alias}={count}' for alias, count in result['queries_per_request'].items()
+        )
+        self.stdout.write(
+            f"{name:<12} {result['throughput_rps']:>9.1f} req/s  "
+            f"p50 {result['p50_ms']:>8.2f} ms  p90 {result['p90_ms']:>8.2f} ms  "
+            f"p99 {result['p99_ms']:>8.2f} ms  errors {result['errors']:<4}  queries/req {queries}"
+        )
+
+    def _compare(self, path, results):
+        with open(path, encoding='utf-8') as fh:
+            baseline = json.load(fh)
+        self.stdout.write(f"\nCompared with {baseline['meta']['revision']} ({path}):")
+        for name, result in results.items():
+            before = baseline['scenarios'].get(name)
+            if not before:
+                continue
+            changes = []
+            for key in ('throughput_rps', 'p50_ms', 'p99_ms'):
+                if before[key]:
+                    changes.append(f'{key} {(result[key] - before[key]) / before[key] * 100:+.1f}%')
+            self.stdout.write(f"{name:<12} {'  '.join(changes)}")
@@ -16,6 +16,12 @@ class Migration(migrations.Migration):
             name='userwordprogress',
             unique_together=set(),
         ),
+        # The old ``word`` foreign key owns the ``word_id`` column, so it has
+        # to go before the plain integer field can be added.
+        migrations.RemoveField(
+            model_name='userwordprogress',
+            name='word',
+        ),
         migrations.AddField(
             model_name='userwordprogress',
             name='word_id',
@@ -25,8 +31,4 @@ class Migration(migrations.Migration):
             name='userwordprogress',
             unique_together={('user', 'word_id')},
         ),
-        migrations.RemoveField(
-            model_name='userwordprogress',
-            name='word',
-        ),
     ]
@@ -0,0 +1,29 @@
+# Generated by Django 5.2 on 2026-10-19 13:07
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('words', '0002_alter_userwordprogress_unique_together_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='WordForm',
+            fields=[
+                ('pk', models.CompositePrimaryKey('word_id', 'kind', 'position', blank=True, editable=False, primary_key=True, serialize=False)),
+                ('word_id', models.IntegerField()),
+                ('kind', models.CharField(max_length=6)),
+                ('position', models.IntegerField()),
+                ('feature', models.TextField()),
+                ('slot', models.TextField(null=True)),
+                ('form', models.TextField()),
+            ],
+            options={
+                'db_table': 'word_forms',
+                'managed': False,
+            },
+        ),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 5.2 on 2026-10-19 13:15
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('words', '0003_wordform'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='UserLevelStats',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('level', models.CharField(choices=[('A1', 'A1 (Beginner)'), ('A2', 'A2 (Elementary)'), ('B1', 'B1 (Intermediate)'), ('B2', 'B2 (Upper-Intermediate)'), ('C1', 'C1 (Advanced)'), ('C2', 'C2 (Proficiency)')], max_length=2)),
+                ('seen', models.IntegerField(default=0)),
+                ('known', models.IntegerField(default=0)),
+                ('saved', models.IntegerField(default=0)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='level_stats', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'db_table': 'user_level_stats',
+                'unique_together': {('user', 'level')},
+            },
+        ),
+    ]
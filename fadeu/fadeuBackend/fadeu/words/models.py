@@ -2,6 +2,8 @@ from django.db import models
 from django.conf import settings
 import json
 
+from . import inflections
+
 # Use the custom User model from the users app
 User = settings.AUTH_USER_MODEL
 
@@ -37,22 +39,12 @@ class Word(models.Model):
         return f"{self.german} ({self.english})"
     
     def get_cases(self):
-        """Parse and return the cases as a dictionary."""
-        if self.cases:
-            try:
-                return json.loads(self.cases)
-            except json.JSONDecodeError:
-                return {}
-        return {}
+        """Return the cases as a dictionary."""
+        return inflections.load(self.pk, 'cases', self.cases) or {}
     
     def get_tenses(self):
-        """Parse and return the tenses as a dictionary."""
-        if self.tenses:
-            try:
-                return json.loads(self.tenses)
-            except json.JSONDecodeError:
-                return {}
-        return {}
+        """Return the tenses as a dictionary."""
+        return inflections.load(self.pk, 'tenses', self.tenses) or {}
     
     def to_dict(self, include_examples=True, include_advanced=False):
         """Convert the word to a dictionary with all fields."""
@@ -104,6 +96,27 @@ class Word(models.Model):
         return json.dumps(data)
 
 
+class WordForm(models.Model):
+    """
+    One inflected form of a word, from the word_forms table the dictionary
+    build derives from Word.cases/tenses (see words.inflections).
+    """
+    pk = models.CompositePrimaryKey('word_id', 'kind', 'position')
+    word_id = models.IntegerField()
+    kind = models.CharField(max_length=6)  # 'cases' or 'tenses'
+    position = models.IntegerField()
+    feature = models.TextField()  # e.g. 'genitiv', 'präteritum'
+    slot = models.TextField(null=True)  # e.g. 'singular', 'ich'; None for plain values
+    form = models.TextField()
+
+    class Meta:
+        managed = False
+        db_table = 'word_forms'
+
+    def __str__(self):
+        return f"{self.word_id} {self.feature} {self.slot or ''}: {self.form}"
+
+
 class UserWordProgress(models.Model):
     """Tracks user's progress with words"""
     user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='word_progress')
@@ -145,6 +158,10 @@ class SavedWord(models.Model):
         # Get the word from the dictionary database
         if not self.word_id:
             return None
+        # Set by views that load the words of a whole list at once
+        prefetched = getattr(self, '_prefetched_word', None)
+        if prefetched is not None:
+            return prefetched
         return Word.objects.using('dictionary').get(pk=self.word_id)
     
     def __str__(self):
@@ -155,3 +172,40 @@ class SavedWord(models.Model):
             return f"{self.user.email} - Invalid Word ID: {self.word_id} (Saved: {self.saved_at})"
         except Exception as e:
             return f"{self.user.email} - Error: {str(e)} (Saved: {self.saved_at})"
+
+
+class SavedListVersion(models.Model):
+    """
+    Version of a user's saved-words list, bumped in the transaction of every
+    change to it (words.saved_lists). Kept in the database so all worker
+    processes see the same value.
+    """
+    user = models.OneToOneField(User, on_delete=models.CASCADE, primary_key=True,
+                                related_name='saved_list_version')
+    version = models.BigIntegerField(default=0)
+
+    class Meta:
+        db_table = 'saved_list_versions'
+
+    def __str__(self):
+        return f"{self.user_id}: {self.version}"
+
+
+class UserLevelStats(models.Model):
+    """
+    Per-user, per-level counts of seen, known and saved words. Kept up to
+    date by words.stats as progress and saved words change; rebuilt in bulk
+    by the ``rebuild_user_stats`` command.
+    """
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='level_stats')
+    level = models.CharField(max_length=2, choices=Word.LEVEL_CHOICES)
+    seen = models.IntegerField(default=0)
+    known = models.IntegerField(default=0)
+    saved = models.IntegerField(default=0)
+
+    class Meta:
+        unique_together = ('user', 'level')
+        db_table = 'user_level_stats'
+
+    def __str__(self):
+        return f"{self.user_id} {self.level}: {self.known}/{self.seen} known, {self.saved} saved"
@@ -0,0 +1,144 @@
+"""
+Precompressed per-level word packs.
+
+For published dictionary versions the build writes, per CEFR level, the
+exact JSON ``WordListView?level=<level>`` returns to anonymous clients, once
+as is and once each gzip- and (if the ``brotli`` package is installed)
+brotli-compressed::
+
+    <version dir>/packs/A1.json
+    <version dir>/packs/A1.json.gz
+    <version dir>/packs/A1.json.br
+
+``word_packs`` records size and the sha256 of the JSON, which makes pack
+URLs content-addressed: words.views_packs serves them as plain files, with
+no serialization or compression on the app servers.
+"""
+import gzip
+import hashlib
+import json
+import os
+from pathlib import Path
+
+try:
+    import brotli
+except ImportError:  # optional; packs are then offered as gzip only
+    brotli = None
+
+PACK_DIR = 'packs'
+
+# Content codings in order of preference when serving
+ENCODINGS = ['br', 'gzip', 'identity']
+
+PACKS_DDL = """
+CREATE TABLE word_packs (
+    level VARCHAR(2) NOT NULL,
+    encoding VARCHAR(10) NOT NULL,
+    filename TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    words INTEGER NOT NULL,
+    digest TEXT NOT NULL,
+    PRIMARY KEY (level, encoding)
+) WITHOUT ROWID
+"""
+
+GZIP_LEVEL = 9
+# Quality 11 is ~50x slower than 9 for ~25% smaller output; levels with
+# more rows than BROTLI_MAX_ROWS use BROTLI_FAST_QUALITY to bound build time.
+BROTLI_QUALITY = 11
+BROTLI_FAST_QUALITY = 9
+BROTLI_MAX_ROWS = 20000
+CHUNK_ROWS = 1000
+
+
+class _Writers:
+    """Write the same JSON bytes to the plain and compressed pack files."""
+
+    def __init__(self, base, brotli_quality=BROTLI_QUALITY):
+        self.paths = {}
+        self.files = []
+        self.plain = self._open('identity', base.with_suffix('.json'))
+        # mtime=0 keeps builds of the same data byte-identical.
+        self.gzip = gzip.GzipFile(
+            fileobj=self._open('gzip', base.with_suffix('.json.gz')),
+            mode='wb', compresslevel=GZIP_LEVEL, mtime=0,
+        )
+        self.brotli = None
+        if brotli is not None:
+            self.brotli_file = self._open('br', base.with_suffix('.json.br'))
+            self.brotli = brotli.Compressor(mode=brotli.MODE_TEXT, quality=brotli_quality)
+        self.digest = hashlib.sha256()
+
+    def _open(self, encoding, path):
+        fh = open(path, 'wb')
+        self.paths[encoding] = path
+        self.files.append(fh)
+        return fh
+
+    def write(self, data):
+        self.digest.update(data)
+        self.plain.write(data)
+        self.gzip.write(data)
+        if self.brotli is not None:
+            self.brotli_file.write(self.brotli.process(data))
+
+    def close(self):
+        self.gzip.close()
+        if self.brotli is not None:
+            self.brotli_file.write(self.brotli.finish())
+        for fh in self.files:
+            fh.close()
+        for path in self.paths.values():
+            os.chmod(path, 0o644)
+
+
+def build_level_packs(conn, builder):
+    """Write the pack files of every level and record them in ``word_packs``."""
+    conn.execute(PACKS_DDL)
+    if builder.artifacts_dir is None:
+        return
+
+    # The packs must match WordSerializer byte for byte in content; share
+    # its row representation rather than duplicating it.
+    from words.serializers import WORD_COLUMNS, word_row_to_representation
+
+    pack_dir = Path(builder.artifacts_dir) / PACK_DIR
+    pack_dir.mkdir(parents=True, exist_ok=True)
+    levels = conn.execute('SELECT level, COUNT(*) FROM words GROUP BY level ORDER BY level').fetchall()
+    query = f"SELECT {', '.join(WORD_COLUMNS)} FROM words WHERE level = ? ORDER BY id"
+    encoder = json.JSONEncoder(ensure_ascii=False, separators=(',', ':'))
+
+    packs = []
+    for level, rows in levels:
+        writers = _Writers(
+            pack_dir / level,
+            BROTLI_QUALITY if rows <= BROTLI_MAX_ROWS else BROTLI_FAST_QUALITY,
+        )
+        count = 0
+        try:
+            # Encode in chunks; per-row writes would dominate with three outputs.
+            chunk = [b'[']
+            for row in conn.execute(query, [level]):
+                data = word_row_to_representation(dict(zip(WORD_COLUMNS, row)))
+                if count:
+                    chunk.append(b',')
+                chunk.append(encoder.encode(data).encode('utf-8'))
+                count += 1
+                if len(chunk) >= CHUNK_ROWS:
+                    writers.write(b''.join(chunk))
+                    chunk = []
+            chunk.append(b']')
+            writers.write(b''.join(chunk))
+        finally:
+            writers.close()
+
+        digest = writers.digest.hexdigest()
+        for encoding, path in writers.paths.items():
+            packs.append((
+                level, encoding, f'{PACK_DIR}/{path.name}',
+                path.stat().st_size, count, digest,
+            ))
+
+    conn.execute('BEGIN')
+    conn.executemany('INSERT INTO word_packs VALUES (?, ?, ?, ?, ?, ?)', packs)
+    conn.execute('COMMIT')
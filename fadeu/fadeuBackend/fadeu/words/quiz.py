@@ -0,0 +1,170 @@
+"""
+Multiple-choice quiz questions built on the server.
+
+Wrong answers come from distractor pools: per dictionary version, one scan
+of the words table collects up to POOL_SIZE distinct values per
+(field, level, part_of_speech, article), e.g. Persian translations of A1
+verbs, or plurals of B1 "die" nouns. Building a question is then a few
+in-memory picks; only the question words themselves are read per request.
+
+Question types:
+
+``german_persian`` / ``german_english``
+    Translate the German word; distractors from the same level and part of
+    speech (and article, for nouns).
+``article``
+    der, die or das.
+``plural``
+    Plural of a noun; distractors are plausible wrong plurals of the same
+    singular ("Hause", "Hausen") topped up from real plurals of the pool.
+"""
+import random
+import threading
+
+from .dictionary_reader import fetchall, open_version
+
+QUESTION_TYPES = ('german_persian', 'german_english', 'article', 'plural')
+ARTICLES = ('der', 'die', 'das')
+CHOICES = 4
+POOL_SIZE = 200
+
+_ANSWER_FIELDS = {'german_persian': 'persian', 'german_english': 'english', 'plural': 'plural'}
+_PLURAL_ENDINGS = ('e', 'en', 'er', 'n', 's')
+_UMLAUTS = {'a': 'ä', 'o': 'ö', 'u': 'ü', 'A': 'Ä', 'O': 'Ö', 'U': 'Ü'}
+
+_pools = {}
+_pools_version = None
+_lock = threading.Lock()
+
+
+def _build_pools():
+    pools = {}
+    seen = {}
+    rows = fetchall(
+        'SELECT level, part_of_speech, article, english, persian, plural FROM words ORDER BY id'
+    ) or []
+    for level, part_of_speech, article, english, persian, plural in rows:
+        for field, value in (('english', english), ('persian', persian), ('plural', plural)):
+            if not value:
+                continue
+            for key in ((field, level, part_of_speech, article), (field, level, part_of_speech, None),
+                        (field, level, None, None)):
+                values = pools.setdefault(key, [])
+                known = seen.setdefault(key, set())
+                if len(values) < POOL_SIZE and value not in known:
+                    values.append(value)
+                    known.add(value)
+    return pools
+
+
+def pools():
+    """``{(field, level, part_of_speech, article): [values]}`` of the open version."""
+    global _pools, _pools_version
+    version = open_version()
+    if _pools_version != version:
+        with _lock:
+            if _pools_version != version:
+                _pools = _build_pools()
+                _pools_version = version
+    return _pools
+
+
+def clear():
+    global _pools, _pools_version
+    with _lock:
+        _pools = {}
+        _pools_version = None
+
+
+def eligible_types(word):
+    types = ['german_persian', 'german_english']
+    if word.part_of_speech == 'noun' and word.article in ARTICLES:
+        types.append('article')
+        if word.plural:
+            types.append('plural')
+    return types
+
+
+def plural_variants(singular):
+    """Wrong-but-plausible plurals: the usual endings, with and without umlaut."""
+    stems = [singular]
+    # Umlaut the last vowel unless it already is one ("Haus" -> "Häus", "Tür" stays)
+    for index in range(len(singular) - 1, -1, -1):
+        char = singular[index]
+        if char in 'äöüÄÖÜ':
+            break
+        if char in _UMLAUTS:
+            if char in 'uU' and index and singular[index - 1] in 'aA':
+                index -= 1  # "au" -> "äu"
+            stems.append(singular[:index] + _UMLAUTS[singular[index]] + singular[index + 1:])
+            break
+        if char in 'eiEI':
+            break
+    variants = []
+    for stem in stems:
+        for ending in ('',) + _PLURAL_ENDINGS:
+            if ending and stem.endswith(ending[0]):
+                continue  # "Blumeen", "Flusss"
+            if ending == 'n' and not stem.endswith(('e', 'el', 'er')):
+                continue  # "Tischn"
+            variants.append(stem + ending)
+    return variants
+
+
+def _distractors(word, question_type, answer, rng):
+    field = _ANSWER_FIELDS[question_type]
+    candidates = plural_variants(word.german) if question_type == 'plural' else []
+    rng.shuffle(candidates)
+    available = pools()
+    for key in ((field, word.level, word.part_of_speech, word.article),
+                (field, word.level, word.part_of_speech, None),
+                (field, word.level, None, None)):
+        pool = available.get(key, ())
+        candidates.extend(rng.sample(pool, min(len(pool), CHOICES * 2)))
+
+    distractors = []
+    for candidate in candidates:
+        if candidate != answer and candidate not in distractors:
+            distractors.append(candidate)
+            if len(distractors) == CHOICES - 1:
+                break
+    return distractors
+
+
+def question(word, question_type, rng=random):
+    """One question dict for ``word``, or None if it has too few distractors."""
+    if question_type == 'article':
+        return {
+            'word_id': word.id, 'type': question_type, 'prompt': word.german,
+            'choices': list(ARTICLES), 'answer': ARTICLES.index(word.article),
+        }
+
+    answer = getattr(word, _ANSWER_FIELDS[question_type])
+    distractors = _distractors(word, question_type, answer, rng)
+    if len(distractors) < CHOICES - 1:
+        return None
+    choices = distractors + [answer]
+    rng.shuffle(choices)
+    prompt = f'{word.article} {word.german}' if question_type == 'plural' else word.german
+    return {
+        'word_id': word.id, 'type': question_type, 'prompt': prompt,
+        'choices': choices, 'answer': choices.index(answer),
+    }
+
+
+def generate(words, types=QUESTION_TYPES, seed=None):
+    """
+    One question per word, cycling through ``types`` and skipping types a
+    word does not support (an adjective gets no article question).
+    """
+    rng = random.Random(seed)
+    questions = []
+    for position, word in enumerate(words):
+        supported = [t for t in types if t in eligible_types(word)]
+        if not supported:
+            continue
+        preferred = types[position % len(types)]
+        built = question(word, preferred if preferred in supported else rng.choice(supported), rng)
+        if built is not None:
+            questions.append(built)
+    return questions
@@ -0,0 +1,233 @@
+"""
+Precomputed "related words" per headword.
+
+At build time every word gets up to NEIGHBOURS related words, stored in
+``word_related`` and read back with one primary-key range scan::
+
+    word_id | rank | related_id | relation    | score
+    --------+------+------------+-------------+------
+    12      | 0    | 40         | compound    | 1.0
+    12      | 1    | 51         | stem        | 0.9
+
+Candidates come from four signals, each looked up through an inverted index
+rather than by comparing all pairs:
+
+``compound``
+    The word is a part of the other ("Schiff" / "Dampfschiff"), or both
+    share a compound part (see words.substring_index).
+``stem``
+    Same stem once common derivational and inflectional endings are removed
+    ("arbeiten" / "Arbeiter").
+``translation``
+    Overlapping content words in the English translation.
+``spelling``
+    Cosine similarity of padded character trigram vectors above
+    SPELLING_THRESHOLD ("Bäcker" / "Bäckerei").
+
+Trigrams and translation words that occur in more than MAX_POSTINGS words
+carry almost no signal and are skipped, which bounds the work per word.
+Scoring is spread over a process pool, one chunk of words per task.
+"""
+import math
+import os
+import re
+from collections import Counter, defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from heapq import nlargest
+
+from .form_index import form_key
+
+NEIGHBOURS = 12
+MAX_POSTINGS = 500
+SPELLING_THRESHOLD = 0.5
+CHUNK_WORDS = 2000
+
+# Score contributed by each signal; the strongest one names the relation.
+WEIGHTS = {
+    'compound': 1.0,
+    'compound_sibling': 0.6,
+    'stem': 0.9,
+    'translation': 0.8,
+    'spelling': 0.7,
+}
+
+# Longest first, so "-ungen" is removed before "-en"
+STEM_ENDINGS = sorted([
+    'ungen', 'ung', 'heiten', 'heit', 'keiten', 'keit', 'schaft', 'lich',
+    'isch', 'ig', 'erin', 'innen', 'in', 'er', 'ern', 'en', 'es', 'e', 'n', 's',
+], key=len, reverse=True)
+MIN_STEM_LENGTH = 4
+
+ENGLISH_STOPWORDS = {
+    'the', 'and', 'for', 'with', 'from', 'into', 'something', 'someone',
+    'one', 'sth', 'sb', 'etc', 'also', 'not', 'out', 'off', 'about',
+}
+TOKEN_RE = re.compile(r'[^\W\d_]+')
+
+RELATED_DDL = """
+CREATE TABLE word_related (
+    word_id INTEGER NOT NULL,
+    rank INTEGER NOT NULL,
+    related_id INTEGER NOT NULL,
+    relation VARCHAR(11) NOT NULL,
+    score REAL NOT NULL,
+    PRIMARY KEY (word_id, rank)
+) WITHOUT ROWID
+"""
+
+
+def stem(key):
+    for ending in STEM_ENDINGS:
+        if key.endswith(ending) and len(key) - len(ending) >= MIN_STEM_LENGTH:
+            return key[:-len(ending)]
+    return key
+
+
+def spelling_grams(key):
+    padded = f' {key} '
+    return Counter(padded[i:i + 3] for i in range(len(padded) - 2))
+
+
+def translation_tokens(english):
+    return {
+        token for token in TOKEN_RE.findall((english or '').casefold())
+        if len(token) > 2 and token not in ENGLISH_STOPWORDS
+    }
+
+
+def _postings(features):
+    """Inverted index ``{feature: [word index]}`` without overly common features."""
+    postings = defaultdict(list)
+    for index, word_features in enumerate(features):
+        for feature in word_features:
+            postings[feature].append(index)
+    return {feature: ids for feature, ids in postings.items() if len(ids) <= MAX_POSTINGS}
+
+
+class _Index:
+    """Everything scoring needs, shipped once to each worker process."""
+
+    def __init__(self, ids, keys, english, compound_parts):
+        self.ids = ids
+        self.grams = [spelling_grams(key) for key in keys]
+        self.norms = [math.sqrt(sum(c * c for c in grams.values())) for grams in self.grams]
+        self.gram_postings = _postings(self.grams)
+        self.tokens = [translation_tokens(text) for text in english]
+        self.token_postings = _postings(self.tokens)
+        stems = [stem(key) for key in keys]
+        self.stems = stems
+        self.stem_postings = _postings([[s] if ' ' not in s else [] for s in stems])
+        # compound_parts: {word index: [part word index]}
+        self.parts = compound_parts
+        wholes = defaultdict(list)
+        for index, parts in compound_parts.items():
+            for part in parts:
+                wholes[part].append(index)
+        self.wholes = {part: ids for part, ids in wholes.items() if len(ids) <= MAX_POSTINGS}
+
+    def neighbours(self, index):
+        scores = defaultdict(dict)
+
+        def add(other, relation, score):
+            if other != index:
+                scores[other][relation] = max(score, scores[other].get(relation, 0))
+
+        for part in self.parts.get(index, ()):
+            add(part, 'compound', WEIGHTS['compound'])
+            for sibling in self.wholes.get(part, ()):
+                add(sibling, 'compound_sibling', WEIGHTS['compound_sibling'])
+        for whole in self.wholes.get(index, ()):
+            add(whole, 'compound', WEIGHTS['compound'])
+
+        for other in self.stem_postings.get(self.stems[index], ()):
+            add(other, 'stem', WEIGHTS['stem'])
+
+        tokens = self.tokens[index]
+        if tokens:
+            shared = Counter()
+            for token in tokens:
+                shared.update(self.token_postings.get(token, ()))
+            for other, count in shared.items():
+                overlap = count / len(tokens | self.tokens[other])
+                add(other, 'translation', WEIGHTS['translation'] * overlap)
+
+        grams = self.grams[index]
+        dot = Counter()
+        for gram, count in grams.items():
+            for other in self.gram_postings.get(gram, ()):
+                dot[other] += count * self.grams[other][gram]
+        for other, product in dot.items():
+            similarity = product / (self.norms[index] * self.norms[other])
+            if similarity >= SPELLING_THRESHOLD:
+                add(other, 'spelling', WEIGHTS['spelling'] * similarity)
+
+        ranked = nlargest(
+            NEIGHBOURS, scores.items(),
+            key=lambda item: (sum(item[1].values()), -self.ids[item[0]]),
+        )
+        word_id = self.ids[index]
+        for rank, (other, relations) in enumerate(ranked):
+            relation = max(relations, key=relations.get)
+            yield (
+                word_id, rank, self.ids[other],
+                'compound' if relation == 'compound_sibling' else relation,
+                round(sum(relations.values()), 4),
+            )
+
+
+_index = None
+
+
+def _init_worker(index):
+    global _index
+    _index = index
+
+
+def _score_chunk(indices):
+    return [row for index in indices for row in _index.neighbours(index)]
+
+
+def build_related_words(conn, builder):
+    """Fill ``word_related`` (run after build_substring_index)."""
+    conn.execute(RELATED_DDL)
+
+    ids, keys, english = [], [], []
+    for word_id, german, translation in conn.execute(
+        'SELECT id, german, english FROM words ORDER BY id'
+    ):
+        ids.append(word_id)
+        keys.append(form_key(german))
+        english.append(translation)
+    position = {word_id: index for index, word_id in enumerate(ids)}
+    compound_parts = defaultdict(list)
+    for word_id, part_word_id in conn.execute(
+        'SELECT word_id, part_word_id FROM word_compound_parts'
+    ):
+        if word_id in position and part_word_id in position:
+            compound_parts[position[word_id]].append(position[part_word_id])
+    index = _Index(ids, keys, english, dict(compound_parts))
+
+    chunks = [range(start, min(start + CHUNK_WORDS, len(ids)))
+              for start in range(0, len(ids), CHUNK_WORDS)]
+    workers = min(os.cpu_count() or 1, len(chunks))
+    conn.execute('BEGIN')
+    if workers > 1:
+        with ProcessPoolExecutor(workers, initializer=_init_worker, initargs=(index,)) as pool:
+            for rows in pool.map(_score_chunk, chunks):
+                conn.executemany('INSERT INTO word_related VALUES (?, ?, ?, ?, ?)', rows)
+    else:
+        _init_worker(index)
+        for chunk in chunks:
+            conn.executemany('INSERT INTO word_related VALUES (?, ?, ?, ?, ?)', _score_chunk(chunk))
+        _init_worker(None)
+    conn.execute('COMMIT')
+
+
+def neighbours(word_id):
+    """``[(related_id, relation, score)]`` of a word, best first."""
+    from .dictionary_reader import fetchall
+
+    return fetchall(
+        'SELECT related_id, relation, score FROM word_related WHERE word_id = %s ORDER BY rank',
+        [word_id],
+    ) or []
@@ -0,0 +1,101 @@
+"""
+Compact renderers for bulk word responses, picked by content negotiation
+(Accept header or ``?format=``):
+
+``columnar`` (application/vnd.fadeu.columnar+json)
+    A list of objects becomes one field-name table plus one array per row::
+
+        {"schema": 2, "fields": ["id", "german", ...], "rows": [[1, "Haus", ...], ...]}
+
+``ndjson`` (application/x-ndjson)
+    One object per line.
+
+``msgpack`` (application/msgpack)
+    MessagePack, if the ``msgpack`` package is installed.
+
+They all use the compact schema (version 2): the ``word``/``translation``
+copies of ``german``/``english`` kept for old JSON clients are dropped.
+Plain JSON responses are unchanged (schema 1).
+"""
+from rest_framework.renderers import BaseRenderer, JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+try:
+    import msgpack
+except ImportError:  # optional; the msgpack format is then not offered
+    msgpack = None
+
+COMPACT_SCHEMA = 2
+# Fields WordSerializer duplicates for backward compatibility
+DUPLICATE_FIELDS = ('word', 'translation')
+
+_encoder = JSONEncoder(ensure_ascii=False, separators=(',', ':'))
+
+
+def compact(item):
+    if isinstance(item, dict) and all(name in item for name in DUPLICATE_FIELDS):
+        return {name: value for name, value in item.items() if name not in DUPLICATE_FIELDS}
+    return item
+
+
+def _is_table(data):
+    return isinstance(data, list) and all(isinstance(item, dict) for item in data)
+
+
+def _error_response(renderer_context):
+    response = (renderer_context or {}).get('response')
+    return response is not None and response.status_code >= 400
+
+
+class ColumnarJSONRenderer(JSONRenderer):
+    media_type = 'application/vnd.fadeu.columnar+json'
+    format = 'columnar'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if _error_response(renderer_context):
+            return super().render(data, accepted_media_type, renderer_context)
+        if not _is_table(data):
+            return super().render(compact(data), accepted_media_type, renderer_context)
+        rows = [compact(item) for item in data]
+        fields = list(rows[0]) if rows else []
+        table = {
+            'schema': COMPACT_SCHEMA,
+            'fields': fields,
+            # Rows with other keys (never the case for one serializer) fall
+            # back to None for missing fields.
+            'rows': [[row.get(name) for name in fields] for row in rows],
+        }
+        return _encoder.encode(table).encode('utf-8')
+
+
+class NDJSONRenderer(BaseRenderer):
+    media_type = 'application/x-ndjson'
+    format = 'ndjson'
+    charset = 'utf-8'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        items = data if isinstance(data, list) else [data]
+        return ''.join(_encoder.encode(compact(item)) + '\n' for item in items).encode('utf-8')
+
+
+class MessagePackRenderer(BaseRenderer):
+    media_type = 'application/msgpack'
+    format = 'msgpack'
+    charset = None
+    render_style = 'binary'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        if isinstance(data, list):
+            data = [compact(item) for item in data]
+        else:
+            data = compact(data)
+        return msgpack.packb(data, use_bin_type=True, default=str)
+
+
+COMPACT_RENDERERS = [ColumnarJSONRenderer, NDJSONRenderer]
+if msgpack is not None:
+    COMPACT_RENDERERS.append(MessagePackRenderer)
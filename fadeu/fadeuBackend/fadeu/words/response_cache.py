@@ -0,0 +1,105 @@
+"""
+Server-side cache of rendered responses for anonymous dictionary reads.
+
+Anonymous word list/detail responses depend only on the URL and the
+dictionary contents, so views using :class:`AnonymousResponseCacheMixin`
+store the rendered JSON bytes in the RESPONSE_CACHE_ALIAS cache under::
+
+    (view, path, sorted query parameters, format, dictionary version)
+
+and serve repeats from there, with the headers the first response had
+(e.g. ``Vary: Accept``, as the format is part of the key), without touching
+the database or the serializer. A new dictionary version changes every key; stale entries age
+out through the cache's own eviction (MAX_ENTRIES / TIMEOUT). Responses get
+an ``X-Cache: HIT|MISS`` header, and :func:`stats` returns hit/miss/skip
+counts of this process.
+"""
+import hashlib
+import threading
+from collections import Counter
+from urllib.parse import urlencode
+
+from django.conf import settings
+from django.core.cache import caches
+from django.http import HttpResponse
+
+from fadeu import metrics
+
+from .dictionary_reader import open_version
+
+# Set per response (by middleware or below), not part of the cached entry
+UNCACHED_HEADERS = {'content-length', 'set-cookie', 'x-cache'}
+
+_stats = Counter()
+_stats_lock = threading.Lock()
+
+
+def _count(view_name, outcome):
+    with _stats_lock:
+        _stats[view_name, outcome] += 1
+    metrics.inc('fadeu_response_cache_requests_total', (('view', view_name), ('outcome', outcome)))
+
+
+def stats():
+    """``{(view name, 'hit'|'miss'|'skip'): count}`` since process start."""
+    with _stats_lock:
+        return dict(_stats)
+
+
+def get_cache():
+    return caches[settings.RESPONSE_CACHE_ALIAS]
+
+
+def cache_key(view_name, request):
+    params = urlencode(sorted(
+        (name, value) for name, values in request.query_params.lists() for value in values if value != ''
+    ))
+    raw = f'{view_name}\n{request.path}\n{params}\n{request.accepted_renderer.format}\n{open_version()}'
+    return f'response:v2:{hashlib.sha256(raw.encode()).hexdigest()}'
+
+
+class AnonymousResponseCacheMixin:
+    """
+    Serve GET requests of anonymous users from the response cache. Query
+    parameters in ``response_cache_bypass`` (with a value other than
+    "false") disable caching, e.g. ``shuffle``.
+    """
+    response_cache_bypass = ()
+
+    def _cacheable(self, request):
+        # The browsable API embeds per-request forms and tokens.
+        if request.user.is_authenticated or request.accepted_renderer.format == 'api':
+            return False
+        return not any(
+            request.query_params.get(name, 'false').lower() != 'false'
+            for name in self.response_cache_bypass
+        )
+
+    def get(self, request, *args, **kwargs):
+        view_name = type(self).__name__
+        if not self._cacheable(request):
+            _count(view_name, 'skip')
+            return super().get(request, *args, **kwargs)
+
+        cache = get_cache()
+        key = cache_key(view_name, request)
+        cached = cache.get(key)
+        if cached is not None:
+            _count(view_name, 'hit')
+            headers, content = cached
+            response = HttpResponse(content, headers=headers)
+            response['X-Cache'] = 'HIT'
+            return response
+
+        _count(view_name, 'miss')
+        response = super().get(request, *args, **kwargs)
+        if response.status_code == 200:
+            response = self.finalize_response(request, response, *args, **kwargs)
+            response.render()
+            if len(response.content) <= settings.RESPONSE_CACHE_MAX_BYTES:
+                headers = {
+                    name: value for name, value in response.items() if name.lower() not in UNCACHED_HEADERS
+                }
+                cache.set(key, (headers, response.content))
+        response['X-Cache'] = 'MISS'
+        return response
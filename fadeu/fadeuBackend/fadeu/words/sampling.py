@@ -0,0 +1,68 @@
+"""
+Random words without ORDER BY RANDOM() or shuffling the whole id list.
+
+The ids matching each (level, part_of_speech) filter are loaded once per
+dictionary version into a compact ``array`` and kept in memory; a sample of
+``n`` words then costs O(n) index picks plus reading those rows from the
+dictionary image (words.image), or one ``in_bulk`` query without one. Pools of
+the previous version are dropped when a new one is published (see
+words.signals).
+
+With a ``seed`` the sample is deterministic for a given dictionary version,
+which is what the word of the day uses.
+"""
+import random
+import threading
+from array import array
+
+from . import image
+from .dictionary_reader import fetchall, open_version
+
+_pools = {}
+_lock = threading.Lock()
+
+
+def _load(level, part_of_speech):
+    dictionary_image = image.current()
+    if dictionary_image is not None:
+        filters = {'level': level, 'part_of_speech': part_of_speech}
+        return array('q', dictionary_image.ids_where(
+            **{column: value for column, value in filters.items() if value}
+        ))
+
+    conditions, params = [], []
+    if level:
+        conditions.append('level = %s')
+        params.append(level)
+    if part_of_speech:
+        conditions.append('part_of_speech = %s')
+        params.append(part_of_speech)
+    where = f" WHERE {' AND '.join(conditions)}" if conditions else ''
+    return array('q', (row[0] for row in fetchall(f'SELECT id FROM words{where} ORDER BY id', params) or []))
+
+
+def pool(level=None, part_of_speech=None):
+    """Ids of the words matching the filter, in id order."""
+    key = (open_version(), level, part_of_speech)
+    ids = _pools.get(key)
+    if ids is None:
+        with _lock:
+            ids = _pools.get(key)
+            if ids is None:
+                ids = _load(level, part_of_speech)
+                # Filters matching nothing are not kept, so arbitrary
+                # query strings cannot grow the cache.
+                if ids:
+                    _pools[key] = ids
+    return ids
+
+
+def sample(n, level=None, part_of_speech=None, seed=None):
+    """Up to ``n`` distinct random word ids matching the filter."""
+    ids = pool(level, part_of_speech)
+    rng = random.Random(seed) if seed is not None else random
+    return [ids[i] for i in rng.sample(range(len(ids)), min(n, len(ids)))]
+
+
+def clear():
+    _pools.clear()
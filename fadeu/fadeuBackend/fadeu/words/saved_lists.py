@@ -0,0 +1,54 @@
+"""
+Cached saved-words lists with a per-user version counter.
+
+Every change to a user's saved words bumps the user's SavedListVersion row
+(:func:`bump`, in the transaction of the change), so every worker process
+sees the new version. The rendered list is cached under (user, version,
+dictionary version), and the same values form its ETag, so a poll with a
+matching If-None-Match is answered with 304 after one primary-key lookup,
+without loading or rendering the list or touching the dictionary database.
+"""
+from django.core.cache import cache
+from django.db.models import F
+from django.utils.http import quote_etag
+
+from fadeu import metrics
+
+from .dictionary_reader import open_version
+from .models import SavedListVersion
+
+LIST_TIMEOUT = 24 * 60 * 60
+
+
+def list_version(user_id):
+    """Current version of the user's saved list (0 before its first change)."""
+    return SavedListVersion.objects.filter(user_id=user_id).values_list('version', flat=True).first() or 0
+
+
+def bump(user_id):
+    """Move the user's list to a new version; call in the transaction that changes it."""
+    SavedListVersion.objects.get_or_create(user_id=user_id)
+    SavedListVersion.objects.filter(user_id=user_id).update(version=F('version') + 1)
+
+
+def etag(user_id):
+    return quote_etag(f'saved-{user_id}-{list_version(user_id)}-{open_version()}')
+
+
+def _list_key(user_id, etag_value):
+    return f'saved-list:{user_id}:{etag_value}'
+
+
+def get_list(user_id, etag_value):
+    """``(content_type, content)`` of the cached rendered list, or None."""
+    cached = cache.get(_list_key(user_id, etag_value))
+    metrics.inc('fadeu_saved_list_cache_requests_total', (('outcome', 'miss' if cached is None else 'hit'),))
+    return cached
+
+
+def set_list(user_id, etag_value, content_type, content):
+    cache.set(_list_key(user_id, etag_value), (content_type, content), LIST_TIMEOUT)
+
+
+def count_not_modified():
+    metrics.inc('fadeu_saved_list_cache_requests_total', (('outcome', 'not_modified'),))
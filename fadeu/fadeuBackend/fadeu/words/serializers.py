@@ -1,6 +1,6 @@
 from rest_framework import serializers
 from .models import Word, UserWordProgress, SavedWord
-import json
+from . import inflections
 
 class WordSerializer(serializers.ModelSerializer):
     # Add computed properties for backward compatibility
@@ -15,6 +15,13 @@ class WordSerializer(serializers.ModelSerializer):
             'article', 'plural', 'cases', 'tenses', 'audio_filename',
             'word', 'translation'  # Include computed properties
         ]
+
+    def __init__(self, *args, fields=None, **kwargs):
+        # fields: names to keep (sparse fieldsets, see words.fieldsets)
+        super().__init__(*args, **kwargs)
+        if fields is not None:
+            for name in set(self.fields) - set(fields):
+                self.fields.pop(name)
     
     def to_representation(self, instance):
         # Convert string fields to JSON objects if they contain JSON
@@ -40,18 +47,38 @@ class WordSerializer(serializers.ModelSerializer):
                     # If there's an encoding error, replace with a placeholder
                     ret[field] = f"[Encoding Error: {str(e)}]"
         
-        # Parse JSON strings to objects for the frontend
+        # Parse JSON strings to objects for the frontend (decoded once per word)
         for field in ['cases', 'tenses']:
             if field in ret and ret[field] is not None:
-                try:
-                    if isinstance(ret[field], str):
-                        ret[field] = json.loads(ret[field])
-                except (json.JSONDecodeError, TypeError):
-                    ret[field] = None
+                ret[field] = inflections.load(instance.pk, field, ret[field])
         
         return ret
 
 
+# Columns of the ``words`` table, in the order WordSerializer emits them.
+WORD_COLUMNS = [
+    'id', 'german', 'english', 'persian', 'level', 'example',
+    'example_english', 'example_persian', 'part_of_speech',
+    'article', 'plural', 'cases', 'tenses', 'audio_filename',
+]
+
+
+def word_row_to_representation(row):
+    """
+    Build the dict WordSerializer would produce from a raw ``words`` row
+    (any mapping keyed by WORD_COLUMNS), without a model instance.
+    """
+    ret = {column: row[column] for column in WORD_COLUMNS}
+
+    for field in ['cases', 'tenses']:
+        if ret[field] is not None:
+            ret[field] = inflections.load(ret['id'], field, ret[field])
+
+    ret['word'] = ret['german']
+    ret['translation'] = ret['english']
+    return ret
+
+
 class SavedWordSerializer(serializers.ModelSerializer):
     word = WordSerializer(read_only=True)
     
@@ -82,23 +109,81 @@ class UserWordProgressSerializer(serializers.ModelSerializer):
         fields = ['id', 'word', 'is_known', 'last_reviewed', 'review_count']
         read_only_fields = ['user']
 
+
+def progress_data(progress):
+    """The ``progress`` object of word responses for a UserWordProgress row."""
+    return {
+        'is_known': progress.is_known,
+        'last_reviewed': progress.last_reviewed,
+        'review_count': progress.review_count
+    }
+
+
+def saved_word_ids(user, word_ids=None):
+    """Ids of the words ``user`` saved (only among ``word_ids`` if given), in one query."""
+    saved = SavedWord.objects.filter(user=user)
+    if word_ids is not None:
+        saved = saved.filter(word_id__in=word_ids)
+    return set(saved.values_list('word_id', flat=True))
+
+
+def progress_by_word(user, word_ids=None):
+    """``{word_id: UserWordProgress}`` of ``user`` (only among ``word_ids`` if given), in one query."""
+    progress = UserWordProgress.objects.filter(user=user)
+    if word_ids is not None:
+        progress = progress.filter(word_id__in=word_ids)
+    return {row.word_id: row for row in progress}
+
+
 class WordWithProgressSerializer(WordSerializer):
     progress = serializers.SerializerMethodField()
+    is_saved = serializers.SerializerMethodField()
     
     class Meta(WordSerializer.Meta):
-        fields = WordSerializer.Meta.fields + ['progress']
+        fields = WordSerializer.Meta.fields + ['progress', 'is_saved']
     
     def get_progress(self, obj):
         request = self.context.get('request')
         if not request or not request.user.is_authenticated:
             return None
             
-        try:
-            progress = UserWordProgress.objects.get(user=request.user, word=obj)
-            return {
-                'is_known': progress.is_known,
-                'last_reviewed': progress.last_reviewed,
-                'review_count': progress.review_count
-            }
-        except UserWordProgress.DoesNotExist:
-            return None
+        # Loaded once per response, like saved_word_ids below.
+        progress = self.context.get('progress_by_word')
+        if progress is None:
+            progress = progress_by_word(request.user, [obj.id] if self.parent is None else None)
+            self.context['progress_by_word'] = progress
+        row = progress.get(obj.id)
+        return progress_data(row) if row is not None else None
+
+    def get_is_saved(self, obj):
+        request = self.context.get('request')
+        if not request or not request.user.is_authenticated:
+            return False
+
+        # Loaded once per response: all of the user's saved ids for a list
+        # (the context is shared by every item), just this word otherwise.
+        saved = self.context.get('saved_word_ids')
+        if saved is None:
+            saved = saved_word_ids(request.user, [obj.id] if self.parent is None else None)
+            self.context['saved_word_ids'] = saved
+        return obj.id in saved
+
+
+class FlashcardSerializer(WordSerializer):
+    """
+    A word with the user's progress and saved flag, read from maps the view
+    loads for the whole deck at once: ``progress_by_word`` ({word_id:
+    UserWordProgress}) and ``saved_word_ids`` (a set) in the context.
+    """
+    progress = serializers.SerializerMethodField()
+    is_saved = serializers.SerializerMethodField()
+
+    class Meta(WordSerializer.Meta):
+        fields = WordSerializer.Meta.fields + ['progress', 'is_saved']
+
+    def get_progress(self, obj):
+        progress = self.context['progress_by_word'].get(obj.id)
+        return progress_data(progress) if progress is not None else None
+
+    def get_is_saved(self, obj):
+        return obj.id in self.context['saved_word_ids']
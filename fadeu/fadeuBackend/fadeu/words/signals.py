@@ -0,0 +1,25 @@
+from django.core.signals import request_started
+from django.dispatch import receiver
+
+from fadeu.dictionary_backend import versions
+
+from . import inflections, quiz, sampling
+
+
+@receiver(request_started)
+def reopen_dictionary_on_new_version(sender, **kwargs):
+    # Connections are persistent (CONN_MAX_AGE = None); move this thread to
+    # the newly published dictionary between requests, never mid-request.
+    versions.close_stale_connection()
+
+
+@receiver(versions.dictionary_changed)
+def clear_decoded_inflections(sender, **kwargs):
+    # Decoded values of the previous version are unlikely to be needed again.
+    inflections.clear_cache()
+
+
+@receiver(versions.dictionary_changed)
+def drop_sampling_pools(sender, **kwargs):
+    sampling.clear()
+    quiz.clear()
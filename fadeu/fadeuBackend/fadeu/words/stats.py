@@ -0,0 +1,129 @@
+"""
+Learning statistics per user and level (words.models.UserLevelStats).
+
+``word_id`` in progress and saved rows points into the dictionary database,
+so per-level counts can't be aggregated with a join. Instead the views that
+change progress or saved words apply the change to the user's summary row
+right away (:func:`record_progress`, :func:`record_saved`), and
+:func:`rebuild` recomputes the rows in bulk after imports or dictionary
+changes that move words between levels.
+"""
+from collections import Counter, defaultdict
+
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models import F
+
+from .models import SavedWord, UserLevelStats, UserWordProgress, Word
+
+LEVEL_BATCH = 5000  # word ids per dictionary query in rebuild()
+USER_BATCH = 500  # users recomputed per transaction in rebuild()
+STAT_FIELDS = ['seen', 'known', 'saved']
+
+
+def _apply(user, level, **deltas):
+    deltas = {field: delta for field, delta in deltas.items() if delta}
+    if not deltas or not level:
+        return
+    stats, _ = UserLevelStats.objects.get_or_create(user=user, level=level)
+    UserLevelStats.objects.filter(pk=stats.pk).update(
+        **{field: F(field) + delta for field, delta in deltas.items()}
+    )
+
+
+def record_progress(user, word, created, was_known, is_known):
+    """Count a progress change of ``word`` (a Word) for ``user``."""
+    _apply(user, word.level, seen=int(created), known=int(bool(is_known)) - int(bool(was_known)))
+
+
+def record_saved(user, word, saved):
+    """Count ``word`` (a Word) as saved (``saved=True``) or unsaved."""
+    _apply(user, word.level, saved=1 if saved else -1)
+
+
+def _levels(word_ids):
+    levels = {}
+    word_ids = sorted(word_ids)
+    for start in range(0, len(word_ids), LEVEL_BATCH):
+        levels.update(
+            Word.objects.filter(id__in=word_ids[start:start + LEVEL_BATCH]).values_list('id', 'level')
+        )
+    return levels
+
+
+def _user_batches(user_ids):
+    if user_ids is None:
+        user_ids = (
+            get_user_model().objects.order_by('pk').values_list('pk', flat=True)
+            .iterator(chunk_size=USER_BATCH)
+        )
+    else:
+        user_ids = sorted(set(user_ids))
+    batch = []
+    for user_id in user_ids:
+        batch.append(user_id)
+        if len(batch) >= USER_BATCH:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def _rebuild_batch(user_ids):
+    with transaction.atomic():
+        # Lock the rows first: a concurrent _apply then waits and adds its
+        # change to the recomputed counts instead of it being lost. Rows are
+        # updated in place (not replaced) so its UPDATE by pk still matches.
+        existing = {
+            (row.user_id, row.level): row
+            for row in UserLevelStats.objects.select_for_update().filter(user_id__in=user_ids)
+        }
+        progress = list(
+            UserWordProgress.objects.filter(user_id__in=user_ids, word_id__isnull=False)
+            .values_list('user_id', 'word_id', 'is_known')
+        )
+        saved = list(
+            SavedWord.objects.filter(user_id__in=user_ids, word_id__isnull=False)
+            .values_list('user_id', 'word_id')
+        )
+        levels = _levels({row[1] for row in progress} | {row[1] for row in saved})
+
+        counts = defaultdict(Counter)
+        for user_id, word_id, is_known in progress:
+            level = levels.get(word_id)
+            if level:
+                counts[user_id, level]['seen'] += 1
+                counts[user_id, level]['known'] += int(is_known)
+        for user_id, word_id in saved:
+            level = levels.get(word_id)
+            if level:
+                counts[user_id, level]['saved'] += 1
+
+        created = []
+        for (user_id, level), counter in counts.items():
+            if (user_id, level) not in existing:
+                created.append(UserLevelStats(user_id=user_id, level=level, **counter))
+        for key, row in existing.items():
+            # Levels without words any more are zeroed, as _apply leaves them.
+            counter = counts.get(key, Counter())
+            row.seen, row.known, row.saved = counter['seen'], counter['known'], counter['saved']
+        UserLevelStats.objects.bulk_update(existing.values(), STAT_FIELDS, batch_size=1000)
+        UserLevelStats.objects.bulk_create(created, batch_size=1000)
+    return len(counts)
+
+
+def rebuild(user_ids=None):
+    """
+    Recompute the stats rows of ``user_ids`` (all users if None), USER_BATCH
+    users per transaction. Returns the number of non-empty rows.
+    """
+    return sum(_rebuild_batch(batch) for batch in _user_batches(user_ids))
+
+
+def summary(user):
+    """``{level: {'seen', 'known', 'saved'}}`` for ``user``, from the summary rows."""
+    return {
+        level: {'seen': seen, 'known': known, 'saved': saved}
+        for level, seen, known, saved in UserLevelStats.objects.filter(user=user)
+        .order_by('level').values_list('level', 'seen', 'known', 'saved')
+    }
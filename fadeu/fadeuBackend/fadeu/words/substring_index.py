@@ -0,0 +1,191 @@
+"""
+Substring and compound-part search over Word.german.
+
+Two tables are built with the dictionary:
+
+``word_trigrams``
+    (trigram, word_id) for every trigram of every headword key, plus
+    ``trigram_stats`` with the number of words per trigram. An infix query
+    intersects the posting lists of its rarest trigrams, so the work done is
+    proportional to the candidates of the rarest trigram, roughly the number
+    of matches, not to the dictionary size.
+
+``word_compound_parts``
+    For compounds like "Dampfschiff" the headwords they are made of, found by
+    splitting the word into a known head and a known modifier (allowing the
+    usual linking elements, "Arbeit-s-zimmer"). "schiff" then finds
+    "Dampfschiff" as a compound head, ranked above plain infix matches.
+
+Keys are normalized like word_form_index keys (see form_index.form_key).
+"""
+from .form_index import form_key
+
+NGRAM = 3
+MIN_PART_LENGTH = 3
+CANDIDATE_TRIGRAMS = 3  # rarest trigrams intersected per query
+
+# Linking elements between compound parts ("Fugenelemente"), longest first
+LINKING_ELEMENTS = ('ens', 'es', 'en', 'er', 's', 'n', 'e', '')
+# Verb stems used as modifiers drop the infinitive ending ("Schreib-tisch").
+STEM_ENDINGS = ('en', 'n')
+
+SUBSTRING_DDL = [
+    """
+    CREATE TABLE word_trigrams (
+        trigram TEXT NOT NULL,
+        word_id INTEGER NOT NULL,
+        PRIMARY KEY (trigram, word_id)
+    ) WITHOUT ROWID
+    """,
+    """
+    CREATE TABLE trigram_stats (
+        trigram TEXT PRIMARY KEY,
+        words INTEGER NOT NULL
+    ) WITHOUT ROWID
+    """,
+    """
+    CREATE TABLE word_compound_parts (
+        part_key TEXT NOT NULL,
+        word_id INTEGER NOT NULL,
+        part_word_id INTEGER NOT NULL,
+        role VARCHAR(8) NOT NULL,
+        PRIMARY KEY (part_key, word_id)
+    ) WITHOUT ROWID
+    """,
+]
+
+# Match kinds in ranking order
+RANKS = {'exact': 0, 'head': 1, 'modifier': 2, 'prefix': 3, 'infix': 4}
+
+
+def trigrams(key):
+    return {key[i:i + NGRAM] for i in range(len(key) - NGRAM + 1)}
+
+
+def _resolve_modifier(modifier, headwords):
+    for element in LINKING_ELEMENTS:
+        if element and not modifier.endswith(element):
+            continue
+        stem = modifier[:len(modifier) - len(element)]
+        if len(stem) < MIN_PART_LENGTH:
+            continue
+        if stem in headwords:
+            return stem
+        for ending in STEM_ENDINGS:
+            if stem + ending in headwords:
+                return stem + ending
+    return None
+
+
+def split_compound(key, headwords):
+    """
+    Return ``[(part_key, role)]`` for the best split of ``key`` into a known
+    modifier and a known head (longest head first), or just the head if no
+    modifier resolves. Empty if ``key`` is not a compound of known words.
+    """
+    head_only = None
+    for i in range(MIN_PART_LENGTH, len(key) - MIN_PART_LENGTH + 1):
+        head = key[i:]
+        if head not in headwords:
+            continue
+        modifier = _resolve_modifier(key[:i], headwords)
+        if modifier is not None:
+            return [(modifier, 'modifier'), (head, 'head')]
+        if head_only is None:
+            head_only = [(head, 'head')]
+    return head_only or []
+
+
+def build_substring_index(conn, builder):
+    """Fill word_trigrams, trigram_stats and word_compound_parts."""
+    for statement in SUBSTRING_DDL:
+        conn.execute(statement)
+
+    words = [(word_id, form_key(german)) for word_id, german in conn.execute(
+        'SELECT id, german FROM words ORDER BY id'
+    )]
+    headwords = {}
+    for word_id, key in words:
+        if ' ' not in key:
+            headwords.setdefault(key, word_id)
+
+    def trigram_rows():
+        for word_id, key in words:
+            for gram in trigrams(key):
+                yield gram, word_id
+
+    def compound_rows():
+        for word_id, key in words:
+            if ' ' in key:
+                continue
+            for part, role in split_compound(key, headwords):
+                yield part, word_id, headwords[part], role
+
+    conn.execute('BEGIN')
+    conn.executemany('INSERT INTO word_trigrams VALUES (?, ?)', trigram_rows())
+    conn.execute(
+        'INSERT INTO trigram_stats '
+        'SELECT trigram, COUNT(*) FROM word_trigrams GROUP BY trigram'
+    )
+    conn.executemany('INSERT OR IGNORE INTO word_compound_parts VALUES (?, ?, ?, ?)', compound_rows())
+    conn.execute('COMMIT')
+
+
+def _infix_candidates(key):
+    from .dictionary_reader import fetchall
+
+    grams = sorted(trigrams(key))
+    placeholders = ', '.join(['%s'] * len(grams))
+    stats = fetchall(
+        f'SELECT trigram, words FROM trigram_stats WHERE trigram IN ({placeholders})', grams
+    )
+    if stats is None or len(stats) < len(grams):
+        return []  # no index, or a trigram no word contains
+    rarest = [gram for gram, _ in sorted(stats, key=lambda row: row[1])[:CANDIDATE_TRIGRAMS]]
+    subquery = ' INTERSECT '.join(
+        ['SELECT word_id FROM word_trigrams WHERE trigram = %s'] * len(rarest)
+    )
+    return fetchall(f'SELECT id, german FROM words WHERE id IN ({subquery})', rarest) or []
+
+
+def search(query, limit=50, compounds_only=False):
+    """
+    ``[(word_id, kind)]`` for headwords containing ``query``, best first:
+    exact match, compound head, compound modifier, prefix, other infix;
+    shorter words first within a kind. Queries shorter than a trigram only
+    match exact headwords and compound parts.
+    """
+    from .dictionary_reader import fetchall
+
+    key = form_key(query)
+    if not key:
+        return []
+
+    matches = {}
+    for word_id, role, german in fetchall(
+        'SELECT c.word_id, c.role, w.german FROM word_compound_parts c '
+        'JOIN words w ON w.id = c.word_id WHERE c.part_key = %s',
+        [key],
+    ) or []:
+        matches[word_id] = (role, german)
+
+    if not compounds_only:
+        candidates = _infix_candidates(key) if len(key) >= NGRAM else fetchall(
+            'SELECT id, german FROM words WHERE id IN '
+            '(SELECT word_id FROM word_form_index WHERE form_key = %s AND rank = 0)',
+            [key],
+        ) or []
+        for word_id, german in candidates:
+            candidate = form_key(german)
+            if key not in candidate:
+                continue  # trigrams match, but not contiguously
+            if candidate == key:
+                matches[word_id] = ('exact', german)
+            elif word_id not in matches:
+                matches[word_id] = ('prefix' if candidate.startswith(key) else 'infix', german)
+
+    ranked = sorted(
+        matches.items(),
+        key=lambda item: (RANKS[item[1][0]], len(item[1][1]), item[0]),
+    )
+    return [(word_id, kind) for word_id, (kind, _) in ranked[:limit]]
@@ -1,3 +1,446 @@
-from django.test import TestCase
+import itertools
+import json
+import shutil
+import sqlite3
+import tempfile
+import time
+from pathlib import Path
+from unittest import mock
 
-# Create your tests here.
+from asgiref.sync import async_to_sync
+from django.core.cache import caches
+from django.db import connections
+from django.test import SimpleTestCase, override_settings
+from rest_framework.settings import api_settings
+from rest_framework.throttling import AnonRateThrottle
+
+from fadeu.dictionary_backend import versions
+
+from . import image, inflections, stats
+from .dictionary_build import DictionaryBuilder, iter_source
+from .models import SavedListVersion, UserLevelStats, UserWordProgress
+from .views_export import WordExportView
+
+_builds = itertools.count()
+
+
+def publish_dictionary(rows):
+    """Build ``rows`` into a new version under DICTIONARY_DIR and make it current."""
+    build_dir = Path(tempfile.mkdtemp(prefix='.build-', dir=versions.dictionary_dir()))
+    with DictionaryBuilder(build_dir / versions.DATABASE_FILENAME, artifacts_dir=build_dir) as builder:
+        builder.load(rows)
+    version = versions.publish(build_dir, f'v{next(_builds):04d}', keep=0).name
+    versions.current_version(force=True)
+    return version
+
+
+def word(german, **fields):
+    return {
+        'id': 1, 'german': german, 'english': 'house', 'persian': 'خانه',
+        'level': 'A1', 'part_of_speech': 'noun', 'article': 'das', **fields,
+    }
+
+
+class DictionaryVersionTestCase(SimpleTestCase):
+    """
+    Runs against versions published into a temporary DICTIONARY_DIR instead
+    of the in-memory test database.
+    """
+    databases = {'default', 'dictionary'}
+
+    def setUp(self):
+        self.dictionary_dir = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, self.dictionary_dir, ignore_errors=True)
+        settings_override = override_settings(
+            DICTIONARY_DIR=self.dictionary_dir, DICTIONARY_VERSION_CHECK_INTERVAL=0,
+        )
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+        # The backend only opens published versions for on-disk databases.
+        connection = connections['dictionary']
+        connection.close()
+        test_name = connection.settings_dict['NAME']
+        connection.settings_dict['NAME'] = str(self.dictionary_dir / 'unused.db')
+        self.addCleanup(connection.settings_dict.__setitem__, 'NAME', test_name)
+        self.addCleanup(connection.close)
+
+        caches['responses'].clear()
+
+
+class ResponseCacheVersionTests(DictionaryVersionTestCase):
+
+    def test_new_version_misses_cache(self):
+        publish_dictionary([word('Haus')])
+        url = '/api/words/words/1/'
+        self.assertEqual(self.client.get(url)['X-Cache'], 'MISS')
+        self.assertEqual(self.client.get(url)['X-Cache'], 'HIT')
+
+        publish_dictionary([word('Gebäude')])
+        response = self.client.get(url)
+        self.assertEqual(response['X-Cache'], 'MISS')
+        self.assertEqual(response.json()['german'], 'Gebäude')
+
+    def test_hit_keeps_headers(self):
+        publish_dictionary([word('Haus')])
+        cache = caches['responses']
+        with mock.patch.object(cache, 'set', wraps=cache.set) as cache_set:
+            miss = self.client.get('/api/words/words/1/', HTTP_ACCEPT='application/x-ndjson')
+        headers, _ = cache_set.call_args.args[1]
+        hit = self.client.get('/api/words/words/1/', HTTP_ACCEPT='application/x-ndjson')
+        self.assertEqual(hit['X-Cache'], 'HIT')
+        self.assertIn('Accept', headers['Vary'])
+        for name in ('Content-Type', 'Vary', 'Allow'):
+            self.assertEqual(hit[name], miss[name])
+
+
+class SavedListVersionTests(DictionaryVersionTestCase):
+
+    def test_new_version_changes_etag(self):
+        from django.contrib.auth import get_user_model
+        from rest_framework_simplejwt.tokens import AccessToken
+
+        from .models import SavedWord
+
+        user = get_user_model().objects.create_user(email='etag@example.com', password='x')
+        self.addCleanup(user.delete)
+        # A saved word makes the list read (and keep open) the dictionary.
+        SavedWord.objects.create(user=user, word_id=1)
+        auth = {'HTTP_AUTHORIZATION': f'Bearer {AccessToken.for_user(user)}'}
+        url = '/api/words/saved-words/'
+
+        publish_dictionary([word('Haus')])
+        etag = self.client.get(url, **auth)['ETag']
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag, **auth).status_code, 304)
+
+        publish_dictionary([word('Gebäude')])
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag, **auth)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+
+    def test_inactive_user_rejected(self):
+        from django.contrib.auth import get_user_model
+        from rest_framework_simplejwt.tokens import AccessToken
+
+        user = get_user_model().objects.create_user(email='gone@example.com', password='x')
+        self.addCleanup(user.delete)
+        auth = {'HTTP_AUTHORIZATION': f'Bearer {AccessToken.for_user(user)}'}
+        publish_dictionary([word('Haus')])
+        self.assertEqual(self.client.get('/api/words/saved-words/', **auth).status_code, 200)
+
+        user.is_active = False
+        user.save()
+        self.assertEqual(self.client.get('/api/words/saved-words/', **auth).status_code, 401)
+
+    def test_change_is_seen_by_every_worker(self):
+        from django.contrib.auth import get_user_model
+        from rest_framework_simplejwt.tokens import AccessToken
+
+        user = get_user_model().objects.create_user(email='bump@example.com', password='x')
+        self.addCleanup(user.delete)
+        auth = {'HTTP_AUTHORIZATION': f'Bearer {AccessToken.for_user(user)}'}
+        url = '/api/words/saved-words/'
+        publish_dictionary([word('Haus')])
+        etag = self.client.get(url, **auth)['ETag']
+
+        self.client.post('/api/words/words/1/toggle-save/', **auth)
+        # The version is in the database, not in this process's cache.
+        self.assertEqual(SavedListVersion.objects.get(user=user).version, 1)
+        caches['default'].clear()
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag, **auth)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()[0]['word']['german'], 'Haus')
+
+
+class MetricsAccessTests(SimpleTestCase):
+
+    def test_allowed_ip(self):
+        response = self.client.get('/metrics', REMOTE_ADDR='127.0.0.1')
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('# TYPE fadeu_http_requests_total counter', response.content.decode())
+
+    def test_other_ip_forbidden(self):
+        self.assertEqual(self.client.get('/metrics', REMOTE_ADDR='203.0.113.7').status_code, 403)
+
+    @override_settings(METRICS_TOKEN='secret')
+    def test_token(self):
+        response = self.client.get('/metrics', REMOTE_ADDR='203.0.113.7', HTTP_AUTHORIZATION='Bearer secret')
+        self.assertEqual(response.status_code, 200)
+        response = self.client.get('/metrics', REMOTE_ADDR='203.0.113.7', HTTP_AUTHORIZATION='Bearer wrong')
+        self.assertEqual(response.status_code, 403)
+
+
+class ImageVersionTests(DictionaryVersionTestCase):
+
+    def test_follows_current_version(self):
+        self.addCleanup(image._images.clear)
+        # Before any dictionary query opens the connection
+        publish_dictionary([word('Haus')])
+        self.assertEqual(image.current().get(1)['german'], 'Haus')
+
+        publish_dictionary([word('Gebäude')])
+        self.assertEqual(image.current().get(1)['german'], 'Gebäude')
+
+
+class MetricsShardTests(SimpleTestCase):
+
+    def test_exited_threads_are_folded(self):
+        import threading
+
+        from fadeu import metrics
+
+        labels = (('test', 'shards'),)
+        before = metrics.collect().get(('fadeu_test_total', labels), 0)
+        for _ in range(20):
+            thread = threading.Thread(target=metrics.inc, args=('fadeu_test_total', labels))
+            thread.start()
+            thread.join()
+        self.assertLess(len(metrics._shards), 10)
+        self.assertEqual(metrics.collect()[('fadeu_test_total', labels)], before + 20)
+
+
+class ExportTests(DictionaryVersionTestCase):
+
+    def setUp(self):
+        super().setUp()
+        publish_dictionary([word('Haus'), word('Baum', id=2, english='tree', article='der')])
+
+    def test_asgi_streams_async(self):
+        async def export():
+            response = await self.async_client.get('/api/words/export/?format=ndjson')
+            return response, b''.join([chunk async for chunk in response.streaming_content])
+
+        response, body = async_to_sync(export)()
+        self.assertTrue(response.is_async)
+        self.assertEqual([row['german'] for row in map(json.loads, body.splitlines())], ['Haus', 'Baum'])
+
+    def test_throttled(self):
+        # settings_benchmark turns DEFAULT_THROTTLE_CLASSES off
+        with mock.patch.object(WordExportView, 'throttle_classes', [AnonRateThrottle]), \
+                mock.patch.object(AnonRateThrottle, 'allow_request', return_value=False), \
+                mock.patch.object(AnonRateThrottle, 'wait', return_value=60):
+            response = self.client.get('/api/words/export/?format=ndjson')
+        self.assertEqual(response.status_code, 429)
+        self.assertEqual(response['Content-Type'], 'application/json')
+
+
+class AsyncViewThrottleTests(SimpleTestCase):
+
+    def test_throttled(self):
+        with mock.patch.object(api_settings, 'DEFAULT_THROTTLE_CLASSES', [AnonRateThrottle]), \
+                mock.patch.object(AnonRateThrottle, 'allow_request', return_value=False), \
+                mock.patch.object(AnonRateThrottle, 'wait', return_value=60):
+            response = self.client.get('/api/words/async/words/1/')
+        self.assertEqual(response.status_code, 429)
+        self.assertEqual(response['Retry-After'], '60')
+
+
+class InflectionLoadTests(SimpleTestCase):
+
+    def test_decoded_once_and_copied(self):
+        self.addCleanup(inflections.clear_cache)
+        raw = '{"infinitiv": "gehen", "präsens": {"ich": "gehe"}}'
+        first = inflections.load(7, 'tenses', raw)
+        with mock.patch.object(inflections.json, 'loads') as loads:
+            second = inflections.load(7, 'tenses', raw)
+        loads.assert_not_called()
+        self.assertEqual(second, {'infinitiv': 'gehen', 'präsens': {'ich': 'gehe'}})
+        second['präsens']['du'] = 'gehst'
+        self.assertEqual(first, inflections.load(7, 'tenses', raw))
+        self.assertNotIn('du', inflections.load(7, 'tenses', raw)['präsens'])
+
+    def test_changed_value_is_decoded_again(self):
+        self.addCleanup(inflections.clear_cache)
+        inflections.load(7, 'tenses', '{"infinitiv": "gehen"}')
+        self.assertEqual(inflections.load(7, 'tenses', '{"infinitiv": "laufen"}'), {'infinitiv': 'laufen'})
+
+
+class UserTestCase(DictionaryVersionTestCase):
+    """A user and their ``Authorization`` header in ``self.auth``."""
+
+    def setUp(self):
+        super().setUp()
+        from django.contrib.auth import get_user_model
+        from rest_framework_simplejwt.tokens import AccessToken
+
+        self.user = get_user_model().objects.create_user(email='progress@example.com', password='x')
+        self.addCleanup(self.user.delete)
+        self.auth = {'HTTP_AUTHORIZATION': f'Bearer {AccessToken.for_user(self.user)}'}
+
+
+class ProgressTests(UserTestCase):
+
+    def setUp(self):
+        super().setUp()
+        publish_dictionary([word('Haus')])
+
+    def test_form_string_false_is_not_known(self):
+        url = '/api/words/words/1/progress/'
+        self.assertEqual(self.client.post(url, {'is_known': 'false'}, **self.auth).status_code, 201)
+        self.assertEqual(stats.summary(self.user), {'A1': {'seen': 1, 'known': 0, 'saved': 0}})
+        self.client.post(url, {'is_known': 'true'}, **self.auth)
+        self.client.post(url, {'is_known': '0'}, **self.auth)
+        self.assertFalse(UserWordProgress.objects.get(user=self.user).is_known)
+        self.assertEqual(stats.summary(self.user), {'A1': {'seen': 1, 'known': 0, 'saved': 0}})
+
+    def test_invalid_is_known(self):
+        response = self.client.post('/api/words/words/1/progress/', {'is_known': 'maybe'}, **self.auth)
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(UserWordProgress.objects.filter(user=self.user).exists())
+
+
+class WordListProgressTests(UserTestCase):
+
+    def setUp(self):
+        super().setUp()
+        publish_dictionary([word('Haus'), word('Baum', id=2), word('Tisch', id=3)])
+        for word_id in (1, 2):
+            UserWordProgress.objects.create(user=self.user, word_id=word_id, is_known=word_id == 1)
+
+    def test_progress_loaded_once(self):
+        from django.test.utils import CaptureQueriesContext
+
+        with CaptureQueriesContext(connections['default']) as queries:
+            data = self.client.get('/api/words/words/', **self.auth).json()
+        self.assertEqual([item['progress'] and item['progress']['is_known'] for item in data], [True, False, None])
+        self.assertEqual(sum('user_word_progress' in query['sql'] for query in queries), 1)
+
+
+class DictionaryBuildTests(SimpleTestCase):
+
+    def setUp(self):
+        self.tmp = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, self.tmp, ignore_errors=True)
+
+    def write_jsonl(self, name, rows):
+        path = self.tmp / name
+        path.write_text(''.join(
+            (row if isinstance(row, str) else json.dumps(row, ensure_ascii=False)) + '\n' for row in rows
+        ), encoding='utf-8')
+        return path
+
+    def words_in(self, path):
+        conn = sqlite3.connect(path)
+        try:
+            return conn.execute('SELECT id, german FROM words ORDER BY id').fetchall()
+        finally:
+            conn.close()
+
+    def test_invalid_rows_rejected(self):
+        source = self.write_jsonl('words.jsonl', [
+            word('Haus', tenses={'präsens': {'ich': 'wohne'}}, audio_filename='a1/haus.mp3'),
+            word('Baum', id=2, level='D1'),
+            word('gehen', id=3, tenses={'präsens': ['gehe']}),
+            word('Tür', id=4, audio_filename='../../etc/passwd'),
+            word('Tisch', id=5, audio_filename='/etc/passwd'),
+            '{"id": 6,',
+        ])
+        target = self.tmp / 'dictionary.db'
+        with DictionaryBuilder(target, batch_size=2) as builder:
+            builder.load(iter_source(source))
+
+        self.assertEqual(self.words_in(target), [(1, 'Haus')])
+        self.assertEqual(builder.rejected, 5)
+        messages = dict(builder.errors)
+        self.assertIn('level', messages[2])
+        self.assertIn('tenses', messages[3])
+        self.assertIn('audio_filename', messages[4])
+        self.assertIn('audio_filename', messages[5])
+        self.assertIn('invalid JSON', messages[6])
+
+    def test_csv_source(self):
+        source = self.tmp / 'words.csv'
+        source.write_text(
+            'id,german,english,persian,level,article,tenses\n'
+            '1,Haus,house,خانه,a1,DAS,\n'
+            '2,gehen,to go,رفتن,A1,,"{""präsens"": {""ich"": ""gehe""}}"\n'
+            '3,Baum,tree,درخت,Z9,der,\n',
+            encoding='utf-8',
+        )
+        target = self.tmp / 'dictionary.db'
+        with DictionaryBuilder(target) as builder:
+            builder.load(iter_source(source))
+        self.assertEqual(self.words_in(target), [(1, 'Haus'), (2, 'gehen')])
+        self.assertEqual([row_number for row_number, _ in builder.errors], [3])
+
+    def test_failed_build_keeps_target(self):
+        target = self.tmp / 'dictionary.db'
+        with DictionaryBuilder(target) as builder:
+            builder.load([word('Haus')])
+
+        def rows():
+            yield word('Gebäude')
+            raise RuntimeError('source failed')
+
+        with self.assertRaises(RuntimeError):
+            with DictionaryBuilder(target, batch_size=1) as builder:
+                builder.load(rows())
+        self.assertEqual(self.words_in(target), [(1, 'Haus')])
+        self.assertEqual([path.name for path in self.tmp.iterdir()], ['dictionary.db'])
+
+    def test_command_publishes_versions(self):
+        from io import StringIO
+
+        from django.core.management import call_command
+
+        with override_settings(DICTIONARY_DIR=self.tmp / 'dictionaries', DICTIONARY_VERSION_CHECK_INTERVAL=0):
+            def build(german):
+                source = self.write_jsonl(f'{german}.jsonl', [word(german)])
+                call_command('build_dictionary', str(source), keep=1, stdout=StringIO(), stderr=StringIO())
+                return versions.current_version(force=True)
+
+            first = build('Haus')
+            self.assertEqual(self.words_in(versions.current_path(first)), [(1, 'Haus')])
+            time.sleep(1)  # version names start with the time in seconds
+            second = build('Gebäude')
+            self.assertNotEqual(second, first)
+            self.assertEqual(self.words_in(versions.current_path()), [(1, 'Gebäude')])
+            # keep=1: the previous version is removed, no build directory is left
+            self.assertEqual(sorted(path.name for path in versions.dictionary_dir().iterdir()),
+                             sorted([second, versions.POINTER_NAME]))
+
+
+class StatsRebuildTests(UserTestCase):
+
+    def test_rebuild_matches_incremental_counts(self):
+        from django.contrib.auth import get_user_model
+        from rest_framework_simplejwt.tokens import AccessToken
+
+        publish_dictionary([
+            word('Haus'), word('Baum', id=2, level='A2'), word('gehen', id=3, level='B1'),
+            word('Tisch', id=4, level='A2'),
+        ])
+        other = get_user_model().objects.create_user(email='other@example.com', password='x')
+        self.addCleanup(other.delete)
+        other_auth = {'HTTP_AUTHORIZATION': f'Bearer {AccessToken.for_user(other)}'}
+
+        for auth, actions in ((self.auth, [
+            ('words/1/progress/', {'is_known': True}),
+            ('words/2/progress/', {'is_known': False}),
+            ('words/2/progress/', {'is_known': True}),
+            ('words/4/progress/', {'is_known': True}),
+            ('words/4/progress/', {'is_known': False}),
+            ('words/2/toggle-save/', None),
+            ('words/3/toggle-save/', None),
+            ('words/3/toggle-save/', None),
+            ('saved-words/', {'word_id': 4}),
+        ]), (other_auth, [
+            ('words/3/progress/', {'is_known': True}),
+            ('words/1/toggle-save/', None),
+        ])):
+            for path, data in actions:
+                response = self.client.post(f'/api/words/{path}', data, content_type='application/json', **auth)
+                self.assertLess(response.status_code, 300, path)
+
+        incremental = {user.pk: stats.summary(user) for user in (self.user, other)}
+        self.assertEqual(incremental[self.user.pk], {
+            'A1': {'seen': 1, 'known': 1, 'saved': 0},
+            'A2': {'seen': 2, 'known': 1, 'saved': 2},
+            'B1': {'seen': 0, 'known': 0, 'saved': 0},
+        })
+
+        UserLevelStats.objects.filter(user__in=[self.user, other]).update(seen=99, known=99)
+        with mock.patch.object(stats, 'USER_BATCH', 1):
+            stats.rebuild([self.user.pk, other.pk])
+        # rebuild leaves zeroed rows like the incremental updates do
+        self.assertEqual({user.pk: stats.summary(user) for user in (self.user, other)}, incremental)
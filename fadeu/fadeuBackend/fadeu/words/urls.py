@@ -1,3 +1,4 @@
+from django.conf import settings
 from django.urls import path
 from .views import (
     WordListView,
@@ -6,22 +7,31 @@ from .views import (
     UserWordProgressView,
     SavedWordListView,
     SavedWordDetailView,
-    ToggleSaveWordView
+    ToggleSaveWordView,
+    WordInflectionsView,
+    FlashcardSessionView,
+    QuizView,
+    UserStatsView,
+    WordLookupView,
+    WordOfTheDayView,
+    WordRandomSampleView,
+    WordRelatedView,
+    WordSubstringSearchView,
 )
-from .views_test import test_db_connection
-from .views_debug import debug_settings
-from .test_connection import test_connection
-from .test_encoding import TestEncodingView
-from .db_test import DatabaseTestView
+from . import views_async, views_audio, views_export, views_packs
 
 urlpatterns = [
-    path('debug-settings/', debug_settings, name='debug-settings'),
-    path('test-db/', test_db_connection, name='test-db'),
-    path('test-connection/', test_connection, name='test-connection'),
-    path('test-encoding/', TestEncodingView.as_view(), name='test-encoding'),
-    path('test-db-encoding/', DatabaseTestView.as_view(), name='test-db-encoding'),
     path('words/', WordListView.as_view(), name='word-list'),
     path('words/<int:pk>/', WordDetailView.as_view(), name='word-detail'),
+    path('words/<int:pk>/related/', WordRelatedView.as_view(), name='word-related'),
+    path('flashcards/session/', FlashcardSessionView.as_view(), name='flashcard-session'),
+    path('stats/', UserStatsView.as_view(), name='user-stats'),
+    path('quiz/', QuizView.as_view(), name='quiz'),
+    path('words/random/', WordRandomSampleView.as_view(), name='word-random'),
+    path('words/word-of-the-day/', WordOfTheDayView.as_view(), name='word-of-the-day'),
+    path('words/substring/', WordSubstringSearchView.as_view(), name='word-substring-search'),
+    path('words/lookup/', WordLookupView.as_view(), name='word-lookup'),
+    path('words/inflections/', WordInflectionsView.as_view(), name='word-inflections'),
     path('words/<int:word_id>/progress/', UpdateWordProgressView.as_view(), name='update-word-progress'),
     path('user/words/progress/', UserWordProgressView.as_view(), name='user-word-progress'),
     
@@ -31,4 +41,40 @@ urlpatterns = [
     
     # Toggle save status
     path('words/<int:word_id>/toggle-save/', ToggleSaveWordView.as_view(), name='toggle-save-word'),
+
+    # Async dictionary reads (for ASGI deployments)
+    path('async/words/', views_async.word_list, name='async-word-list'),
+    path('async/words/search/', views_async.word_search, name='async-word-search'),
+    path('async/words/<int:pk>/', views_async.word_detail, name='async-word-detail'),
+
+    # Pronunciation audio
+    path('words/<int:pk>/audio/', views_audio.word_audio, name='word-audio'),
+    path('audio/manifest/', views_audio.audio_manifest, name='audio-manifest'),
+    path('audio/bundles/<str:level>.zip', views_audio.audio_bundle, name='audio-bundle'),
+    path('audio/<path:filename>', views_audio.audio_file, name='audio-file'),
+
+    # Streaming export of the whole dictionary
+    path('export/', views_export.export_words, name='word-export'),
+
+    # Prebuilt per-level word packs
+    path('packs/', views_packs.pack_index, name='word-pack-index'),
+    path('packs/<str:level>.<str:digest>.json', views_packs.level_pack_digest, name='word-pack-digest'),
+    path('packs/<str:level>.json', views_packs.level_pack, name='word-pack'),
 ]
+
+# Debug/test endpoints, only imported when diagnostics are enabled (see
+# DIAGNOSTICS in fadeu.settings).
+if settings.DIAGNOSTICS:
+    from .views_test import test_db_connection
+    from .views_debug import debug_settings
+    from .test_connection import test_connection
+    from .test_encoding import TestEncodingView
+    from .db_test import DatabaseTestView
+
+    urlpatterns = [
+        path('debug-settings/', debug_settings, name='debug-settings'),
+        path('test-db/', test_db_connection, name='test-db'),
+        path('test-connection/', test_connection, name='test-connection'),
+        path('test-encoding/', TestEncodingView.as_view(), name='test-encoding'),
+        path('test-db-encoding/', DatabaseTestView.as_view(), name='test-db-encoding'),
+    ] + urlpatterns
@@ -1,28 +1,42 @@
-from rest_framework import status, generics, filters
+from rest_framework import status, generics, serializers
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
+from rest_framework.settings import api_settings
 from rest_framework.views import APIView
 from django_filters.rest_framework import DjangoFilterBackend
 from django.shortcuts import get_object_or_404
+from django.http import HttpResponse
+from django.utils import timezone
+from django.utils.cache import get_conditional_response, patch_cache_control
 
 from .models import Word, UserWordProgress, SavedWord
+from . import form_index, image, inflections, quiz, related, sampling, saved_lists, stats, substring_index
+from .fieldsets import SparseFieldsMixin
+from .filters import InflectedFormSearchFilter
+from .renderers import COMPACT_RENDERERS
+from .response_cache import AnonymousResponseCacheMixin
 from .serializers import (
     WordSerializer, 
     UserWordProgressSerializer, 
     WordWithProgressSerializer,
-    SavedWordSerializer
+    SavedWordSerializer,
+    FlashcardSerializer,
+    saved_word_ids,
+    word_row_to_representation,
 )
 from django.db.models import Q
-from django.db import IntegrityError
+from django.db import IntegrityError, transaction
 import random
 
-class WordListView(generics.ListAPIView):
+class WordListView(AnonymousResponseCacheMixin, SparseFieldsMixin, generics.ListAPIView):
     serializer_class = WordSerializer  # Use the simpler serializer without progress for unauthenticated users
-    filter_backends = [DjangoFilterBackend, filters.SearchFilter]
+    filter_backends = [DjangoFilterBackend, InflectedFormSearchFilter]
     filterset_fields = ['level']
     search_fields = ['german', 'english', 'persian']
     permission_classes = []  # Remove authentication requirement
     pagination_class = None  # Disable pagination to return all results
+    renderer_classes = api_settings.DEFAULT_RENDERER_CLASSES + COMPACT_RENDERERS
+    response_cache_bypass = ('shuffle',)  # shuffled lists must not repeat
     
     def get_serializer_context(self):
         context = super().get_serializer_context()
@@ -86,12 +100,18 @@ class ToggleSaveWordView(APIView):
         
         if saved_word:
             # Word is saved, so unsave it
-            saved_word.delete()
+            with transaction.atomic():
+                saved_word.delete()
+                stats.record_saved(request.user, word, saved=False)
+                saved_lists.bump(request.user.id)
             return Response({'status': 'unsaved'}, status=status.HTTP_200_OK)
         else:
             # Word is not saved, so save it
             try:
-                SavedWord.objects.create(user=request.user, word_id=word_id)  # Use word_id instead of word
+                with transaction.atomic():
+                    SavedWord.objects.create(user=request.user, word_id=word_id)  # Use word_id instead of word
+                    stats.record_saved(request.user, word, saved=True)
+                    saved_lists.bump(request.user.id)
                 return Response({'status': 'saved'}, status=status.HTTP_201_CREATED)
             except IntegrityError as e:
                 # In case of race condition or other integrity error
@@ -101,10 +121,11 @@ class ToggleSaveWordView(APIView):
                 )
 
 
-class WordDetailView(generics.RetrieveAPIView):
+class WordDetailView(AnonymousResponseCacheMixin, SparseFieldsMixin, generics.RetrieveAPIView):
     queryset = Word.objects.all()
     serializer_class = WordSerializer  # Default to simple serializer
     permission_classes = []  # Remove authentication requirement
+    renderer_classes = api_settings.DEFAULT_RENDERER_CLASSES + COMPACT_RENDERERS
     
     def get_serializer_context(self):
         context = super().get_serializer_context()
@@ -132,24 +153,36 @@ class UpdateWordProgressView(APIView):
                     {'error': 'is_known field is required'},
                     status=status.HTTP_400_BAD_REQUEST
                 )
+            # Form data sends strings: "false" must not count as known.
+            try:
+                is_known = serializers.BooleanField().to_internal_value(is_known)
+            except serializers.ValidationError:
+                return Response(
+                    {'error': 'is_known must be a boolean'},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
                 
-            progress, created = UserWordProgress.objects.get_or_create(
-                user=request.user,
-                word=word,
-                defaults={
-                    'is_known': is_known,
-                    'review_count': 1,
-                    'last_reviewed': timezone.now()
-                }
-            )
-            
-            if not created:
-                # Only update if the status has changed
-                if progress.is_known != is_known:
-                    progress.is_known = is_known
-                    progress.review_count += 1
-                    progress.last_reviewed = timezone.now()
-                    progress.save()
+            with transaction.atomic():
+                progress, created = UserWordProgress.objects.get_or_create(
+                    user=request.user,
+                    word_id=word.id,
+                    defaults={
+                        'is_known': is_known,
+                        'review_count': 1,
+                        'last_reviewed': timezone.now()
+                    }
+                )
+                was_known = False if created else progress.is_known
+
+                if not created:
+                    # Only update if the status has changed
+                    if progress.is_known != is_known:
+                        progress.is_known = is_known
+                        progress.review_count += 1
+                        progress.last_reviewed = timezone.now()
+                        progress.save()
+
+                stats.record_progress(request.user, word, created, was_known, is_known)
                 
             serializer = UserWordProgressSerializer(progress)
             return Response(
@@ -180,8 +213,36 @@ class SavedWordListView(generics.ListCreateAPIView):
     
     def get_queryset(self):
         # Get saved words with word data from dictionary database
-        saved_words = SavedWord.objects.filter(user=self.request.user)
+        saved_words = SavedWord.objects.filter(user_id=self.request.user.id)
         return saved_words
+
+    def list(self, request, *args, **kwargs):
+        # Rendered lists are cached per saved-list version (words.saved_lists);
+        # If-None-Match with the current ETag gets a 304.
+        user_id = request.user.id
+        etag = saved_lists.etag(user_id)
+        response = get_conditional_response(request, etag=etag)
+        if response is not None:
+            saved_lists.count_not_modified()
+        else:
+            cached = saved_lists.get_list(user_id, etag)
+            if cached is not None:
+                content_type, content = cached
+                response = HttpResponse(content, content_type=content_type)
+            else:
+                saved_words = list(self.get_queryset())
+                words = Word.objects.in_bulk([saved.word_id for saved in saved_words if saved.word_id])
+                for saved in saved_words:
+                    saved._prefetched_word = words.get(saved.word_id)
+                response = self.finalize_response(
+                    request, Response(self.get_serializer(saved_words, many=True).data), *args, **kwargs
+                )
+                response.render()
+                if request.accepted_renderer.format == 'json':
+                    saved_lists.set_list(user_id, etag, response['Content-Type'], response.content)
+        response['ETag'] = etag
+        patch_cache_control(response, private=True, no_cache=True)
+        return response
     
     def get_serializer_context(self):
         context = super().get_serializer_context()
@@ -213,7 +274,10 @@ class SavedWordListView(generics.ListCreateAPIView):
             )
             
         try:
-            saved_word = SavedWord.objects.create(user=request.user, word_id=word_id)
+            with transaction.atomic():
+                saved_word = SavedWord.objects.create(user=request.user, word_id=word_id)
+                stats.record_saved(request.user, word, saved=True)
+                saved_lists.bump(request.user.id)
             serializer = self.get_serializer(saved_word)
             headers = self.get_success_headers(serializer.data)
             return Response(
@@ -243,10 +307,331 @@ class SavedWordDetailView(generics.DestroyAPIView):
     def destroy(self, request, *args, **kwargs):
         try:
             instance = self.get_object()
-            self.perform_destroy(instance)
+            word = Word.objects.filter(pk=instance.word_id).first()
+            with transaction.atomic():
+                self.perform_destroy(instance)
+                if word is not None:
+                    stats.record_saved(request.user, word, saved=False)
+                saved_lists.bump(request.user.id)
             return Response(status=status.HTTP_204_NO_CONTENT)
         except SavedWord.DoesNotExist:
             return Response(
                 {'error': 'Saved word not found'}, 
                 status=status.HTTP_404_NOT_FOUND
             )
+
+
+class WordInflectionsView(APIView):
+    """
+    Inflections only, for a batch of words: ?ids=1,2,3[&kind=cases|tenses].
+    Returns {"<id>": {"cases": {...}, "tenses": {...}}}, one query for the batch.
+    """
+    permission_classes = []
+    MAX_IDS = 500
+
+    def get(self, request):
+        try:
+            ids = [int(value) for value in request.query_params.get('ids', '').split(',') if value]
+        except ValueError:
+            return Response(
+                {'error': 'ids must be a comma-separated list of integers'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        if not ids or len(ids) > self.MAX_IDS:
+            return Response(
+                {'error': f'Between 1 and {self.MAX_IDS} ids are required'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        kind = request.query_params.get('kind')
+        if kind and kind not in inflections.KINDS:
+            return Response(
+                {'error': f"kind must be one of {', '.join(inflections.KINDS)}"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        forms = inflections.forms_for_ids(ids, kinds=(kind,) if kind else inflections.KINDS)
+        return Response({str(word_id): value for word_id, value in forms.items()})
+
+
+class WordLookupView(APIView):
+    """
+    Resolve a form as read in a text to its headword(s): ?q=ging -> gehen,
+    ?q=Häuser / ?q=des Hauses -> Haus. Each result is the word plus the
+    form that matched and where it comes from (e.g. "präteritum ich").
+    """
+    permission_classes = []
+
+    def get(self, request):
+        query = request.query_params.get('q', '').strip()
+        if not query:
+            return Response(
+                {'error': 'q parameter is required'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        matches = form_index.lookup(query)
+        words = Word.objects.in_bulk([word_id for word_id, _, _ in matches])
+        results = []
+        for word_id, form, source in matches:
+            if word_id in words:
+                data = WordSerializer(words[word_id]).data
+                data['match'] = {'form': form, 'source': source}
+                results.append(data)
+        return Response(results)
+
+
+class WordSubstringSearchView(APIView):
+    """
+    Substring search over German headwords: ?q=schiff finds "Schiff",
+    "Dampfschiff" (compound head), "Schifffahrt" (compound modifier) and
+    other infix matches, ranked in that order. ?mode=compound returns only
+    compound-part matches; ?limit= caps the results (default 50, max 200).
+    Each result carries "match": exact, head, modifier, prefix or infix.
+    """
+    permission_classes = []
+    DEFAULT_LIMIT = 50
+    MAX_LIMIT = 200
+
+    def get(self, request):
+        query = request.query_params.get('q', '').strip()
+        if not query:
+            return Response(
+                {'error': 'q parameter is required'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        try:
+            limit = min(int(request.query_params.get('limit', self.DEFAULT_LIMIT)), self.MAX_LIMIT)
+        except ValueError:
+            return Response(
+                {'error': 'limit must be an integer'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        matches = substring_index.search(
+            query, limit=limit,
+            compounds_only=request.query_params.get('mode') == 'compound',
+        )
+        words = Word.objects.in_bulk([word_id for word_id, _ in matches])
+        results = []
+        for word_id, kind in matches:
+            if word_id in words:
+                data = WordSerializer(words[word_id]).data
+                data['match'] = kind
+                results.append(data)
+        return Response(results)
+
+
+class WordRelatedView(APIView):
+    """
+    Words related to a word: compounds and compound parts, same stem,
+    overlapping translation or near-identical spelling, best first. Read
+    from the neighbour lists precomputed with the dictionary (words.related).
+    Each result carries "relation" and a "score" (higher is closer).
+    """
+    permission_classes = []
+
+    def get(self, request, pk):
+        neighbours = related.neighbours(pk)
+        words = Word.objects.in_bulk([pk] + [related_id for related_id, _, _ in neighbours])
+        if pk not in words:
+            return Response(
+                {'error': 'Word not found'},
+                status=status.HTTP_404_NOT_FOUND
+            )
+        results = []
+        for related_id, relation, score in neighbours:
+            if related_id in words:
+                data = WordSerializer(words[related_id]).data
+                data['relation'] = relation
+                data['score'] = score
+                results.append(data)
+        return Response(results)
+
+
+def word_data(ids):
+    """
+    WordSerializer data of the words ``ids``, in that order, read from the
+    shared dictionary image when there is one (no query, no model instances).
+    """
+    dictionary_image = image.current()
+    if dictionary_image is not None:
+        rows = (dictionary_image.get(word_id) for word_id in ids)
+        return [word_row_to_representation(row) for row in rows if row is not None]
+    words = Word.objects.in_bulk(ids)
+    return [WordSerializer(words[word_id]).data for word_id in ids if word_id in words]
+
+
+class WordRandomSampleView(APIView):
+    """
+    ?n= random words (default 1, max 100), optionally filtered by ?level=
+    and ?part_of_speech=. With ?seed= the sample is repeatable. Served from
+    in-memory id pools (words.sampling) and the dictionary image, so no
+    query scans the table.
+    """
+    permission_classes = []
+    MAX_SAMPLE = 100
+
+    def get_filters(self, request):
+        level = request.query_params.get('level')
+        if level and level.lower() != 'all':
+            level = level.upper()
+        else:
+            level = None
+        return level, request.query_params.get('part_of_speech') or None
+
+    def get(self, request):
+        try:
+            n = int(request.query_params.get('n', 1))
+        except ValueError:
+            return Response(
+                {'error': 'n must be an integer'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        n = max(0, min(n, self.MAX_SAMPLE))
+        level, part_of_speech = self.get_filters(request)
+        ids = sampling.sample(n, level, part_of_speech, seed=request.query_params.get('seed'))
+        return Response(word_data(ids))
+
+
+class WordOfTheDayView(WordRandomSampleView):
+    """
+    The same word for everyone for the whole (server-local) day, optionally
+    per ?level= / ?part_of_speech=.
+    """
+
+    def get(self, request):
+        level, part_of_speech = self.get_filters(request)
+        ids = sampling.sample(1, level, part_of_speech, seed=timezone.localdate().isoformat())
+        words = word_data(ids)
+        if not words:
+            return Response(
+                {'error': 'Word not found'},
+                status=status.HTTP_404_NOT_FOUND
+            )
+        return Response(words[0])
+
+
+class QuizView(WordRandomSampleView):
+    """
+    ?n= multiple-choice questions (default 10, max 50) for ?level= /
+    ?part_of_speech=, of the comma-separated ?types= (default all of
+    german_persian, german_english, article, plural). Each question has
+    "choices" and the index of the right one in "answer". ?seed= makes the
+    quiz repeatable. Distractors come from the pools in words.quiz.
+    """
+    DEFAULT_QUESTIONS = 10
+    MAX_QUESTIONS = 50
+    NOUN_TYPES = {'article', 'plural'}
+
+    def get(self, request):
+        try:
+            n = int(request.query_params.get('n', self.DEFAULT_QUESTIONS))
+        except ValueError:
+            return Response(
+                {'error': 'n must be an integer'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        n = max(0, min(n, self.MAX_QUESTIONS))
+        types = request.query_params.get('types')
+        types = tuple(types.split(',')) if types else quiz.QUESTION_TYPES
+        unknown = set(types) - set(quiz.QUESTION_TYPES)
+        if unknown:
+            return Response(
+                {'error': f"Unknown question types: {', '.join(sorted(unknown))}"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        level, part_of_speech = self.get_filters(request)
+        if set(types) <= self.NOUN_TYPES:
+            part_of_speech = 'noun'
+        seed = request.query_params.get('seed')
+        ids = sampling.sample(n, level, part_of_speech, seed=seed)
+        words = Word.objects.in_bulk(ids)
+        questions = quiz.generate(
+            [words[word_id] for word_id in ids if word_id in words], types, seed=seed
+        )
+        return Response(questions)
+
+
+class FlashcardSessionView(WordRandomSampleView):
+    """
+    Start a flashcard session in one request: ?n= cards (default 20, max
+    100) of ?level= (a random deck), or with ?source=due the words the user
+    has not learned yet, least recently reviewed first (optionally only of
+    ?level=). Every card has the word, the user's progress and "is_saved".
+
+    Three queries regardless of deck size: the deck (dictionary for level
+    decks, progress for due decks), then the other of the two, and the
+    saved flags.
+    """
+    permission_classes = [IsAuthenticated]
+    DEFAULT_CARDS = 20
+    MAX_CARDS = 100
+    # Due rows scanned to fill a level-filtered due deck
+    MAX_DUE_SCAN = 1000
+
+    def get(self, request):
+        try:
+            n = int(request.query_params.get('n', self.DEFAULT_CARDS))
+        except ValueError:
+            return Response(
+                {'error': 'n must be an integer'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        n = max(0, min(n, self.MAX_CARDS))
+        source = request.query_params.get('source', 'level')
+        level, part_of_speech = self.get_filters(request)
+
+        if source == 'due':
+            due = UserWordProgress.objects.filter(
+                user=request.user, is_known=False, word_id__isnull=False
+            ).order_by('last_reviewed')[:n if level is None and part_of_speech is None else self.MAX_DUE_SCAN]
+            progress_by_word = {progress.word_id: progress for progress in due}
+            words = Word.objects.filter(id__in=list(progress_by_word))
+            if level:
+                words = words.filter(level=level)
+            if part_of_speech:
+                words = words.filter(part_of_speech=part_of_speech)
+            words = words.in_bulk()
+            deck = [words[word_id] for word_id in progress_by_word if word_id in words][:n]
+        elif source == 'level':
+            ids = sampling.sample(n, level, part_of_speech)
+            words = Word.objects.in_bulk(ids)
+            deck = [words[word_id] for word_id in ids if word_id in words]
+            progress_by_word = {
+                progress.word_id: progress
+                for progress in UserWordProgress.objects.filter(user=request.user, word_id__in=ids)
+            }
+        else:
+            return Response(
+                {'error': "source must be 'level' or 'due'"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        serializer = FlashcardSerializer(deck, many=True, context={
+            'request': request,
+            'progress_by_word': progress_by_word,
+            'saved_word_ids': saved_word_ids(request.user, [word.id for word in deck]),
+        })
+        return Response({'source': source, 'cards': serializer.data})
+
+
+class UserStatsView(APIView):
+    """
+    The user's learning statistics per level: words seen, known and saved,
+    plus the number of words in the level. Read from the summary rows
+    words.stats maintains, so the cost doesn't grow with the history.
+    """
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        levels = stats.summary(request.user)
+        for level, _ in Word.LEVEL_CHOICES:
+            counts = levels.setdefault(level, {'seen': 0, 'known': 0, 'saved': 0})
+            counts['total'] = len(sampling.pool(level))
+        totals = {
+            field: sum(counts[field] for counts in levels.values())
+            for field in ('seen', 'known', 'saved', 'total')
+        }
+        return Response({'levels': dict(sorted(levels.items())), 'totals': totals})
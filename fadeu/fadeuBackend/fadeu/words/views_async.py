@@ -0,0 +1,160 @@
+"""
+Async-native dictionary read endpoints.
+
+These mirror the anonymous responses of WordListView and WordDetailView
+(WordSerializer output), but run query and JSON encoding on the bounded
+dictionary reader pool instead of holding a sync_to_async thread per
+request. Under an ASGI server a single worker can keep many slow clients
+connected while only DICTIONARY_READ_WORKERS threads touch SQLite.
+
+Like the DRF views they mirror, they are throttled by
+DEFAULT_THROTTLE_CLASSES (:func:`throttled`).
+"""
+import json
+import random
+import sqlite3
+from functools import wraps
+
+from asgiref.sync import sync_to_async
+from django.http import HttpResponse, JsonResponse
+from django.views.decorators.http import require_GET
+from rest_framework import exceptions
+from rest_framework.settings import api_settings
+from rest_framework.views import APIView
+
+from . import dictionary_reader, form_index
+from .serializers import WORD_COLUMNS, word_row_to_representation
+
+SEARCH_COLUMNS = ['german', 'english', 'persian']
+SELECT_WORDS = f"SELECT {', '.join(WORD_COLUMNS)} FROM words"
+
+
+def _search_terms(value):
+    # Same splitting as rest_framework.filters.SearchFilter.
+    return value.replace('\x00', '').replace(',', ' ').split()
+
+
+def _like(term):
+    escaped = term.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+    return f'%{escaped}%'
+
+
+def _json_bytes(data):
+    return json.dumps(data, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+
+def _list_query(level, terms, forms=True):
+    where, params = [], []
+    if level:
+        where.append('level = ?')
+        params.append(level)
+    if terms:
+        search = ' AND '.join(
+            '(' + ' OR '.join(f"{column} LIKE ? ESCAPE '\\'" for column in SEARCH_COLUMNS) + ')'
+            for _ in terms
+        )
+        for term in terms:
+            params.extend([_like(term)] * len(SEARCH_COLUMNS))
+        if forms:
+            # Same as InflectedFormSearchFilter: also match inflected forms.
+            search = f'({search}) OR id IN (SELECT word_id FROM word_form_index WHERE form_key = ?)'
+            params.append(form_index.form_key(' '.join(terms)))
+        where.append(f'({search})')
+
+    sql = SELECT_WORDS
+    if where:
+        sql += ' WHERE ' + ' AND '.join(where)
+    return sql, params
+
+
+def _list_words(conn, level, terms, shuffle):
+    try:
+        cursor = conn.execute(*_list_query(level, terms))
+    except sqlite3.OperationalError:
+        # Dictionary built before word_form_index existed.
+        cursor = conn.execute(*_list_query(level, terms, forms=False))
+    rows = [word_row_to_representation(row) for row in cursor]
+    if shuffle:
+        random.shuffle(rows)
+    return _json_bytes(rows)
+
+
+def _get_word(conn, pk):
+    row = conn.execute(f'{SELECT_WORDS} WHERE id = ?', (pk,)).fetchone()
+    if row is None:
+        return None
+    return _json_bytes(word_row_to_representation(row))
+
+
+def _json_response(body, status=200):
+    return HttpResponse(body, status=status, content_type='application/json')
+
+
+def _check_throttles(request):
+    """
+    Run DEFAULT_THROTTLE_CLASSES on ``request`` as a DRF view would; return
+    the error response, or None if the request may go ahead.
+    """
+    view = APIView()
+    view.args, view.kwargs = (), {}
+    view.throttle_classes = api_settings.DEFAULT_THROTTLE_CLASSES
+    try:
+        # Throttles key authenticated users by id, so authenticate too.
+        view.check_throttles(view.initialize_request(request))
+    except exceptions.APIException as exc:
+        # Same body as rest_framework.views.exception_handler
+        data = exc.detail if isinstance(exc.detail, (list, dict)) else {'detail': exc.detail}
+        response = JsonResponse(data, status=exc.status_code, safe=False)
+        if getattr(exc, 'wait', None) is not None:
+            response['Retry-After'] = '%d' % exc.wait
+        return response
+    return None
+
+
+def throttled(view_func):
+    @wraps(view_func)
+    async def wrapper(request, *args, **kwargs):
+        if api_settings.DEFAULT_THROTTLE_CLASSES:
+            # Authentication and the throttle cache are sync (and may query).
+            response = await sync_to_async(_check_throttles)(request)
+            if response is not None:
+                return response
+        return await view_func(request, *args, **kwargs)
+    return wrapper
+
+
+@require_GET
+@throttled
+async def word_list(request):
+    """Async variant of WordListView: ``?level=``, ``?search=``, ``?shuffle=``."""
+    level = request.GET.get('level')
+    level = level.upper() if level and level.lower() != 'all' else None
+    terms = _search_terms(request.GET.get('search', ''))
+    shuffle = request.GET.get('shuffle', 'false').lower() == 'true'
+
+    body = await dictionary_reader.run(_list_words, level, terms, shuffle)
+    return _json_response(body)
+
+
+@require_GET
+@throttled
+async def word_search(request):
+    """Search headwords and translations; ``?q=`` is required."""
+    terms = _search_terms(request.GET.get('q', ''))
+    if not terms:
+        return JsonResponse({'error': 'q parameter is required'}, status=400)
+
+    level = request.GET.get('level')
+    level = level.upper() if level and level.lower() != 'all' else None
+    body = await dictionary_reader.run(_list_words, level, terms, False)
+    return _json_response(body)
+
+
+@require_GET
+@throttled
+async def word_detail(request, pk):
+    """Async variant of WordDetailView."""
+    body = await dictionary_reader.run(_get_word, pk)
+    if body is None:
+        return JsonResponse({'detail': 'No Word matches the given query.'}, status=404)
+    return _json_response(body)
@@ -0,0 +1,133 @@
+"""
+Pronunciation audio delivery.
+
+Clips are served from ``settings.AUDIO_ROOT`` by ``audio_filename``; the
+manifest and per-level bundles are built with the dictionary (see
+words.audio). Plain Django views, since the responses are files rather than
+serializer output.
+"""
+import json
+import os
+
+from django.conf import settings
+from django.db import connections
+from django.http import Http404, HttpResponse
+from django.urls import reverse
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import quote_etag
+from django.views.decorators.http import require_http_methods
+
+from fadeu.dictionary_backend import versions
+
+from .audio import resolve
+from .dictionary_reader import fetchall
+from .file_serving import serve_file
+from .models import Word
+
+# Clip URLs are stable but their content may change between dictionary
+# versions, so clients revalidate (cheaply, via ETag) after this long.
+AUDIO_MAX_AGE = 24 * 60 * 60
+MANIFEST_MAX_AGE = 5 * 60
+
+
+def _serve_clip(request, filename):
+    path = resolve(settings.AUDIO_ROOT, filename)
+    if path is None:
+        raise Http404('Audio not found')
+    try:
+        stat = os.stat(path)
+    except OSError:
+        raise Http404('Audio not found')
+
+    # Use the build-time hash as a strong ETag while the file is unchanged.
+    etag = None
+    rows = fetchall(
+        'SELECT size, sha256, mtime FROM audio_manifest WHERE filename = %s', [filename]
+    )
+    if rows:
+        size, sha256, mtime = rows[0]
+        if size == stat.st_size and mtime == stat.st_mtime_ns // 1_000_000_000:
+            etag = sha256
+    return serve_file(request, path, etag=etag, stat=stat, max_age=AUDIO_MAX_AGE)
+
+
+@require_http_methods(['GET', 'HEAD'])
+def audio_file(request, filename):
+    return _serve_clip(request, filename)
+
+
+@require_http_methods(['GET', 'HEAD'])
+def word_audio(request, pk):
+    filename = (
+        Word.objects.filter(pk=pk).values_list('audio_filename', flat=True).first()
+    )
+    if not filename:
+        raise Http404('Word has no audio')
+    return _serve_clip(request, filename)
+
+
+@require_http_methods(['GET', 'HEAD'])
+def audio_manifest(request):
+    """
+    ``{version, files: {filename: {size, sha256, duration_ms}}, bundles}``
+    for all clips, or for one level with ``?level=A1``.
+    """
+    level = request.GET.get('level', '').upper() or None
+    etag = quote_etag(f"{versions.version_key()}-{level or 'all'}")
+    response = get_conditional_response(request, etag=etag)
+    if response is None:
+        if level:
+            rows = fetchall(
+                """
+                SELECT DISTINCT m.filename, m.size, m.sha256, m.duration_ms
+                FROM words w JOIN audio_manifest m ON m.filename = w.audio_filename
+                WHERE w.level = %s
+                ORDER BY m.filename
+                """,
+                [level],
+            )
+            bundles = fetchall('SELECT * FROM audio_bundles WHERE level = %s', [level])
+        else:
+            rows = fetchall(
+                'SELECT filename, size, sha256, duration_ms FROM audio_manifest ORDER BY filename'
+            )
+            bundles = fetchall('SELECT * FROM audio_bundles ORDER BY level')
+
+        data = {
+            'version': versions.version_key(),
+            'files': {
+                filename: {'size': size, 'sha256': sha256, 'duration_ms': duration}
+                for filename, size, sha256, duration in rows or []
+            },
+            'bundles': {
+                bundle_level: {
+                    'url': request.build_absolute_uri(reverse('audio-bundle', args=[bundle_level])),
+                    'files': files, 'size': size, 'sha256': sha256,
+                }
+                for bundle_level, _, files, size, sha256 in bundles or []
+            },
+        }
+        response = HttpResponse(
+            json.dumps(data, ensure_ascii=False, separators=(',', ':')),
+            content_type='application/json',
+        )
+    response['ETag'] = etag
+    patch_cache_control(response, public=True, max_age=MANIFEST_MAX_AGE)
+    return response
+
+
+@require_http_methods(['GET', 'HEAD'])
+def audio_bundle(request, level):
+    """All clips of one CEFR level as a single (resumable) zip download."""
+    level = level.upper()
+    rows = fetchall('SELECT filename, sha256 FROM audio_bundles WHERE level = %s', [level])
+    # The bundle belongs to the version the connection has open.
+    version = getattr(connections['dictionary'], 'dictionary_version', None)
+    if not rows or version is None:
+        raise Http404('No audio bundle for this level')
+    filename, sha256 = rows[0]
+    return serve_file(
+        request, versions.version_dir(version) / filename,
+        etag=sha256, content_type='application/zip', max_age=MANIFEST_MAX_AGE,
+        filename=f'fadeu-audio-{level}.zip', as_attachment=True,
+    )
@@ -0,0 +1,111 @@
+"""
+Streaming export of the whole dictionary (or one level).
+
+    GET export/?format=json     one JSON array, as WordListView returns it
+    GET export/?format=ndjson   one word object per line
+    GET export/?level=B1        only that level
+
+Rows come from a chunked server-side cursor and are encoded and sent in
+batches, so worker memory stays flat whatever the dictionary size and the
+first bytes go out right away. Under ASGI the body is an async iterator
+that fetches each batch with sync_to_async (Django would otherwise read a
+sync iterator to the end before sending anything).
+
+The export is throttled like the other API views (DEFAULT_THROTTLE_CLASSES).
+"""
+import json
+
+from asgiref.sync import sync_to_async
+from django.core.handlers.asgi import ASGIRequest
+from django.http import HttpResponseBadRequest, StreamingHttpResponse
+from rest_framework.renderers import JSONRenderer
+from rest_framework.views import APIView
+
+from .models import Word
+from .serializers import WORD_COLUMNS, word_row_to_representation
+
+CURSOR_CHUNK = 500  # rows fetched per cursor round trip
+BATCH_ROWS = 500  # rows encoded per chunk sent
+
+CONTENT_TYPES = {
+    'json': 'application/json',
+    'ndjson': 'application/x-ndjson',
+}
+
+
+def _rows(level):
+    words = Word.objects.order_by('id')
+    if level:
+        words = words.filter(level=level)
+    for row in words.values_list(*WORD_COLUMNS).iterator(chunk_size=CURSOR_CHUNK):
+        yield word_row_to_representation(dict(zip(WORD_COLUMNS, row)))
+
+
+def _batches(items):
+    batch = []
+    for item in items:
+        batch.append(item)
+        if len(batch) >= BATCH_ROWS:
+            yield ''.join(batch).encode('utf-8')
+            batch = []
+    if batch:
+        yield ''.join(batch).encode('utf-8')
+
+
+def stream_json(rows):
+    encode = json.JSONEncoder(ensure_ascii=False, separators=(',', ':')).encode
+    yield b'['
+    yield from _batches(
+        encode(row) if index == 0 else ',' + encode(row) for index, row in enumerate(rows)
+    )
+    yield b']'
+
+
+def stream_ndjson(rows):
+    encode = json.JSONEncoder(ensure_ascii=False, separators=(',', ':')).encode
+    yield from _batches(encode(row) + '\n' for row in rows)
+
+
+async def _async_chunks(chunks):
+    # thread_sensitive: every batch runs on the same thread, so the cursor
+    # stays on the connection that opened it.
+    next_chunk = sync_to_async(next, thread_sensitive=True)
+    try:
+        while (chunk := await next_chunk(chunks, None)) is not None:
+            yield chunk
+    finally:
+        await sync_to_async(chunks.close, thread_sensitive=True)()
+
+
+class WordExportView(APIView):
+    permission_classes = []
+
+    def perform_content_negotiation(self, request, force=False):
+        # ?format= selects the export format, not a DRF renderer; errors
+        # (e.g. 429) are always JSON.
+        renderer = JSONRenderer()
+        return renderer, renderer.media_type
+
+    def get(self, request):
+        export_format = request.query_params.get('format', 'json')
+        if export_format not in CONTENT_TYPES:
+            return HttpResponseBadRequest("format must be 'json' or 'ndjson'")
+        level = request.query_params.get('level', '').upper()
+        if level == 'ALL':
+            level = ''
+
+        stream = stream_json if export_format == 'json' else stream_ndjson
+        chunks = stream(_rows(level))
+        if isinstance(request._request, ASGIRequest):
+            chunks = _async_chunks(chunks)
+        response = StreamingHttpResponse(chunks, content_type=CONTENT_TYPES[export_format])
+        response['Content-Disposition'] = f'inline; filename="words{"-" + level if level else ""}.{export_format}"'
+        return response
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        if isinstance(response, StreamingHttpResponse):
+            return response  # nothing to render
+        return super().finalize_response(request, response, *args, **kwargs)
+
+
+export_words = WordExportView.as_view()
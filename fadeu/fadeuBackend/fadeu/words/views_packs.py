@@ -0,0 +1,108 @@
+"""
+Per-level word packs (see words.packs): the level's word list as a
+prebuilt, precompressed file.
+
+    GET packs/                      index: levels, digests, sizes, URLs
+    GET packs/<level>.json          current pack of a level (revalidate)
+    GET packs/<level>.<digest>.json that exact pack (cache forever)
+
+The stored pack matching the client's Accept-Encoding is streamed with
+Content-Encoding set, so the app server neither serializes nor compresses.
+"""
+import json
+
+from django.db import connections
+from django.http import Http404, HttpResponse
+from django.urls import reverse
+from django.utils.cache import get_conditional_response, patch_cache_control, patch_vary_headers
+from django.utils.http import quote_etag
+from django.views.decorators.http import require_http_methods
+
+from fadeu.dictionary_backend import versions
+
+from .dictionary_reader import fetchall
+from .file_serving import serve_file
+from .packs import ENCODINGS
+
+PACK_MAX_AGE = 5 * 60
+IMMUTABLE_MAX_AGE = 365 * 24 * 60 * 60
+DIGEST_LENGTH = 16  # hex digits of the sha256 in content-addressed URLs
+
+
+def accepted_encodings(request):
+    """Content codings the client accepts (``q=0`` excluded)."""
+    accepted = {'identity'}
+    for item in request.META.get('HTTP_ACCEPT_ENCODING', '').split(','):
+        coding, _, params = item.strip().partition(';')
+        if params.replace(' ', '') in ('q=0', 'q=0.0', 'q=0.00', 'q=0.000'):
+            continue
+        if coding:
+            accepted.add(coding.strip().lower())
+    return accepted
+
+
+@require_http_methods(['GET', 'HEAD'])
+def pack_index(request):
+    etag = quote_etag(f'packs-{versions.version_key()}')
+    response = get_conditional_response(request, etag=etag)
+    if response is None:
+        packs = {}
+        for level, encoding, _, size, words, digest in fetchall(
+            'SELECT * FROM word_packs ORDER BY level, encoding'
+        ) or []:
+            pack = packs.setdefault(level, {
+                'words': words,
+                'digest': digest,
+                'url': request.build_absolute_uri(
+                    reverse('word-pack-digest', args=[level, digest[:DIGEST_LENGTH]])
+                ),
+                'sizes': {},
+            })
+            pack['sizes'][encoding] = size
+        response = HttpResponse(
+            json.dumps({'version': versions.version_key(), 'packs': packs}, separators=(',', ':')),
+            content_type='application/json',
+        )
+    response['ETag'] = etag
+    patch_cache_control(response, public=True, max_age=PACK_MAX_AGE)
+    return response
+
+
+def _serve_pack(request, level, digest=None):
+    level = level.upper()
+    rows = fetchall(
+        'SELECT encoding, filename, digest FROM word_packs WHERE level = %s', [level]
+    )
+    # Packs belong to the version the connection has open.
+    version = getattr(connections['dictionary'], 'dictionary_version', None)
+    if not rows or version is None:
+        raise Http404('No pack for this level')
+    stored = {encoding: (filename, pack_digest) for encoding, filename, pack_digest in rows}
+    if digest is not None and stored['identity'][1][:DIGEST_LENGTH] != digest:
+        raise Http404('Pack not found')
+
+    accepted = accepted_encodings(request)
+    encoding = next(e for e in ENCODINGS if e in stored and e in accepted)
+    filename, pack_digest = stored[encoding]
+    response = serve_file(
+        request, versions.version_dir(version) / filename,
+        etag=f'{pack_digest[:32]}-{encoding}',
+        content_type='application/json',
+        max_age=IMMUTABLE_MAX_AGE if digest else PACK_MAX_AGE,
+    )
+    if digest:
+        patch_cache_control(response, immutable=True)
+    if encoding != 'identity' and response.status_code in (200, 206):
+        response['Content-Encoding'] = encoding
+    patch_vary_headers(response, ['Accept-Encoding'])
+    return response
+
+
+@require_http_methods(['GET', 'HEAD'])
+def level_pack(request, level):
+    return _serve_pack(request, level)
+
+
+@require_http_methods(['GET', 'HEAD'])
+def level_pack_digest(request, level, digest):
+    return _serve_pack(request, level, digest)